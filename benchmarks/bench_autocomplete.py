@@ -0,0 +1,83 @@
+"""Benchmark URL-bar suggestion latency and memory of UrlAutocomplete.
+
+Usage:
+    python benchmarks/bench_autocomplete.py [--urls 20000] [--queries 20000]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.url_autocomplete import UrlAutocomplete
+
+
+def synthetic_urls(count, rng):
+    """Generate URLs with a realistic skew: a few hosts get most of the pages."""
+    hosts = [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12)))
+        + rng.choice([".com", ".org", ".net", ".io", ".in"])
+        for _ in range(max(1, count // 20))
+    ]
+    urls = []
+    for i in range(count):
+        host = hosts[min(int(rng.paretovariate(1.2)) - 1, len(hosts) - 1)]
+        path = "/".join(
+            "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10)))
+            for _ in range(rng.randint(0, 3))
+        )
+        urls.append(f"https://{rng.choice(['', 'www.'])}{host}/{path}")
+    return urls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--urls", type=int, default=20000, help="distinct URLs to index")
+    parser.add_argument("--queries", type=int, default=20000, help="keystrokes to simulate")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    urls = synthetic_urls(args.urls, rng)
+    now = time.time()
+
+    tracemalloc.start()
+    index = UrlAutocomplete(max_entries=args.urls)
+    start = time.perf_counter()
+    for url in urls:
+        # Spread visits over the last year so frecency differs between entries
+        index.record_visit(url, None, now - rng.random() * 365 * 86400)
+    build_seconds = time.perf_counter() - start
+    memory_mb = tracemalloc.get_traced_memory()[0] / (1024 * 1024)
+    tracemalloc.stop()
+
+    # Simulate typing: every prefix of randomly chosen visited URLs
+    keystrokes = []
+    while len(keystrokes) < args.queries:
+        target = rng.choice(urls).split("://", 1)[1]
+        keystrokes.extend(target[:n] for n in range(1, len(target) + 1))
+    keystrokes = keystrokes[:args.queries]
+
+    latencies = []
+    for text in keystrokes:
+        start = time.perf_counter()
+        index.suggest(text)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+
+    print(f"indexed keys:      {len(index):,} (from {args.urls:,} URLs)")
+    print(f"incremental build: {build_seconds * 1000:.0f} ms "
+          f"({build_seconds / args.urls * 1e6:.1f} us per visit)")
+    print(f"index memory:      {memory_mb:.1f} MB")
+    print(f"suggest latency:   p50 {percentile(0.5):.1f} us, p99 {percentile(0.99):.1f} us, "
+          f"max {latencies[-1]:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Benchmark coupon conversion writes and balance loads with the coin ledger.
+
+The old CoinManager opened a connection and overwrote the single balance row
+on every use_coins(), then opened another to insert the coupon. The ledger
+queues the debit and the coupon and inserts a burst of them in one
+transaction. Loading reads the newest snapshot plus the entries after it, so
+its cost does not grow with the size of the ledger.
+
+Usage:
+    python benchmarks/bench_coin_ledger.py [--conversions 2000] [--batch 1,10,100] [--entries 1000,100000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyQt5.QtCore import QCoreApplication
+
+from utils.coin_manager import CoinManager
+
+
+def legacy_conversions(db_path, conversions):
+    """The original access pattern: UPDATE the balance row, then INSERT the coupon."""
+    connection = sqlite3.connect(db_path)
+    connection.execute("CREATE TABLE coins (id INTEGER PRIMARY KEY, amount INTEGER NOT NULL, last_update TEXT NOT NULL)")
+    connection.execute("CREATE TABLE coupons (id INTEGER PRIMARY KEY AUTOINCREMENT, type TEXT NOT NULL, "
+                       "cost INTEGER NOT NULL, created_at TEXT NOT NULL)")
+    connection.execute("INSERT INTO coins VALUES (1, ?, ?)", (conversions * 10, datetime.now().isoformat()))
+    connection.commit()
+    connection.close()
+
+    coins = conversions * 10
+    start = time.perf_counter()
+    for _ in range(conversions):
+        coins -= 10
+        connection = sqlite3.connect(db_path)
+        connection.execute("UPDATE coins SET amount = ?, last_update = ? WHERE id = 1",
+                           (coins, datetime.now().isoformat()))
+        connection.commit()
+        connection.close()
+
+        connection = sqlite3.connect(db_path)
+        connection.execute("INSERT INTO coupons (type, cost, created_at) VALUES (?, ?, ?)",
+                           ("SWIGGY50", 10, datetime.now().isoformat()))
+        connection.commit()
+        connection.close()
+    return conversions / (time.perf_counter() - start)
+
+
+def ledger_conversions(db_path, conversions, batch):
+    """use_coins() + convert_to_coupon(), flushed every batch conversions."""
+    manager = CoinManager(db_path)
+    manager.add_coins(conversions * 10)
+    manager.flush()
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(conversions):
+            manager.use_coins(10)
+            manager.convert_to_coupon("SWIGGY50")
+            if (i + 1) % batch == 0:
+                manager.flush()
+        manager.flush()
+    return conversions / (time.perf_counter() - start)
+
+
+def load_time(db_path, entries):
+    """Milliseconds to load the balance from a ledger of the given size."""
+    manager = CoinManager(db_path)
+    for _ in range(entries):
+        manager.add_coins(1)
+        if len(manager._pending_entries) >= 1000:
+            manager.flush()
+    manager.flush()
+
+    # Startup cost: schema check, compaction check and balance load
+    start = time.perf_counter()
+    reloaded = CoinManager(db_path)
+    snapshot_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with manager.pool.connection() as conn:
+        full_sum = conn.execute("SELECT SUM(delta) FROM coin_ledger").fetchone()[0]
+    sum_ms = (time.perf_counter() - start) * 1000
+
+    assert reloaded.coins == full_sum
+    return snapshot_ms, sum_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--conversions", type=int, default=2000, help="coupon conversions per run")
+    parser.add_argument("--batch", default="1,10,100", help="comma-separated conversions per flush")
+    parser.add_argument("--entries", default="1000,100000", help="comma-separated ledger sizes to load")
+    args = parser.parse_args()
+
+    # CoinManager owns QTimers, which need an application instance; it must
+    # stay referenced, or PyQt destroys it straight away
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rate = legacy_conversions(os.path.join(tmp, "legacy.db"), args.conversions)
+        print(f"{'legacy row overwrite':<24} {rate:>10,.0f} conversions/s")
+        for batch in (int(value) for value in args.batch.split(",")):
+            rate = ledger_conversions(os.path.join(tmp, f"ledger{batch}.db"), args.conversions, batch)
+            print(f"{f'ledger, batch {batch}':<24} {rate:>10,.0f} conversions/s")
+
+        print()
+        print(f"{'entries':>8}  {'CoinManager()':>13}  {'full SUM':>9}")
+        for entries in (int(value) for value in args.entries.split(",")):
+            snapshot_ms, sum_ms = load_time(os.path.join(tmp, f"load{entries}.db"), entries)
+            print(f"{entries:>8,}  {snapshot_ms:>11.2f}ms  {sum_ms:>7.2f}ms")
+
+        # Let any queued timer events run before the databases are deleted
+        app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
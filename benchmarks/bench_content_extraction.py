@@ -0,0 +1,209 @@
+"""Benchmark the injected page content extractor against the previous one.
+
+Loads each HTML fixture in an offscreen QWebEnginePage, runs both extractors
+in the page several times and reports the median time and the size of the
+text they return. Without fixture arguments, large synthetic fixtures are
+generated: a news article with navigation, sidebar and comments, and a forum
+thread of deeply nested <div>s, the worst case for the previous extractor.
+
+Usage:
+    python benchmarks/bench_content_extraction.py [fixture.html ...] [--runs 5] [--save DIR]
+"""
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEventLoop, QUrl
+from PyQt5.QtWebEngineWidgets import QWebEnginePage
+from PyQt5.QtWidgets import QApplication
+
+from utils.gemini_helper import CONTENT_SCRIPT_JS
+
+# getPageContent as it was before the single-pass extractor
+LEGACY_SCRIPT_JS = """
+window.legacyExtractPageContent = function() {
+    function getPageContent() {
+        const selection = window.getSelection().toString().trim();
+        if (selection) {
+            return selection;
+        }
+        const possibleContentElements = [
+            document.querySelector('article'),
+            document.querySelector('main'),
+            document.querySelector('.content'),
+            document.querySelector('#content'),
+            document.querySelector('.article'),
+            document.querySelector('#article')
+        ].filter(el => el !== null);
+        if (possibleContentElements.length > 0) {
+            return possibleContentElements[0].innerText;
+        }
+        const bodyText = document.body.innerText;
+        if (bodyText.length > 15000) {
+            const paragraphs = Array.from(document.querySelectorAll('p')).map(p => p.innerText).join('\\n\\n');
+            if (paragraphs.length > 1000) {
+                return paragraphs;
+            }
+            const textDivs = Array.from(document.querySelectorAll('div'))
+                .filter(div => div.innerText.length > 100)
+                .map(div => div.innerText)
+                .join('\\n\\n');
+            if (textDivs.length > 1000) {
+                return textDivs;
+            }
+            return bodyText.substring(0, 15000) + "...";
+        }
+        return bodyText;
+    }
+    return JSON.stringify({content: getPageContent(), metadata: {}});
+};
+"""
+
+TIMING_JS = """
+(function() {
+    const times = [];
+    let chars = 0;
+    for (let i = 0; i < %(runs)d; i++) {
+        const start = performance.now();
+        const result = %(function)s();
+        times.push(performance.now() - start);
+        chars = JSON.parse(result).content.length;
+    }
+    times.sort((a, b) => a - b);
+    return JSON.stringify({median: times[times.length >> 1], chars: chars});
+})();
+"""
+
+
+def sentence(rng, words):
+    text = " ".join(
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 9)))
+        for _ in range(words)
+    )
+    return text.capitalize() + "."
+
+
+def news_fixture(rng):
+    """A long article surrounded by navigation, a sidebar and a comment section."""
+    nav = "".join(f'<li><a href="/section/{i}">{sentence(rng, 2)}</a></li>' for i in range(80))
+    article = "".join(
+        f"<h2>{sentence(rng, 5)}</h2>" if i % 15 == 0 else
+        f"<p>{' '.join(sentence(rng, rng.randint(8, 25)) for _ in range(rng.randint(2, 6)))}</p>"
+        for i in range(400)
+    )
+    sidebar = "".join(
+        f'<div class="widget"><a href="/story/{i}">{sentence(rng, 8)}</a></div>' for i in range(200)
+    )
+    comments = "".join(
+        f'<div class="comment"><div class="comment-body"><div>{sentence(rng, rng.randint(5, 40))}</div>'
+        f'<div class="meta">Reply · Share</div></div></div>'
+        for _ in range(2000)
+    )
+    return (
+        f"<html><head><title>News</title></head><body>"
+        f'<header class="masthead"><nav><ul>{nav}</ul></nav></header>'
+        f'<div id="page"><div class="story-body">{article}</div>'
+        f'<div class="sidebar">{sidebar}</div></div>'
+        f'<div id="comments">{comments}</div>'
+        f"<footer>{sentence(rng, 30)}</footer></body></html>"
+    )
+
+
+def forum_fixture(rng, posts=1500, max_depth=40):
+    """A threaded discussion of nested <div>s with no <p> elements."""
+    parts = []
+    depth = 0
+    for _ in range(posts):
+        target = rng.randint(0, max_depth)
+        while depth > target:
+            parts.append("</div>")
+            depth -= 1
+        parts.append(
+            f'<div class="post"><div class="author">{sentence(rng, 2)}</div>'
+            f'<div class="text">{" ".join(sentence(rng, rng.randint(6, 30)) for _ in range(rng.randint(1, 4)))}</div>'
+        )
+        depth += 1
+    parts.append("</div>" * depth)
+    return f"<html><head><title>Forum</title></head><body><div class=\"thread\">{''.join(parts)}</div></body></html>"
+
+
+class Runner:
+    """Loads pages and runs JavaScript in them synchronously."""
+
+    def __init__(self):
+        self.page = QWebEnginePage()
+
+    def wait(self, start):
+        loop = QEventLoop()
+        result = []
+
+        def done(value):
+            result.append(value)
+            loop.quit()
+
+        start(done)
+        if not result:
+            loop.exec_()
+        return result[0]
+
+    def load(self, path):
+        def start(done):
+            self.page.loadFinished.connect(done)
+            self.page.load(QUrl.fromLocalFile(os.path.abspath(path)))
+        ok = self.wait(start)
+        self.page.loadFinished.disconnect()
+        return ok
+
+    def run(self, js):
+        return self.wait(lambda done: self.page.runJavaScript(js, done))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("fixtures", nargs="*", help="saved HTML pages to extract from")
+    parser.add_argument("--runs", type=int, default=5, help="extractions per fixture and extractor")
+    parser.add_argument("--save", help="directory to write the generated fixtures to")
+    args = parser.parse_args()
+
+    fixtures = args.fixtures
+    if not fixtures:
+        directory = args.save or tempfile.mkdtemp()
+        os.makedirs(directory, exist_ok=True)
+        rng = random.Random(1)
+        for name, html in (("news.html", news_fixture(rng)), ("forum.html", forum_fixture(rng))):
+            path = os.path.join(directory, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(html)
+            fixtures.append(path)
+
+    app = QApplication(sys.argv)
+    runner = Runner()
+
+    print(f"{'fixture':<16} {'size':>8}  {'legacy':>18}  {'single pass':>18}  {'speedup':>7}")
+    for path in fixtures:
+        if not runner.load(path):
+            print(f"{os.path.basename(path):<16} failed to load")
+            continue
+        runner.run(LEGACY_SCRIPT_JS)
+        runner.run(CONTENT_SCRIPT_JS)
+
+        legacy = json.loads(runner.run(TIMING_JS % {"runs": args.runs, "function": "window.legacyExtractPageContent"}))
+        current = json.loads(runner.run(TIMING_JS % {"runs": args.runs, "function": "window.extractPageContent"}))
+        print(f"{os.path.basename(path):<16} {os.path.getsize(path) / 1024:>6.0f}KB  "
+              f"{legacy['median']:>7.1f}ms {legacy['chars']:>8,}ch  "
+              f"{current['median']:>7.1f}ms {current['chars']:>8,}ch  "
+              f"{legacy['median'] / max(current['median'], 0.01):>6.1f}x")
+    del runner
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
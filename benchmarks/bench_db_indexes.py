@@ -0,0 +1,133 @@
+"""Benchmark history/bookmark/coupon queries before and after the schema upgrade.
+
+Builds a history table with the original (index-less, rollback journal)
+schema, times the DatabaseManager queries against it, then lets
+DatabaseManager upgrade the file (WAL, pragmas, indexes) and times them again.
+
+Usage:
+    python benchmarks/bench_db_indexes.py [--rows 1000000] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.db_manager import DatabaseManager
+
+
+LEGACY_SCHEMA = '''
+CREATE TABLE history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    title TEXT,
+    visit_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE bookmarks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    title TEXT,
+    added_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE coupons (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    code TEXT NOT NULL,
+    description TEXT,
+    cost INTEGER,
+    redeemed INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+'''
+
+QUERIES = [
+    ("get_history(100)",
+     "SELECT id, url, title, visit_time FROM history ORDER BY visit_time DESC LIMIT 100",
+     lambda rng, rows: ()),
+    ("history WHERE url = ?",
+     "SELECT id FROM history WHERE url = ?",
+     lambda rng, rows: (f"https://site{rng.randrange(rows // 10)}.example/page",)),
+    ("bookmarks WHERE url = ?",
+     "SELECT id FROM bookmarks WHERE url = ?",
+     lambda rng, rows: (f"https://bookmark{rng.randrange(10000)}.example/",)),
+    ("is_coupon_redeemed",
+     "SELECT redeemed FROM coupons WHERE code = ?",
+     lambda rng, rows: (f"CODE{rng.randrange(10000)}",)),
+]
+
+
+def populate(db_path, rows):
+    """Create the legacy schema and fill it with synthetic data."""
+    rng = random.Random(42)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(LEGACY_SCHEMA)
+    start_epoch = time.time() - 5 * 365 * 86400
+    with conn:
+        conn.executemany(
+            "INSERT INTO history (url, title, visit_time) VALUES (?, ?, ?)",
+            (
+                (
+                    f"https://site{rng.randrange(rows // 10)}.example/page",
+                    f"Page title {i}",
+                    time.strftime('%Y-%m-%d %H:%M:%S',
+                                  time.gmtime(start_epoch + rng.random() * 5 * 365 * 86400)),
+                )
+                for i in range(rows)
+            )
+        )
+        conn.executemany(
+            "INSERT INTO bookmarks (url, title) VALUES (?, ?)",
+            ((f"https://bookmark{i}.example/", f"Bookmark {i}") for i in range(10000))
+        )
+        conn.executemany(
+            "INSERT INTO coupons (code, description, cost, redeemed) VALUES (?, ?, ?, ?)",
+            ((f"CODE{i}", "Benchmark coupon", 10, i % 2) for i in range(10000))
+        )
+    conn.close()
+
+
+def time_queries(conn, rows, repeat):
+    """Return the mean latency in milliseconds of each benchmark query."""
+    rng = random.Random(7)
+    results = {}
+    for name, sql, make_params in QUERIES:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(sql, make_params(rng, rows)).fetchall()
+        results[name] = (time.perf_counter() - start) * 1000 / repeat
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000, help="history rows to generate")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        print(f"Populating {args.rows:,} history rows...")
+        populate(db_path, args.rows)
+
+        conn = sqlite3.connect(db_path)
+        before = time_queries(conn, args.rows, args.repeat)
+        conn.close()
+
+        start = time.perf_counter()
+        manager = DatabaseManager(db_path)
+        print(f"Schema upgrade took {time.perf_counter() - start:.2f}s")
+        with manager.pool.connection() as conn:
+            after = time_queries(conn, args.rows, args.repeat)
+        manager.close()
+
+    print(f"{'query':<28}{'before ms':>12}{'after ms':>12}{'speed-up':>10}")
+    for name, _, _ in QUERIES:
+        speed_up = before[name] / after[name] if after[name] else float('inf')
+        print(f"{name:<28}{before[name]:>12.3f}{after[name]:>12.3f}{speed_up:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
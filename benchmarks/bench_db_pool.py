@@ -0,0 +1,89 @@
+"""Micro-benchmark: per-call connect/close vs. the pooled DatabaseManager.
+
+Usage:
+    python benchmarks/bench_db_pool.py [--ops 5000]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.db_manager import DatabaseManager
+
+
+class LegacyDatabaseManager:
+    """The original access pattern: open and close a connection on every call."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    def add_history_entry(self, url, title=None):
+        # history is a read-only view since the places/visits schema, so
+        # record the visit the way DatabaseManager does, on a fresh connection
+        connection = sqlite3.connect(self.db_path)
+        cursor = connection.cursor()
+        cursor.execute("SELECT id FROM places WHERE url = ?", (url,))
+        place = cursor.fetchone()
+        if place is None:
+            cursor.execute("INSERT INTO places (url, title, visit_count, last_visit) "
+                           "VALUES (?, ?, 1, CURRENT_TIMESTAMP)", (url, title))
+            place_id = cursor.lastrowid
+        else:
+            place_id = place[0]
+            cursor.execute("UPDATE places SET visit_count = visit_count + 1, "
+                           "last_visit = CURRENT_TIMESTAMP WHERE id = ?", (place_id,))
+        cursor.execute("INSERT INTO visits (place_id) VALUES (?)", (place_id,))
+        connection.commit()
+        connection.close()
+
+    def is_coupon_redeemed(self, code):
+        connection = sqlite3.connect(self.db_path)
+        cursor = connection.cursor()
+        cursor.execute("SELECT redeemed FROM coupons WHERE code = ?", (code,))
+        result = cursor.fetchone()
+        connection.close()
+        return bool(result and result[0])
+
+
+def run(manager, ops):
+    """Return (writes/s, reads/s) for the given manager."""
+    start = time.perf_counter()
+    for i in range(ops):
+        manager.add_history_entry(f"https://example.com/page/{i}", f"Page {i}")
+    write_rate = ops / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(ops):
+        manager.is_coupon_redeemed(f"CODE{i % 50}")
+    read_rate = ops / (time.perf_counter() - start)
+
+    return write_rate, read_rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=5000, help="operations per phase")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        pooled = DatabaseManager(db_path)
+        for i in range(50):
+            pooled.add_coupon(f"CODE{i}", "Benchmark coupon", 10)
+
+        legacy_write, legacy_read = run(LegacyDatabaseManager(db_path), args.ops)
+        pooled_write, pooled_read = run(pooled, args.ops)
+        pooled.close()
+
+    print(f"{'path':<10}{'writes/s':>14}{'reads/s':>14}")
+    print(f"{'legacy':<10}{legacy_write:>14,.0f}{legacy_read:>14,.0f}")
+    print(f"{'pooled':<10}{pooled_write:>14,.0f}{pooled_read:>14,.0f}")
+    print(f"speed-up: writes x{pooled_write / legacy_write:.1f}, reads x{pooled_read / legacy_read:.1f}")
+
+
+if __name__ == "__main__":
+    main()
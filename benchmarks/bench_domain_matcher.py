@@ -0,0 +1,85 @@
+"""Benchmark DomainMatcher lookups against the old substring scan.
+
+The old is_video_website lowercased the URL and tested every rule with
+`site in url`, so its cost grew with the number of rules. DomainMatcher walks
+one trie level per host label.
+
+Usage:
+    python benchmarks/bench_domain_matcher.py [--rules 23,1000,10000,50000] [--lookups 20000]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.domain_matcher import DomainMatcher
+
+
+def synthetic_domains(count, rng):
+    return [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 14)))
+        + rng.choice([".com", ".to", ".tv", ".in", ".net", ".co.uk"])
+        for _ in range(count)
+    ]
+
+
+def synthetic_urls(count, rules, rng):
+    """Mostly unrelated URLs, with a share of hits on ruled domains and their subdomains."""
+    urls = []
+    for _ in range(count):
+        if rng.random() < 0.2:
+            host = rng.choice(["", "www.", "m.", "watch."]) + rng.choice(rules)
+        else:
+            host = "www." + "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 12))) + ".com"
+        path = "/".join(
+            "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10)))
+            for _ in range(rng.randint(0, 4))
+        )
+        urls.append(f"https://{host}/{path}?q={rng.randint(0, 10 ** 6)}")
+    return urls
+
+
+def substring_scan(url, rules):
+    return any(site in url.lower() for site in rules)
+
+
+def time_per_call(function, urls):
+    start = time.perf_counter()
+    for url in urls:
+        function(url)
+    return (time.perf_counter() - start) / len(urls) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", default="23,1000,10000,50000", help="comma-separated rule counts")
+    parser.add_argument("--lookups", type=int, default=20000, help="URLs to classify per rule count")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    print(f"{'rules':>7}  {'build':>8}  {'memory':>8}  {'trie':>9}  {'substring scan':>14}")
+    for count in (int(value) for value in args.rules.split(",")):
+        rules = synthetic_domains(count, rng)
+        urls = synthetic_urls(args.lookups, rules, rng)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        matcher = DomainMatcher(rules)
+        build_ms = (time.perf_counter() - start) * 1000
+        memory_mb = tracemalloc.get_traced_memory()[0] / (1024 * 1024)
+        tracemalloc.stop()
+
+        trie_us = time_per_call(lambda url: matcher.match(url) is not None, urls)
+        # The scan is slow at large rule counts; a sample is enough
+        scan_us = time_per_call(lambda url: substring_scan(url, rules), urls[:max(50, 2000000 // count)])
+
+        print(f"{count:>7,}  {build_ms:>6.0f}ms  {memory_mb:>6.1f}MB  {trie_us:>7.2f}us  {scan_us:>12.2f}us")
+
+
+if __name__ == "__main__":
+    main()
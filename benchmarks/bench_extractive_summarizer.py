@@ -0,0 +1,64 @@
+"""Benchmark ExtractiveSummarizer throughput on large synthetic pages.
+
+Usage:
+    python benchmarks/bench_extractive_summarizer.py [--sizes 100,250,1000] [--runs 5]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.extractive_summarizer import ExtractiveSummarizer, split_sentences
+
+
+def synthetic_page(size_kb, rng):
+    """Generate page text of about size_kb KB with a Zipf-like word distribution."""
+    vocabulary = [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10)))
+        for _ in range(5000)
+    ]
+    paragraphs = []
+    size = 0
+    while size < size_kb * 1024:
+        sentences = []
+        for _ in range(rng.randint(2, 6)):
+            words = [
+                vocabulary[min(int(rng.paretovariate(1.1)) - 1, len(vocabulary) - 1)]
+                for _ in range(rng.randint(6, 30))
+            ]
+            sentences.append(" ".join(words).capitalize() + ".")
+        paragraph = " ".join(sentences)
+        paragraphs.append(paragraph)
+        size += len(paragraph) + 2
+    return "\n\n".join(paragraphs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,250,1000", help="comma-separated page sizes in KB")
+    parser.add_argument("--runs", type=int, default=5, help="summaries per page size")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    summarizer = ExtractiveSummarizer()
+
+    print(f"{'page':>8}  {'sentences':>9}  {'median':>9}  {'throughput':>12}")
+    for size_kb in (int(size) for size in args.sizes.split(",")):
+        page = synthetic_page(size_kb, rng)
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            summarizer.summarize(page, {'title': 'Benchmark'})
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        median = timings[len(timings) // 2]
+        print(f"{size_kb:>6}KB  {len(split_sentences(page)):>9,}  {median * 1000:>7.0f}ms  "
+              f"{len(page) / median / (1024 * 1024):>9.2f}MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark Gemini call latency: reconfiguring per call vs. a shared GeminiClient.
+
+Runs a local stand-in for the Gemini REST endpoint that answers every
+generateContent request immediately, so the numbers show client-side setup
+and connection costs only. Each run also reports how many TCP connections
+the stand-in server accepted.
+
+Usage:
+    python benchmarks/bench_gemini_client.py [--calls 200]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import google.generativeai as genai
+
+from utils.gemini_client import GeminiClient, MODEL_NAME
+
+RESPONSE = json.dumps({
+    "candidates": [{
+        "content": {"parts": [{"text": "A short summary."}], "role": "model"},
+        "finishReason": "STOP",
+        "index": 0,
+    }]
+}).encode("utf-8")
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers every POST with a canned generateContent response."""
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; don't let Nagle hold the body
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with StandInHandler.lock:
+            StandInHandler.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(RESPONSE)))
+        self.end_headers()
+        self.wfile.write(RESPONSE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run(label, call, calls):
+    """Time `calls` invocations of call() and print latency and connection counts."""
+    StandInHandler.connections = 0
+    call()  # warm-up, not timed
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    print(f"{label:<26}{statistics.mean(latencies):>10.2f}{latencies[len(latencies) // 2]:>10.2f}"
+          f"{latencies[int(len(latencies) * 0.99)]:>10.2f}{StandInHandler.connections:>13}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200, help="requests per variant")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+    client_options = {"api_endpoint": endpoint}
+    api_key = "benchmark-key"
+
+    def per_call():
+        # What _call_gemini_api used to do on every request
+        genai.configure(api_key=api_key, transport="rest", client_options=client_options)
+        genai.GenerativeModel(MODEL_NAME).generate_content("Summarize this page.")
+
+    print(f"{'variant':<26}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}{'connections':>13}")
+    run("configure per call", per_call, args.calls)
+
+    client = GeminiClient(api_key, transport="rest", client_options=client_options)
+    run("shared GeminiClient", lambda: client.generate_content("Summarize this page."), args.calls)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,3 @@
 from database.db_manager import DatabaseManager
+from database.connection_pool import ConnectionPool, get_pool, close_all_pools
+from database.history_writer import HistoryWriter
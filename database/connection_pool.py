@@ -0,0 +1,149 @@
+import atexit
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Applied to every pooled connection. WAL lets readers run alongside the
+# history writer, NORMAL sync is durable across app crashes in WAL mode, and
+# memory-mapped I/O avoids read() syscalls for hot pages.
+DEFAULT_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("mmap_size", 256 * 1024 * 1024),
+    ("temp_store", "MEMORY"),
+)
+
+
+class ConnectionPool:
+    """A small thread-aware pool of long-lived SQLite connections.
+
+    Each thread borrows at most one connection at a time; nested borrows on the
+    same thread reuse it. Idle connections are kept open and handed to the next
+    caller, so the open/close cost is only paid once per pooled connection.
+    """
+
+    def __init__(self, db_path, max_size=4, cached_statements=128, timeout=30.0,
+                 pragmas=DEFAULT_PRAGMAS):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+        self.pragmas = pragmas
+
+        self._idle = []
+        self._all = []
+        self._local = threading.local()
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def _create_connection(self):
+        """Open a new connection configured for pooled use."""
+        # Connections are only ever used by one thread at a time, but may be
+        # handed to a different thread after being returned to the pool
+        connection = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        for name, value in self.pragmas:
+            connection.execute(f"PRAGMA {name} = {value}")
+        return connection
+
+    def acquire(self):
+        """Borrow a connection for the calling thread."""
+        held = getattr(self._local, 'connection', None)
+        if held is not None:
+            self._local.depth += 1
+            return held
+
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("Connection pool is closed")
+                if self._idle:
+                    connection = self._idle.pop()
+                    break
+                if len(self._all) < self.max_size:
+                    connection = self._create_connection()
+                    self._all.append(connection)
+                    break
+                self._condition.wait()
+
+        self._local.connection = connection
+        self._local.depth = 1
+        return connection
+
+    def release(self, connection):
+        """Return a connection borrowed with acquire()."""
+        if getattr(self._local, 'connection', None) is not connection:
+            return
+
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+
+        self._local.connection = None
+
+        # Never hand out a connection with a transaction left open
+        if connection.in_transaction:
+            connection.rollback()
+
+        with self._condition:
+            if self._closed:
+                connection.close()
+            else:
+                self._idle.append(connection)
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that borrows a connection and always returns it."""
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close(self):
+        """Close every idle connection and refuse further borrows."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            for connection in self._idle:
+                try:
+                    connection.close()
+                except sqlite3.Error as e:
+                    print(f"Error closing pooled connection: {str(e)}")
+            self._idle = []
+            self._all = []
+            self._condition.notify_all()
+
+
+# Pools are shared per database file so every DatabaseManager instance
+# (main window, history dialog, bookmark dialog, ...) reuses the same connections
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path):
+    """Return the shared connection pool for a database file."""
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None or pool._closed:
+            pool = ConnectionPool(db_path)
+            _pools[db_path] = pool
+        return pool
+
+
+def close_all_pools():
+    """Close all shared pools. Registered as an interpreter shutdown hook."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_all_pools)
@@ -1,18 +1,44 @@
-import sqlite3
+import re
+import time
+
+from database.connection_pool import get_pool
+from database.frecency import add_visit, visit_score
 
 class DatabaseManager:
+    # Bump when adding a migration step to _migrate()
+    SCHEMA_VERSION = 3
+    
     def __init__(self, db_path="browser_history.db"):
         self.db_path = db_path
+        self.pool = get_pool(db_path)
         self.connection = None
         self.cursor = None
         self.initialize_db()
     
     def initialize_db(self):
         """Initialize the database and create tables if they don't exist."""
-        self.connect()
-        
+        with self.pool.connection() as conn:
+            # Under the default isolation level every DDL statement commits on
+            # its own. Run the whole upgrade as one explicit transaction, so a
+            # crash part-way leaves the old schema and version to retry from.
+            isolation_level = conn.isolation_level
+            conn.isolation_level = None
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                self._create_tables(conn)
+                self._migrate(conn)
+                conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            finally:
+                conn.isolation_level = isolation_level
+    
+    def _create_tables(self, conn):
+        """Create the original tables if they don't exist."""
         # Create history table
-        self.cursor.execute('''
+        conn.execute('''
         CREATE TABLE IF NOT EXISTS history (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             url TEXT NOT NULL,
@@ -22,7 +48,7 @@ class DatabaseManager:
         ''')
         
         # Create bookmarks table
-        self.cursor.execute('''
+        conn.execute('''
         CREATE TABLE IF NOT EXISTS bookmarks (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             url TEXT NOT NULL,
@@ -32,7 +58,7 @@ class DatabaseManager:
         ''')
         
         # Create coupons table
-        self.cursor.execute('''
+        conn.execute('''
         CREATE TABLE IF NOT EXISTS coupons (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             code TEXT NOT NULL,
@@ -42,144 +68,382 @@ class DatabaseManager:
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
         ''')
-        
-        self.connection.commit()
-        self.disconnect()
 
-    def get_coupons(self):
-        """Get all coupons from the database."""
-        self.connect()
-        self.cursor.execute(
-            "SELECT code, description, cost, redeemed, created_at FROM coupons ORDER BY created_at DESC"
+    def _migrate(self, conn):
+        """Upgrade an existing database to SCHEMA_VERSION, one step at a time."""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        
+        if version < 1:
+            # Indexes for the ORDER BY / WHERE clauses used below. The history
+            # index also carries id so keyset paging can walk it directly, and
+            # the coupon index covers is_coupon_redeemed without a table lookup.
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_history_visit_time ON history (visit_time DESC, id DESC)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_history_url ON history (url)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_bookmarks_url ON bookmarks (url)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_coupons_code ON coupons (code, redeemed)")
+        
+        if version < 2:
+            # Full-text indexes over title and url, stored as external-content
+            # tables so the text is not duplicated, and kept in sync by triggers
+            self._create_fts_index(conn, "history")
+            self._create_fts_index(conn, "bookmarks")
+        
+        if version < 3:
+            self._migrate_history_to_places(conn)
+        
+        if version != self.SCHEMA_VERSION:
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+    
+    def _create_fts_index(self, conn, table):
+        """Create an FTS5 index over a table's title and url, plus sync triggers."""
+        conn.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5 (
+            title, url,
+            content='{table}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
         )
-        coupons = self.cursor.fetchall()
-        self.disconnect()
-        return coupons
+        ''')
+        conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO {table}_fts (rowid, title, url) VALUES (new.id, new.title, new.url);
+        END
+        ''')
+        conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN
+            INSERT INTO {table}_fts ({table}_fts, rowid, title, url)
+            VALUES ('delete', old.id, old.title, old.url);
+        END
+        ''')
+        # Re-index a row only when its title or url actually changed; revisits
+        # rewrite places.title with the same value
+        conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE OF title, url ON {table}
+        WHEN old.title IS NOT new.title OR old.url IS NOT new.url BEGIN
+            INSERT INTO {table}_fts ({table}_fts, rowid, title, url)
+            VALUES ('delete', old.id, old.title, old.url);
+            INSERT INTO {table}_fts (rowid, title, url) VALUES (new.id, new.title, new.url);
+        END
+        ''')
+        # Index rows that existed before the upgrade
+        conn.execute(f"INSERT INTO {table}_fts ({table}_fts) VALUES ('rebuild')")
+    
+    def _migrate_history_to_places(self, conn):
+        """Replace the one-row-per-visit history table with places + visits.
+        
+        places holds each URL once with its latest title, visit count, last
+        visit and frecency; visits only stores (place_id, visit_time). A
+        read-only history view keeps the old (id, url, title, visit_time) shape.
+        """
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS places (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL UNIQUE,
+            title TEXT,
+            visit_count INTEGER NOT NULL DEFAULT 0,
+            last_visit TIMESTAMP,
+            frecency REAL
+        )
+        ''')
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS visits (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            place_id INTEGER NOT NULL REFERENCES places (id),
+            visit_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+        ''')
+        
+        # Move existing history over, keeping visit ids and the latest non-empty title
+        conn.execute('''
+        INSERT INTO places (url, title, visit_count, last_visit)
+        SELECT url,
+               (SELECT h2.title FROM history AS h2
+                WHERE h2.url = h.url AND h2.title IS NOT NULL AND h2.title != ''
+                ORDER BY h2.visit_time DESC LIMIT 1),
+               COUNT(*), MAX(COALESCE(visit_time, CURRENT_TIMESTAMP))
+        FROM history AS h
+        GROUP BY url
+        ''')
+        conn.execute('''
+        INSERT INTO visits (id, place_id, visit_time)
+        SELECT h.id, p.id, COALESCE(h.visit_time, CURRENT_TIMESTAMP)
+        FROM history AS h JOIN places AS p ON p.url = h.url
+        ''')
+        
+        # Compute each place's frecency from its visits in one streaming pass
+        updates = []
+        place_id, frecency = None, None
+        for row_place_id, visit_time in conn.execute(
+            "SELECT place_id, visit_time FROM visits ORDER BY place_id"
+        ):
+            if row_place_id != place_id:
+                if place_id is not None:
+                    updates.append((frecency, place_id))
+                place_id, frecency = row_place_id, None
+            frecency = add_visit(frecency, visit_score(visit_time))
+        if place_id is not None:
+            updates.append((frecency, place_id))
+        conn.executemany("UPDATE places SET frecency = ? WHERE id = ?", updates)
+        
+        # Drop the old table (its indexes and FTS triggers go with it)
+        conn.execute("DROP TABLE IF EXISTS history_fts")
+        conn.execute("DROP TABLE history")
+        conn.execute('''
+        CREATE VIEW history AS
+        SELECT v.id AS id, p.url AS url, p.title AS title, v.visit_time AS visit_time
+        FROM visits AS v JOIN places AS p ON p.id = v.place_id
+        ''')
+        
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_visits_visit_time ON visits (visit_time DESC, id DESC)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_visits_place ON visits (place_id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_places_frecency ON places (frecency DESC)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_places_visit_count ON places (visit_count DESC)")
+        
+        # Deleting a place removes its visits
+        conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS places_delete_visits AFTER DELETE ON places BEGIN
+            DELETE FROM visits WHERE place_id = old.id;
+        END
+        ''')
+        
+        # Only title/url changes need re-indexing, not every visit_count bump
+        self._create_fts_index(conn, "places")
     
     def connect(self):
-        """Connect to the SQLite database."""
-        self.connection = sqlite3.connect(self.db_path)
-        self.cursor = self.connection.cursor()
+        """Borrow a pooled connection to the SQLite database."""
+        if self.connection is None:
+            self.connection = self.pool.acquire()
+            self.cursor = self.connection.cursor()
     
     def disconnect(self):
-        """Close the database connection."""
+        """Return the borrowed connection to the pool."""
         if self.connection:
-            self.connection.close()
+            self.cursor.close()
+            self.pool.release(self.connection)
             self.connection = None
             self.cursor = None
     
-    def add_history_entry(self, url, title=None):
-        """Add a new entry to the browsing history."""
-        self.connect()
-        self.cursor.execute(
-            "INSERT INTO history (url, title) VALUES (?, ?)",
-            (url, title)
-        )
-        self.connection.commit()
+    def close(self):
+        """Shut down the connection pool. Call once when the application exits."""
         self.disconnect()
+        try:
+            # Let SQLite refresh query planner statistics for the new indexes
+            with self.pool.connection() as conn:
+                conn.execute("PRAGMA optimize")
+        except Exception as e:
+            print(f"Error optimizing database: {str(e)}")
+        self.pool.close()
+    
+    def _execute(self, query, params=()):
+        """Run a write statement in its own transaction."""
+        with self.pool.connection() as conn, conn:
+            conn.execute(query, params)
+    
+    def _fetchall(self, query, params=()):
+        """Run a read query and return all rows."""
+        with self.pool.connection() as conn:
+            return conn.execute(query, params).fetchall()
     
+    def _fetchone(self, query, params=()):
+        """Run a read query and return the first row."""
+        with self.pool.connection() as conn:
+            return conn.execute(query, params).fetchone()
+    
+    def add_history_entry(self, url, title=None):
+        """Add a new entry to the browsing history."""
+        visit_time = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+        self.add_history_entries([(url, title, visit_time)])
+
+    def add_history_entries(self, entries):
+        """Add several (url, title, visit_time) visits in a single transaction.
+        
+        Each visit bumps its place's visit count, last visit and frecency in
+        place, so no aggregate ever has to be recomputed over all visits.
+        """
+        with self.pool.connection() as conn, conn:
+            for url, title, visit_time in entries:
+                score = visit_score(visit_time)
+                place = conn.execute(
+                    "SELECT id, frecency FROM places WHERE url = ?", (url,)
+                ).fetchone()
+                
+                if place is None:
+                    cursor = conn.execute(
+                        "INSERT INTO places (url, title, visit_count, last_visit, frecency) "
+                        "VALUES (?, ?, 1, ?, ?)",
+                        (url, title, visit_time, score)
+                    )
+                    place_id = cursor.lastrowid
+                else:
+                    place_id, frecency = place
+                    conn.execute(
+                        "UPDATE places SET "
+                        "title = COALESCE(NULLIF(?, ''), title), "
+                        "visit_count = visit_count + 1, "
+                        "last_visit = MAX(COALESCE(last_visit, ''), ?), "
+                        "frecency = ? "
+                        "WHERE id = ?",
+                        (title, visit_time, add_visit(frecency, score), place_id)
+                    )
+                
+                conn.execute(
+                    "INSERT INTO visits (place_id, visit_time) VALUES (?, ?)",
+                    (place_id, visit_time)
+                )
+
     def get_history(self, limit=100):
         """Retrieve browsing history entries."""
-        self.connect()
-        self.cursor.execute(
-            "SELECT id, url, title, visit_time FROM history ORDER BY visit_time DESC LIMIT ?",
+        return self.get_history_page(limit=limit)
+    
+    def get_history_page(self, before=None, limit=200):
+        """Retrieve one page of history, newest first.
+        
+        Uses keyset pagination on (visit_time, id): pass the (visit_time, id) of
+        the last row of the previous page as `before` to get the next page. Each
+        page is a single index range scan no matter how deep into history it is.
+        """
+        if before is None:
+            return self._fetchall(
+                "SELECT v.id, p.url, p.title, v.visit_time "
+                "FROM visits AS v JOIN places AS p ON p.id = v.place_id "
+                "ORDER BY v.visit_time DESC, v.id DESC LIMIT ?",
+                (limit,)
+            )
+        return self._fetchall(
+            "SELECT v.id, p.url, p.title, v.visit_time "
+            "FROM visits AS v JOIN places AS p ON p.id = v.place_id "
+            "WHERE (v.visit_time, v.id) < (?, ?) "
+            "ORDER BY v.visit_time DESC, v.id DESC LIMIT ?",
+            (before[0], before[1], limit)
+        )
+    
+    def get_most_visited(self, limit=20):
+        """Retrieve (url, title, visit_count) for the most visited places."""
+        return self._fetchall(
+            "SELECT url, title, visit_count FROM places ORDER BY visit_count DESC LIMIT ?",
             (limit,)
         )
-        history = self.cursor.fetchall()
-        self.disconnect()
-        return history
+    
+    def get_frecent_places(self, limit=20):
+        """Retrieve (url, title, frecency) for the places with the highest frecency."""
+        return self._fetchall(
+            "SELECT url, title, frecency FROM places ORDER BY frecency DESC LIMIT ?",
+            (limit,)
+        )
+    
+    @staticmethod
+    def _fts_query(text):
+        """Turn free text into an FTS5 query; the last word is matched as a prefix."""
+        words = [f'"{word}"' for word in re.findall(r"\w+", text)]
+        if words:
+            words[-1] += "*"
+        return " ".join(words)
+    
+    def search_history(self, query, limit=100, offset=0):
+        """Full-text search over visited places, best matches first.
+        
+        Returns (place id, url, title, last visit time) rows, one per URL.
+        """
+        fts_query = self._fts_query(query)
+        if not fts_query:
+            return []
+        return self._fetchall(
+            """
+            SELECT p.id, p.url, p.title, p.last_visit
+            FROM (
+                SELECT rowid, bm25(places_fts) AS score FROM places_fts
+                WHERE places_fts MATCH ?
+                ORDER BY score LIMIT ? OFFSET ?
+            ) AS matches
+            JOIN places AS p ON p.id = matches.rowid
+            ORDER BY matches.score, p.frecency DESC
+            """,
+            (fts_query, limit, offset)
+        )
     
     def add_bookmark(self, url, title=None):
         """Add a new bookmark."""
-        self.connect()
-        self.cursor.execute(
+        self._execute(
             "INSERT INTO bookmarks (url, title) VALUES (?, ?)",
             (url, title)
         )
-        self.connection.commit()
-        self.disconnect()
     
     def get_bookmarks(self):
         """Retrieve all bookmarks."""
-        self.connect()
-        self.cursor.execute(
+        return self._fetchall(
             "SELECT id, title, url FROM bookmarks ORDER BY title"
         )
-        bookmarks = self.cursor.fetchall()
-        self.disconnect()
-        return bookmarks
+    
+    def search_bookmarks(self, query, limit=100, offset=0):
+        """Full-text search over bookmark titles and URLs, best matches first."""
+        fts_query = self._fts_query(query)
+        if not fts_query:
+            return []
+        return self._fetchall(
+            """
+            SELECT b.id, b.title, b.url
+            FROM (
+                SELECT rowid, bm25(bookmarks_fts) AS score FROM bookmarks_fts
+                WHERE bookmarks_fts MATCH ?
+                ORDER BY score LIMIT ? OFFSET ?
+            ) AS matches
+            JOIN bookmarks AS b ON b.id = matches.rowid
+            ORDER BY matches.score, b.title
+            """,
+            (fts_query, limit, offset)
+        )
     
     def update_bookmark(self, old_url, new_title, new_url):
         """Update an existing bookmark."""
-        self.connect()
-        self.cursor.execute(
+        self._execute(
             "UPDATE bookmarks SET title = ?, url = ? WHERE url = ?",
             (new_title, new_url, old_url)
         )
-        self.connection.commit()
-        self.disconnect()
     
     def delete_bookmark(self, url):
         """Delete a bookmark by URL."""
-        self.connect()
-        self.cursor.execute(
+        self._execute(
             "DELETE FROM bookmarks WHERE url = ?",
             (url,)
         )
-        self.connection.commit()
-        self.disconnect()
 
     def add_coupon(self, code, description, cost):
         """Add a new coupon to the database."""
-        self.connect()
-        self.cursor.execute(
+        self._execute(
             "INSERT INTO coupons (code, description, cost) VALUES (?, ?, ?)",
             (code, description, cost)
         )
-        self.connection.commit()
-        self.disconnect()
 
     def get_coupons(self):
         """Get all coupons from the database."""
-        self.connect()
-        self.cursor.execute(
+        return self._fetchall(
             "SELECT code, description, cost, redeemed, created_at FROM coupons ORDER BY created_at DESC"
         )
-        coupons = self.cursor.fetchall()
-        self.disconnect()
-        return coupons
 
     def mark_coupon_redeemed(self, code):
         """Mark a coupon as redeemed."""
-        self.connect()
-        self.cursor.execute(
+        self._execute(
             "UPDATE coupons SET redeemed = 1 WHERE code = ?",
             (code,)
         )
-        self.connection.commit()
-        self.disconnect()
 
     def is_coupon_redeemed(self, code):
         """Check if a coupon has been redeemed."""
-        self.connect()
-        self.cursor.execute(
+        result = self._fetchone(
             "SELECT redeemed FROM coupons WHERE code = ?",
             (code,)
         )
-        result = self.cursor.fetchone()
-        self.disconnect()
         return bool(result and result[0])
 
     def delete_history_entry(self, url):
-        """Delete a specific history entry by URL."""
-        self.connect()
-        self.cursor.execute("DELETE FROM history WHERE url = ?", (url,))
-        self.connection.commit()
-        self.disconnect()
+        """Delete a URL and all of its visits from history."""
+        self._execute("DELETE FROM places WHERE url = ?", (url,))
 
     def clear_history(self):
         """Clear all browsing history."""
-        self.connect()
-        self.cursor.execute("DELETE FROM history")
-        self.connection.commit()
-        self.disconnect()
\ No newline at end of file
+        with self.pool.connection() as conn, conn:
+            conn.execute("DELETE FROM visits")
+            conn.execute("DELETE FROM places")
@@ -0,0 +1,50 @@
+"""Frecency scores for places.
+
+Each visit at time t contributes 2 ** ((t - now) / half_life) to a place's
+frecency: recent visits count close to 1, old ones decay towards 0. Storing
+the base-2 logarithm of the sum, measured against a fixed epoch instead of
+"now", makes the score incremental: a new visit is folded in with add_visit()
+without touching older visits, and the relative order of places never needs
+a periodic recomputation because every score decays at the same rate.
+"""
+
+import calendar
+import math
+import time
+
+# A visit loses half of its weight every HALF_LIFE_DAYS
+HALF_LIFE_DAYS = 30
+_HALF_LIFE_SECONDS = HALF_LIFE_DAYS * 86400
+
+
+def parse_visit_time(visit_time):
+    """Convert a 'YYYY-MM-DD HH:MM:SS' UTC timestamp to epoch seconds.
+
+    A missing timestamp (NULL in old history rows) counts as a visit now.
+    """
+    if visit_time is None:
+        return time.time()
+    if isinstance(visit_time, (int, float)):
+        return float(visit_time)
+    return float(calendar.timegm(time.strptime(visit_time[:19], '%Y-%m-%d %H:%M:%S')))
+
+
+def visit_score(visit_time):
+    """Log-frecency contributed by a single visit."""
+    return parse_visit_time(visit_time) / _HALF_LIFE_SECONDS
+
+
+def add_visit(frecency, score):
+    """Fold a visit score into an existing log-frecency (None for no visits)."""
+    if frecency is None:
+        return score
+    high, low = max(frecency, score), min(frecency, score)
+    return high + math.log2(1.0 + 2.0 ** (low - high))
+
+
+def decayed_visits(frecency, now=None):
+    """Express a log-frecency as the equivalent number of visits made right now."""
+    if frecency is None:
+        return 0.0
+    now = time.time() if now is None else now
+    return 2.0 ** (frecency - now / _HALF_LIFE_SECONDS)
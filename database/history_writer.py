@@ -0,0 +1,85 @@
+import queue
+import threading
+import time
+
+from database.db_manager import DatabaseManager
+
+
+class HistoryWriter:
+    """Background writer that batches history inserts off the GUI thread.
+
+    Entries are queued by add() and written by a worker thread in a single
+    transaction once batch_size rows are pending or flush_interval_ms has
+    passed since the first pending row, whichever comes first.
+    """
+
+    def __init__(self, db_manager=None, flush_interval_ms=500, batch_size=50):
+        self.db_manager = db_manager or DatabaseManager()
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.batch_size = batch_size
+
+        self._queue = queue.Queue()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="HistoryWriter", daemon=True)
+        self._thread.start()
+
+    def add(self, url, title=None):
+        """Queue a history entry. Never blocks on disk I/O."""
+        if self._stopped:
+            return
+        # Record the visit time now rather than when the batch is written
+        visit_time = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+        self._queue.put((url, title, visit_time))
+
+    def flush(self, timeout=5.0):
+        """Write all queued entries and wait until they are committed."""
+        if not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def stop(self, timeout=5.0):
+        """Flush pending entries and stop the worker thread."""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        """Worker loop: collect entries into batches and write them."""
+        pending = []
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()
+
+            if isinstance(item, tuple) and item:
+                pending.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(pending) < self.batch_size:
+                    continue
+
+            # Time to write: batch is full, interval elapsed, or a flush/stop request
+            if pending:
+                self._write(pending)
+                pending = []
+            deadline = None
+
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is None:
+                return
+
+    def _write(self, entries):
+        """Insert a batch of entries in one transaction."""
+        try:
+            self.db_manager.add_history_entries(entries)
+        except Exception as e:
+            print(f"Error writing history batch: {str(e)}")
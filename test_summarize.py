@@ -103,13 +103,13 @@ class GeminiTestRunner(QObject):
         print(f"GEMINI_API_KEY used: {self.helper.api_key}")
         if not self.helper.api_key or "your-api-key" in self.helper.api_key.lower() or len(self.helper.api_key) < 10:
             print("API Key appears invalid before starting. Emitting error locally.")
-            self.on_result_ready("summarize", "Error: API key is missing or invalid based on initial check.")
+            self.on_result_ready(0, "summarize", "Error: API key is missing or invalid based on initial check.")
         else:
             self.helper.process_with_gemini(self.web_page_dummy, 'summarize')
 
 
-    def on_result_ready(self, action, result):
-        print(f"Action: {action}")
+    def on_result_ready(self, request_id, action, result):
+        print(f"Request {request_id} action: {action}")
         print(f"Result:\n{result}")
         if "timed out after 30 seconds" in result:
             print("TEST FAILED: 30-second timeout message detected.")
@@ -0,0 +1,113 @@
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+from PyQt5.QtCore import QCoreApplication
+
+from database.connection_pool import get_pool
+from utils.coin_manager import SNAPSHOT_EVERY, CoinManager
+
+
+@pytest.fixture(scope="module")
+def app():
+    # CoinManager owns QTimers, which need an application instance
+    return QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "coins.db")
+    yield path
+    get_pool(path).close()
+
+
+def ledger_rows(db_path, query):
+    with get_pool(db_path).connection() as conn:
+        return conn.execute(query).fetchall()
+
+
+def test_flush_writes_entries_and_coupons_together(app, db_path):
+    manager = CoinManager(db_path)
+    manager.add_coins(30)
+    assert manager.use_coins(10)
+    success, _ = manager.convert_to_coupon("SWIGGY50")
+    assert success
+    assert ledger_rows(db_path, "SELECT COUNT(*) FROM coin_ledger") == [(0,)]
+
+    assert manager.flush()
+    assert ledger_rows(db_path, "SELECT delta, reason FROM coin_ledger ORDER BY id") == [
+        (30, "added"), (-10, "spent")
+    ]
+    assert [coupon[0] for coupon in manager.get_coupon_history()] == ["SWIGGY50"]
+    assert CoinManager(db_path).coins == 20
+
+
+def test_snapshot_every_n_entries(app, db_path):
+    manager = CoinManager(db_path)
+    for _ in range(SNAPSHOT_EVERY * 2 + 5):
+        manager.add_coins(2)
+        manager.flush()
+
+    # The migration snapshot, then one per SNAPSHOT_EVERY entries
+    snapshots = ledger_rows(db_path, "SELECT ledger_id, balance FROM coin_snapshots ORDER BY ledger_id")
+    assert snapshots == [(0, 0), (SNAPSHOT_EVERY, SNAPSHOT_EVERY * 2), (SNAPSHOT_EVERY * 2, SNAPSHOT_EVERY * 4)]
+
+    reloaded = CoinManager(db_path)
+    assert reloaded.coins == (SNAPSHOT_EVERY * 2 + 5) * 2
+    assert reloaded._entries_since_snapshot == 5
+
+
+def test_compact_folds_old_entries_into_a_snapshot(app, db_path):
+    manager = CoinManager(db_path)
+    manager.add_coins(100)
+    assert manager.use_coins(40)
+    manager.add_coins(5)
+    manager.flush()
+
+    # Age the first two entries past the compaction cutoff
+    old = (datetime.now() - timedelta(days=40)).isoformat()
+    with get_pool(db_path).connection() as conn, conn:
+        conn.execute("UPDATE coin_ledger SET created_at = ? WHERE id <= 2", (old,))
+
+    assert manager.compact(30) == 2
+    assert ledger_rows(db_path, "SELECT delta FROM coin_ledger") == [(5,)]
+    assert ledger_rows(db_path, "SELECT ledger_id, balance FROM coin_snapshots") == [(2, 60)]
+    assert manager.compact(30) == 0
+
+    reloaded = CoinManager(db_path)
+    assert reloaded.coins == 65
+    assert [entry[:2] for entry in reloaded.get_ledger()] == [(5, "added")]
+
+
+def test_compact_keeps_totals_across_snapshots(app, db_path):
+    manager = CoinManager(db_path)
+    for i in range(SNAPSHOT_EVERY + 20):
+        manager.add_coins(1 if i % 3 else 3)
+        manager.flush()
+    expected = manager.coins
+
+    # Everything up to an id past the first periodic snapshot is old
+    old = (datetime.now() - timedelta(days=40)).isoformat()
+    with get_pool(db_path).connection() as conn, conn:
+        conn.execute("UPDATE coin_ledger SET created_at = ? WHERE id <= ?", (old, SNAPSHOT_EVERY + 10))
+
+    assert manager.compact(30) == SNAPSHOT_EVERY + 10
+    assert ledger_rows(db_path, "SELECT COUNT(*) FROM coin_ledger") == [(10,)]
+    assert CoinManager(db_path).coins == expected
+
+
+def test_legacy_balance_row_becomes_first_snapshot(app, db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE coins (id INTEGER PRIMARY KEY, amount INTEGER NOT NULL, last_update TEXT NOT NULL)")
+    conn.execute("INSERT INTO coins VALUES (1, 42, ?)", (datetime.now().isoformat(),))
+    conn.commit()
+    conn.close()
+
+    manager = CoinManager(db_path)
+    assert manager.coins == 42
+    assert ledger_rows(db_path, "SELECT ledger_id, balance FROM coin_snapshots") == [(0, 42)]
+
+    manager.add_coins(8)
+    manager.flush()
+    assert CoinManager(db_path).coins == 50
@@ -0,0 +1,143 @@
+import sqlite3
+
+import pytest
+
+from database.db_manager import DatabaseManager
+
+
+def make_legacy_db(path):
+    """Create a database in the original layout: one history row per visit, user_version 0."""
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+    CREATE TABLE history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT NOT NULL,
+        title TEXT,
+        visit_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE bookmarks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT NOT NULL,
+        title TEXT,
+        added_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE coupons (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        code TEXT NOT NULL,
+        description TEXT,
+        cost INTEGER,
+        redeemed INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    ''')
+    conn.executemany("INSERT INTO history (id, url, title, visit_time) VALUES (?, ?, ?, ?)", [
+        (1, "https://example.com/", "Example", "2024-01-01 10:00:00"),
+        (2, "https://python.org/", "Welcome to Python", "2024-01-02 09:00:00"),
+        (3, "https://example.com/", "Example Domain", "2024-01-03 12:00:00"),
+        (4, "https://example.com/", "", "2024-01-04 08:00:00"),
+        (5, "https://nulltime.org/", None, None),
+    ])
+    conn.execute("INSERT INTO bookmarks (url, title) VALUES (?, ?)", ("https://docs.python.org/", "Python Docs"))
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def legacy_path(tmp_path):
+    path = str(tmp_path / "history.db")
+    make_legacy_db(path)
+    return path
+
+
+@pytest.fixture
+def migrated(legacy_path):
+    manager = DatabaseManager(legacy_path)
+    yield manager
+    manager.close()
+
+
+def test_migration_sets_schema_version(migrated):
+    version = migrated._fetchone("PRAGMA user_version")[0]
+    assert version == DatabaseManager.SCHEMA_VERSION
+
+
+def test_migration_folds_visits_into_places(migrated):
+    places = {
+        url: (title, visit_count, last_visit)
+        for url, title, visit_count, last_visit in migrated._fetchall(
+            "SELECT url, title, visit_count, last_visit FROM places"
+        )
+    }
+    assert set(places) == {"https://example.com/", "https://python.org/", "https://nulltime.org/"}
+
+    # Latest non-empty title wins; every visit is counted
+    title, visit_count, last_visit = places["https://example.com/"]
+    assert title == "Example Domain"
+    assert visit_count == 3
+    assert last_visit == "2024-01-04 08:00:00"
+
+
+def test_migration_keeps_visit_ids_and_history_view(migrated):
+    rows = migrated._fetchall("SELECT id, url, visit_time FROM history ORDER BY id")
+    assert [row[0] for row in rows] == [1, 2, 3, 4, 5]
+    assert rows[1][1] == "https://python.org/"
+    assert rows[1][2] == "2024-01-02 09:00:00"
+
+
+def test_migration_fills_missing_visit_time(migrated):
+    visit_time, frecency = migrated._fetchone(
+        "SELECT v.visit_time, p.frecency FROM visits AS v JOIN places AS p ON p.id = v.place_id "
+        "WHERE p.url = 'https://nulltime.org/'"
+    )
+    assert visit_time is not None
+    assert frecency is not None
+
+
+def test_migration_computes_frecency(migrated):
+    frecent = [url for url, _, _ in migrated.get_frecent_places(3)]
+    # The NULL visit_time counts as a visit now, so it ranks first
+    assert frecent[0] == "https://nulltime.org/"
+    assert frecent.index("https://example.com/") < frecent.index("https://python.org/")
+
+
+def test_migrated_database_is_searchable(migrated):
+    assert [row[1] for row in migrated.search_history("welcome")] == ["https://python.org/"]
+    assert [row[2] for row in migrated.search_bookmarks("docs")] == ["https://docs.python.org/"]
+
+
+def test_migrated_database_accepts_new_visits(migrated):
+    migrated.add_history_entry("https://python.org/", "Python")
+    visit_count, title = migrated._fetchone(
+        "SELECT visit_count, title FROM places WHERE url = 'https://python.org/'"
+    )
+    assert visit_count == 2
+    assert title == "Python"
+    assert migrated.get_history_page(limit=1)[0][1] == "https://python.org/"
+
+
+def test_migration_is_idempotent(legacy_path):
+    DatabaseManager(legacy_path).close()
+    manager = DatabaseManager(legacy_path)
+    try:
+        assert manager._fetchone("SELECT COUNT(*) FROM visits")[0] == 5
+        assert manager._fetchone("SELECT COUNT(*) FROM places")[0] == 3
+    finally:
+        manager.close()
+
+
+def test_failed_migration_rolls_back(legacy_path, monkeypatch):
+    def fail(self, conn):
+        conn.execute("CREATE TABLE places (id INTEGER PRIMARY KEY)")
+        raise RuntimeError("interrupted")
+
+    monkeypatch.setattr(DatabaseManager, "_migrate_history_to_places", fail)
+    with pytest.raises(RuntimeError):
+        DatabaseManager(legacy_path)
+
+    conn = sqlite3.connect(legacy_path)
+    try:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM history").fetchone()[0] == 5
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name IN ('places', 'history_fts')").fetchall() == []
+    finally:
+        conn.close()
@@ -0,0 +1,57 @@
+from utils.domain_matcher import DomainMatcher, host_of
+
+
+def test_rule_matches_domain_and_subdomains():
+    matcher = DomainMatcher(["netflix.com"])
+    assert matcher.match("https://netflix.com/browse")
+    assert matcher.match("https://www.netflix.com/watch/1")
+    assert matcher.match("https://a.b.netflix.com/")
+
+
+def test_rule_does_not_match_lookalike_hosts():
+    matcher = DomainMatcher(["netflix.com"])
+    assert matcher.match("https://notnetflix.com/") is None
+    assert matcher.match("https://netflix.com.evil.net/") is None
+    assert matcher.match("https://evil.net/?next=netflix.com") is None
+    assert matcher.match("https://com/") is None
+
+
+def test_most_specific_rule_wins():
+    matcher = DomainMatcher()
+    matcher.add("google.com", "search")
+    matcher.add("youtube.com", "video")
+    matcher.add("video.google.com", "video")
+    assert matcher.match("https://www.google.com/") == "search"
+    assert matcher.match("https://video.google.com/") == "video"
+    assert matcher.match("https://m.video.google.com/") == "video"
+
+
+def test_rule_spellings():
+    matcher = DomainMatcher(["*.vimeo.com", ".twitch.tv", "https://www.hulu.com/watch", "Dailymotion.COM."])
+    assert len(matcher) == 4
+    assert matcher.match("https://player.vimeo.com/")
+    assert matcher.match("https://vimeo.com/")
+    assert matcher.match("https://twitch.tv/")
+    assert matcher.match("https://www.hulu.com/")
+    assert matcher.match("https://hulu.com/") is None
+    assert matcher.match("https://www.dailymotion.com/")
+
+
+def test_host_normalization():
+    matcher = DomainMatcher(["example.com"])
+    assert matcher.match("HTTPS://WWW.Example.COM/Page")
+    assert matcher.match("www.example.com/page")
+    assert matcher.match("https://user@example.com:8443/")
+    assert matcher.match_host("example.com.")
+    assert host_of("not a url") == "not a url"
+    assert host_of("http://[::1") == ""
+
+
+def test_from_file(tmp_path):
+    path = tmp_path / "rules.txt"
+    path.write_text("# video sites\nyoutube.com\n\nvimeo.com  # inline comment\n", encoding="utf-8")
+    matcher = DomainMatcher.from_file(str(path), "video")
+    assert len(matcher) == 2
+    assert matcher.match("https://m.youtube.com/") == "video"
+    assert matcher.match("https://vimeo.com/") == "video"
+    assert len(DomainMatcher.from_file(str(tmp_path / "missing.txt"))) == 0
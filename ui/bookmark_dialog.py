@@ -98,7 +98,10 @@ class BookmarkDialog(QDialog):
         layout.addLayout(button_layout)
     
     def load_bookmarks(self):
-        bookmarks = self.db_manager.get_bookmarks()
+        self.populate_table(self.db_manager.get_bookmarks())
+    
+    def populate_table(self, bookmarks):
+        """Fill the table with (id, title, url) rows."""
         self.bookmark_table.setRowCount(len(bookmarks))
         
         for row, bookmark in enumerate(bookmarks):
@@ -107,15 +110,12 @@ class BookmarkDialog(QDialog):
             self.bookmark_table.setItem(row, 1, QTableWidgetItem(url))
     
     def filter_bookmarks(self):
-        search_text = self.search_box.text().lower()
-        for row in range(self.bookmark_table.rowCount()):
-            match_found = False
-            for col in range(self.bookmark_table.columnCount()):
-                item = self.bookmark_table.item(row, col)
-                if item and search_text in item.text().lower():
-                    match_found = True
-                    break
-            self.bookmark_table.setRowHidden(row, not match_found)
+        """Search bookmarks with the database's full-text index."""
+        search_text = self.search_box.text().strip()
+        if not search_text:
+            self.load_bookmarks()
+            return
+        self.populate_table(self.db_manager.search_bookmarks(search_text))
     
     def add_bookmark(self):
         title, ok = QInputDialog.getText(self, 'Add Bookmark', 'Enter bookmark title:')
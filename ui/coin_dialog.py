@@ -86,6 +86,7 @@ class CoinDialog(QDialog):
             # Connect signals
             self.coin_manager.coin_count_changed.connect(self.update_coin_count)
             self.coin_manager.coupon_generated.connect(self.coupon_generated)
+            self.coin_manager.coin_progress.connect(self.timer_progress.setValue)
             
             print("Signals connected in CoinDialog")
     
@@ -168,6 +169,18 @@ class CoinDialog(QDialog):
         if self.coin_manager:
             self.update_coin_count(self.coin_manager.coins)
     
+    def showEvent(self, event):
+        """Follow the progress to the next coin while the dialog is visible."""
+        super().showEvent(event)
+        if self.coin_manager:
+            self.coin_manager.watch_progress(True)
+    
+    def hideEvent(self, event):
+        """Stop following the progress once the dialog is hidden."""
+        if self.coin_manager:
+            self.coin_manager.watch_progress(False)
+        super().hideEvent(event)
+    
     @pyqtSlot(int)
     def update_coin_count(self, count):
         """Update the displayed coin count."""
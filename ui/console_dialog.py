@@ -0,0 +1,141 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QComboBox,
+                             QAbstractItemView)
+from PyQt5.QtCore import QDateTime
+from PyQt5.QtGui import QColor
+
+from utils.console_pipeline import LEVEL_NAMES, WARNING, ERROR
+
+class ConsoleDialog(QDialog):
+    """Debug view of the JavaScript console messages kept by a ConsolePipeline."""
+
+    def __init__(self, parent=None, console_pipeline=None):
+        super().__init__(parent)
+        self.setWindowTitle("JavaScript Console")
+        self.setGeometry(300, 300, 900, 550)
+        self.console_pipeline = console_pipeline
+
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #f8f9fa;
+            }
+            QLabel {
+                color: #2c3e50;
+                font-size: 13px;
+            }
+            QPushButton {
+                background-color: #4a86e8;
+                color: white;
+                border: none;
+                padding: 8px 18px;
+                border-radius: 15px;
+                font-weight: 600;
+                font-size: 13px;
+            }
+            QPushButton:hover {
+                background-color: #3a76d8;
+            }
+            QPushButton#clearButton {
+                background-color: #e74c3c;
+            }
+            QPushButton#clearButton:hover {
+                background-color: #c0392b;
+            }
+            QTableWidget {
+                border: 1px solid #e9ecef;
+                background-color: white;
+                alternate-background-color: #f8f9fa;
+                gridline-color: #f1f3f5;
+                font-family: monospace;
+            }
+            QHeaderView::section {
+                background-color: #4a86e8;
+                color: white;
+                padding: 6px;
+                border: none;
+                font-weight: bold;
+            }
+        """)
+
+        layout = QVBoxLayout(self)
+
+        # Level filter and counters
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Keep messages of level:"))
+        self.level_combo = QComboBox()
+        for level, name in sorted(LEVEL_NAMES.items()):
+            self.level_combo.addItem(f"{name} and above", level)
+        self.level_combo.setCurrentIndex(self.level_combo.findData(self.console_pipeline.min_level))
+        self.level_combo.currentIndexChanged.connect(self.on_level_changed)
+        controls.addWidget(self.level_combo)
+        controls.addStretch()
+        self.stats_label = QLabel()
+        controls.addWidget(self.stats_label)
+        layout.addLayout(controls)
+
+        # Buffered messages, newest last
+        self.table = QTableWidget(0, 5)
+        self.table.setHorizontalHeaderLabels(["Time", "Level", "Origin", "Message", "Source"])
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setAlternatingRowColors(True)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(3, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        refresh_button = QPushButton("Refresh")
+        refresh_button.clicked.connect(self.refresh)
+        buttons.addWidget(refresh_button)
+        clear_button = QPushButton("Clear")
+        clear_button.setObjectName("clearButton")
+        clear_button.clicked.connect(self.clear)
+        buttons.addWidget(clear_button)
+        buttons.addStretch()
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.close)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+        self.refresh()
+
+    def refresh(self):
+        """Show the current contents of the pipeline's buffer."""
+        entries = list(self.console_pipeline.entries)
+        self.table.setUpdatesEnabled(False)
+        self.table.setRowCount(len(entries))
+        for row, entry in enumerate(entries):
+            time_text = QDateTime.fromMSecsSinceEpoch(int(entry.timestamp * 1000)).toString("hh:mm:ss.zzz")
+            cells = [
+                time_text,
+                LEVEL_NAMES.get(entry.level, str(entry.level)),
+                entry.origin,
+                entry.message,
+                f"{entry.source}:{entry.line}",
+            ]
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                if entry.level >= ERROR:
+                    item.setForeground(QColor("#e74c3c"))
+                elif entry.level == WARNING:
+                    item.setForeground(QColor("#d68910"))
+                self.table.setItem(row, column, item)
+        self.table.setUpdatesEnabled(True)
+        self.table.scrollToBottom()
+
+        stats = self.console_pipeline.stats()
+        self.stats_label.setText(
+            f"Kept {stats['accepted']}, below level {stats['filtered']}, "
+            f"rate-limited {stats['dropped']}, buffered {stats['buffered']}"
+        )
+
+    def on_level_changed(self, index):
+        """Change which messages the pipeline keeps from now on."""
+        self.console_pipeline.min_level = self.level_combo.itemData(index)
+
+    def clear(self):
+        """Empty the buffer."""
+        self.console_pipeline.clear()
+        self.refresh()
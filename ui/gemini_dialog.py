@@ -1,9 +1,11 @@
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QTextEdit, QComboBox,
                               QWidget, QProgressBar, QMessageBox,
-                             QDesktopWidget, QStyle, QLineEdit, QInputDialog)
+                             QDesktopWidget, QStyle, QLineEdit, QInputDialog, QMenu)
 from PyQt5.QtCore import Qt, pyqtSlot, QTimer
-from PyQt5.QtGui import QFont
+from PyQt5.QtGui import QFont, QTextCursor
+
+from utils.gemini_helper import LANGUAGE_CODES
 
 class GeminiDialog(QDialog):
     """Dialog for displaying Gemini AI processing results."""
@@ -17,18 +19,35 @@ class GeminiDialog(QDialog):
         self.gemini_helper = gemini_helper
         self.parent_window = parent
         
+        # Id of the Gemini request whose result this dialog is waiting for
+        self.request_id = None
+        
         # Set up UI
         self.setup_ui()
         
         # Connect signals if helper is provided
         if self.gemini_helper:
             self.gemini_helper.result_ready.connect(self.on_result_ready)
+            self.gemini_helper.content_extracted.connect(self.on_content_extracted)
+            self.gemini_helper.partial_result.connect(self.on_partial_result)
+            self.gemini_helper.preview_ready.connect(self.on_preview_ready)
         
         # Set up progress animation
         self.progress_dots = 0
         self.progress_timer = QTimer(self)
         self.progress_timer.timeout.connect(self.update_progress_text)
         
+        # Streamed text is buffered and appended at most every 100 ms, so a
+        # fast stream doesn't re-layout the result view for every chunk
+        self.stream_buffer = []
+        self.stream_timer = QTimer(self)
+        self.stream_timer.setSingleShot(True)
+        self.stream_timer.setInterval(100)
+        self.stream_timer.timeout.connect(self.flush_stream)
+        
+        # True while the result view shows a local preview of the summary
+        self.showing_preview = False
+        
         # Initialize window state
         self.is_fullscreen = False
         self.center_and_resize()
@@ -154,19 +173,27 @@ class GeminiDialog(QDialog):
         self.target_lang_label = QLabel("Target Language:")
         self.target_lang_label.setStyleSheet("font-weight: bold;")
         self.target_lang_combo = QComboBox()
-        self.target_lang_combo.addItems([
-            "English", "Spanish", "French", "German", "Chinese", "Japanese",
-            "Korean", "Russian", "Arabic", "Hindi", "Portuguese", "Italian",
-            "Dutch", "Polish", "Turkish", "Vietnamese", "Thai", "Indonesian"
-        ])
+        self.target_lang_combo.addItems(list(LANGUAGE_CODES))
+        
+        # Extra languages, translated in the same batch as the main one
+        self.more_langs_button = QPushButton("+ Languages")
+        self.more_langs_button.setToolTip("Also translate into these languages")
+        self.more_langs_menu = QMenu(self.more_langs_button)
+        for language in LANGUAGE_CODES:
+            lang_action = self.more_langs_menu.addAction(language)
+            lang_action.setCheckable(True)
+            lang_action.toggled.connect(self.update_more_languages_text)
+        self.more_langs_button.setMenu(self.more_langs_menu)
         
         action_layout.addWidget(self.target_lang_label)
         action_layout.addWidget(self.target_lang_combo)
+        action_layout.addWidget(self.more_langs_button)
         
         # Show/hide target language based on action
         self.action_combo.currentTextChanged.connect(self.on_action_changed)
         self.target_lang_label.setVisible(False)
         self.target_lang_combo.setVisible(False)
+        self.more_langs_button.setVisible(False)
         
         action_layout.addStretch()
         
@@ -293,6 +320,7 @@ class GeminiDialog(QDialog):
         
         self.target_lang_label.setVisible(is_translate)
         self.target_lang_combo.setVisible(is_translate)
+        self.more_langs_button.setVisible(is_translate)
         
         # Change the process button text based on the action
         if is_ask_gemini:
@@ -300,6 +328,19 @@ class GeminiDialog(QDialog):
         else:
             self.process_button.setText("Process with Gemini")
     
+    def update_more_languages_text(self):
+        """Show how many extra languages are selected on the button."""
+        count = sum(1 for lang_action in self.more_langs_menu.actions() if lang_action.isChecked())
+        self.more_langs_button.setText(f"+ {count} more" if count else "+ Languages")
+    
+    def selected_target_languages(self):
+        """Return the target language, or a list of them for a batch translation."""
+        languages = [self.target_lang_combo.currentText()]
+        for lang_action in self.more_langs_menu.actions():
+            if lang_action.isChecked() and lang_action.text() not in languages:
+                languages.append(lang_action.text())
+        return languages[0] if len(languages) == 1 else languages
+    
     def process_again(self):
         """Process the last content again with current settings."""
         if not self.last_content or not self.last_metadata:
@@ -310,7 +351,7 @@ class GeminiDialog(QDialog):
         action = self.action_combo.currentText().lower()
         
         # Get target language for translation
-        target_language = self.target_lang_combo.currentText() if action == "translate" else "English"
+        target_language = self.selected_target_languages() if action == "translate" else "English"
         
         # Show progress
         self.progress_bar.setVisible(True)
@@ -327,12 +368,13 @@ class GeminiDialog(QDialog):
         self.copy_button.setEnabled(False)
         
         try:
-            if action == "summarize":
-                self.gemini_helper._summarize_with_gemini(self.last_content, self.last_metadata)
-            elif action == "translate":
-                self.gemini_helper._translate_with_gemini(self.last_content, self.last_metadata, target_language)
-            elif action == "explain":
-                self.gemini_helper._explain_with_gemini(self.last_content, self.last_metadata)
+            self.cancel_request()
+            self.request_id = self.gemini_helper.process_extracted_content(
+                self.last_content,
+                self.last_metadata,
+                action,
+                target_language
+            )
         except Exception as e:
             self.show_error(f"Error processing content: {str(e)}")
     
@@ -352,7 +394,7 @@ class GeminiDialog(QDialog):
             return
         
         # Get target language for translation
-        target_language = self.target_lang_combo.currentText() if action == "translate" else "English"
+        target_language = self.selected_target_languages() if action == "translate" else "English"
         
         # Show progress
         self.progress_bar.setVisible(True)
@@ -371,7 +413,8 @@ class GeminiDialog(QDialog):
         # Process with Gemini
         if self.parent_window and hasattr(self.parent_window, 'browser'):
             try:
-                self.gemini_helper.process_with_gemini(
+                self.cancel_request()
+                self.request_id = self.gemini_helper.process_with_gemini(
                     self.parent_window.browser.page(), 
                     action,
                     target_language
@@ -411,9 +454,95 @@ class GeminiDialog(QDialog):
         self.status_label.setText("Result copied to clipboard!")
         self.status_label.setStyleSheet("color: #27ae60;")  # Green color for success
     
-    @pyqtSlot(str, str)
-    def on_result_ready(self, action, result):
+    def cancel_request(self):
+        """Cancel the request this dialog is waiting for, if any."""
+        if self.request_id is not None and self.gemini_helper:
+            self.gemini_helper.cancel(self.request_id)
+        self.request_id = None
+        self.reset_stream()
+    
+    def reset_stream(self):
+        """Drop streamed text that has not been shown yet."""
+        self.stream_timer.stop()
+        self.stream_buffer = []
+        self.showing_preview = False
+    
+    @pyqtSlot(int, str)
+    def on_partial_result(self, request_id, text):
+        """Queue a streamed piece of the response for display."""
+        if request_id != self.request_id:
+            return
+        
+        # Gemini's own text replaces the preview
+        if self.showing_preview:
+            self.result_text.clear()
+            self.showing_preview = False
+        
+        # Show the first piece right away, then batch the rest
+        first = self.result_text.document().isEmpty() and not self.stream_buffer
+        self.stream_buffer.append(text)
+        if first:
+            self.flush_stream()
+        elif not self.stream_timer.isActive():
+            self.stream_timer.start()
+    
+    @pyqtSlot(int, str)
+    def on_preview_ready(self, request_id, text):
+        """Show a local summary until Gemini's response starts arriving."""
+        if request_id != self.request_id:
+            return
+        if not self.result_text.document().isEmpty() or self.stream_buffer:
+            return
+        
+        self.result_text.setPlainText(text)
+        self.showing_preview = True
+        self.copy_button.setEnabled(True)
+        if self.progress_timer.isActive():
+            self.progress_timer.stop()
+        self.status_label.setText("Showing a quick preview while Gemini summarizes...")
+    
+    def flush_stream(self):
+        """Append buffered streamed text to the result view."""
+        if not self.stream_buffer:
+            return
+        text = "".join(self.stream_buffer)
+        self.stream_buffer = []
+        
+        # Append through a separate cursor so the user's selection is kept
+        cursor = QTextCursor(self.result_text.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        
+        if self.progress_timer.isActive():
+            self.progress_timer.stop()
+        self.status_label.setText("Receiving response from Gemini...")
+    
+    def closeEvent(self, event):
+        """Cancel any pending request when the dialog is closed."""
+        self.cancel_request()
+        super().closeEvent(event)
+    
+    def reject(self):
+        """Cancel any pending request when the dialog is dismissed with Escape."""
+        self.cancel_request()
+        super().reject()
+    
+    @pyqtSlot(int, str, dict)
+    def on_content_extracted(self, request_id, content, metadata):
+        """Store the page content of this dialog's request for "Process Again"."""
+        if request_id == self.request_id:
+            self.last_content = content
+            self.last_metadata = metadata
+    
+    @pyqtSlot(int, str, str)
+    def on_result_ready(self, request_id, action, result):
         """Handle the result from Gemini."""
+        # The helper is shared, so ignore results of other dialogs and stale requests
+        if request_id != self.request_id:
+            return
+        self.request_id = None
+        self.reset_stream()
+        
         try:
             # Stop the progress animation
             if self.progress_timer.isActive():
@@ -438,13 +567,6 @@ class GeminiDialog(QDialog):
             # Enable copy button
             self.copy_button.setEnabled(True)
             
-            # Store the processed content for "Process Again"
-            if hasattr(self.parent_window, 'browser'):
-                page = self.parent_window.browser.page()
-                if page:
-                    self.last_content = result
-                    self.last_metadata = {"title": self.parent_window.browser.title()}
-            
         except Exception as e:
             import traceback
             error_details = traceback.format_exc()
@@ -487,7 +609,8 @@ class GeminiDialog(QDialog):
                 page = self.parent_window.browser.page()
                 if page:
                     # Get the current page content using the Gemini helper
-                    self.gemini_helper.process_question(
+                    self.cancel_request()
+                    self.request_id = self.gemini_helper.process_question(
                         page,
                         question,
                         self.on_question_processed
@@ -501,6 +624,9 @@ class GeminiDialog(QDialog):
     
     def on_question_processed(self, result):
         """Handle the result from processing a question."""
+        self.request_id = None
+        self.reset_stream()
+        
         try:
             # Stop the progress animation
             if self.progress_timer.isActive():
@@ -1,7 +1,8 @@
-from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QTableWidget, 
-                             QTableWidgetItem, QPushButton, QHBoxLayout, QLabel,
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QTableView, QAbstractItemView,
+                             QPushButton, QHBoxLayout, QLabel,
                              QLineEdit, QMessageBox)
 from database.db_manager import DatabaseManager
+from ui.history_model import HistoryTableModel
 from PyQt5.QtCore import Qt
 
 class HistoryDialog(QDialog):
@@ -52,7 +53,7 @@ class HistoryDialog(QDialog):
             QPushButton#clearButton:hover {
                 background-color: #c0392b;
             }
-            QTableWidget {
+            QTableView {
                 border: 2px solid #e9ecef;
                 border-radius: 20px;
                 background-color: white;
@@ -62,11 +63,11 @@ class HistoryDialog(QDialog):
                 selection-color: #2c3e50;
                 margin: 10px 0;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 12px;
                 border-bottom: 1px solid #f1f3f5;
             }
-            QTableWidget::item:hover {
+            QTableView::item:hover {
                 background-color: #f8f9fa;
             }
             QHeaderView::section {
@@ -102,14 +103,15 @@ class HistoryDialog(QDialog):
         search_layout.addWidget(self.search_box)
         layout.addLayout(search_layout)
         
-        # Create table for history items
-        self.history_table = QTableWidget()
-        self.history_table.setColumnCount(3)
-        self.history_table.setHorizontalHeaderLabels(["Title", "URL", "Visit Time"])
+        # Create table for history items, backed by a lazily paged model
+        self.history_model = HistoryTableModel(self.db_manager, parent=self)
+        self.history_table = QTableView()
+        self.history_table.setModel(self.history_model)
         self.history_table.setColumnWidth(0, 300)
         self.history_table.setColumnWidth(1, 350)
         self.history_table.setColumnWidth(2, 150)
-        self.history_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.history_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.history_table.verticalHeader().setVisible(False)
         self.history_table.setAlternatingRowColors(True)
         self.history_table.horizontalHeader().setStretchLastSection(True)
         self.history_table.setShowGrid(False)
@@ -141,18 +143,11 @@ class HistoryDialog(QDialog):
         layout.addLayout(button_layout)
 
     def filter_history(self):
-        search_text = self.search_box.text().lower()
-        for row in range(self.history_table.rowCount()):
-            match_found = False
-            for col in range(self.history_table.columnCount()):
-                item = self.history_table.item(row, col)
-                if item and search_text in item.text().lower():
-                    match_found = True
-                    break
-            self.history_table.setRowHidden(row, not match_found)
+        """Search the full history with the database's full-text index."""
+        self.history_model.set_search_text(self.search_box.text())
 
     def delete_selected(self):
-        selected_rows = set(item.row() for item in self.history_table.selectedItems())
+        selected_rows = self.history_table.selectionModel().selectedRows()
         if not selected_rows:
             return
             
@@ -161,33 +156,16 @@ class HistoryDialog(QDialog):
                                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         
         if reply == QMessageBox.Yes:
-            # Remove rows from bottom to top to avoid index shifting
-            for row in sorted(selected_rows, reverse=True):
-                # Get the URL to delete from database
-                url = self.history_table.item(row, 1).text()
-                # Delete from database (you'll need to implement this in DatabaseManager)
+            # Deleting by URL removes every visit to it, so reload afterwards
+            urls = set(self.history_model.url_at(index.row()) for index in selected_rows)
+            urls.discard(None)
+            for url in urls:
                 self.db_manager.delete_history_entry(url)
-                self.history_table.removeRow(row)
+            self.history_model.reload()
     
     def load_history(self):
-        """Load browsing history from database and display in table."""
-        history_items = self.db_manager.get_history()
-        
-        self.history_table.setRowCount(len(history_items))
-        
-        for row, item in enumerate(history_items):
-            id, url, title, visit_time = item
-            
-            # Use URL as title if title is None
-            title_text = title if title else url
-            
-            title_item = QTableWidgetItem(title_text)
-            url_item = QTableWidgetItem(url)
-            time_item = QTableWidgetItem(visit_time)
-            
-            self.history_table.setItem(row, 0, title_item)
-            self.history_table.setItem(row, 1, url_item)
-            self.history_table.setItem(row, 2, time_item)
+        """Load the first page of browsing history; the rest loads on scroll."""
+        self.history_model.reload()
     
     def clear_history(self):
         """Clear all browsing history."""
@@ -197,5 +175,5 @@ class HistoryDialog(QDialog):
         
         if reply == QMessageBox.Yes:
             self.db_manager.clear_history()
-            self.history_table.setRowCount(0)
+            self.history_model.reload()
             QMessageBox.information(self, "Success", "History cleared successfully")
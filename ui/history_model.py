@@ -0,0 +1,146 @@
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+class HistoryTableModel(QAbstractTableModel):
+    """Table model that pages browsing history in from SQLite on demand.
+
+    Views call canFetchMore()/fetchMore() as the user scrolls, so only the rows
+    that have actually been scrolled into view are ever loaded. Normal browsing
+    pages with keyset pagination on (visit_time, id); a search query pages
+    through the full-text results instead.
+
+    Only the max_pages most recently used pages are kept in memory. For the
+    rest the model remembers where each page starts, and loads it again if
+    the user scrolls back to it.
+    """
+
+    HEADERS = ["Title", "URL", "Visit Time"]
+
+    def __init__(self, db_manager, page_size=200, max_pages=10, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.search_text = ""
+        self._pages = OrderedDict()  # page number -> rows, least recently used first
+        self._page_starts = []  # (visit_time, id) each page follows, None for the first
+        self._next_start = None
+        self._row_count = 0
+        self._exhausted = False
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+
+        row = self._row(index.row())
+        if row is None:
+            return None
+
+        id, url, title, visit_time = row
+        column = index.column()
+        if column == 0:
+            # Use URL as title if title is None
+            return title if title else url
+        if column == 1:
+            return url
+        return visit_time
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+
+        page = len(self._page_starts)
+        self._page_starts.append(self._next_start)
+        rows = self._fetch_page(page)
+
+        if len(rows) < self.page_size:
+            self._exhausted = True
+        if not rows:
+            self._page_starts.pop()
+            return
+
+        last_id, _, _, last_visit_time = rows[-1]
+        self._next_start = (last_visit_time, last_id)
+
+        start = self._row_count
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self._row_count += len(rows)
+        self._keep_page(page, rows)
+        self.endInsertRows()
+
+    def _fetch_page(self, page):
+        """Load a page from the database, or return [] on error."""
+        try:
+            if self.search_text:
+                return self.db_manager.search_history(
+                    self.search_text, limit=self.page_size, offset=page * self.page_size
+                )
+            return self.db_manager.get_history_page(self._page_starts[page], limit=self.page_size)
+        except Exception as e:
+            print(f"Error loading history page: {str(e)}")
+            return []
+
+    def _keep_page(self, page, rows):
+        """Cache a page, dropping the least recently used ones over max_pages."""
+        self._pages[page] = rows
+        self._pages.move_to_end(page)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+    def _row(self, row):
+        """Return a loaded row, loading its page again if it was dropped."""
+        page, offset = divmod(row, self.page_size)
+        rows = self._pages.get(page)
+        if rows is None:
+            rows = self._fetch_page(page)
+            self._keep_page(page, rows)
+        else:
+            self._pages.move_to_end(page)
+
+        # History deleted since the page was first loaded leaves it shorter
+        if offset >= len(rows):
+            return None
+        return rows[offset]
+
+    def url_at(self, row):
+        """Return the URL shown in a row, or None if it no longer exists."""
+        row = self._row(row)
+        return row[1] if row else None
+
+    def set_search_text(self, text):
+        """Switch between browsing all history and full-text search results."""
+        self.search_text = text.strip()
+        self.reload()
+
+    def reload(self):
+        """Drop loaded rows and start paging again from the newest entry."""
+        self.beginResetModel()
+        self._pages.clear()
+        self._page_starts = []
+        self._next_start = None
+        self._row_count = 0
+        self._exhausted = False
+        self.endResetModel()
+        self.fetchMore()
@@ -1,7 +1,7 @@
 from PyQt5.QtWidgets import (QMainWindow, QVBoxLayout, QWidget, 
                            QLineEdit, QToolBar, QAction, QMenu, QLabel, 
-                           QStatusBar, QHBoxLayout, QFrame, QMessageBox)
-from PyQt5.QtCore import QUrl, QTimer, QDateTime
+                           QStatusBar, QHBoxLayout, QFrame, QMessageBox, QCompleter)
+from PyQt5.QtCore import QUrl, QTimer, QDateTime, QStringListModel, Qt
 from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtGui import QIcon, QFont, QPixmap
 import webbrowser
@@ -15,12 +15,22 @@ from ui.coupon_dialog import CouponDialog
 from ui.coin_dialog import CoinDialog
 from ui.coupon_history_dialog import CouponHistoryDialog
 from ui.gemini_dialog import GeminiDialog
+from ui.console_dialog import ConsoleDialog
 from database.db_manager import DatabaseManager
+from database.history_writer import HistoryWriter
 from utils.helpers import format_url
 from utils.coin_manager import CoinManager
+from utils.console_pipeline import ConsolePipeline
+from utils.domain_matcher import DomainMatcher
 from utils.gemini_helper import GeminiHelper
+from utils.player_error_bridge import PlayerErrorBridge
+from utils.summary_prefetcher import SummaryPrefetcher
+from utils.url_autocomplete import UrlAutocomplete
 from ui.bookmark_dialog import BookmarkDialog
 
+# Sites opened in Chrome because their video players need it
+VIDEO_SITES_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'video_sites.txt')
+
 class BrowserApp(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -30,14 +40,30 @@ class BrowserApp(QMainWindow):
         # Initialize database manager
         self.db_manager = DatabaseManager()
         
+        # Write history in batches on a background thread
+        self.history_writer = HistoryWriter(self.db_manager)
+        
+        # Build the URL-bar suggestion index from history and bookmarks
+        self.url_autocomplete = UrlAutocomplete()
+        self.url_autocomplete.load(self.db_manager)
+        
         # Initialize coin manager
         self.coin_manager = CoinManager()
         self.coin_manager.coin_count_changed.connect(self.update_coin_display)
         self.coin_manager.coupon_generated.connect(self.on_coupon_generated)
         
+        # Domains of video sites, loaded once
+        self.video_sites = DomainMatcher.from_file(VIDEO_SITES_PATH)
+        
+        # Rate-limited buffer of the pages' JavaScript console messages
+        self.console_pipeline = ConsolePipeline(parent=self)
+        
         # Initialize Gemini helper
         self.gemini_helper = GeminiHelper()
         
+        # Summarize pages in the background once they go idle (opt-in)
+        self.summary_prefetcher = SummaryPrefetcher(self.gemini_helper, parent=self)
+        
         # Store generated coupons history
         self.generated_coupons = []
         
@@ -180,6 +206,15 @@ class BrowserApp(QMainWindow):
         self.url_bar.returnPressed.connect(self.navigate_to_url)
         self.toolbar.addWidget(self.url_bar)
         
+        # URL suggestions, refreshed from the in-memory index on each keystroke
+        self.url_suggestions = QStringListModel(self)
+        self.url_completer = QCompleter(self.url_suggestions, self)
+        self.url_completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.url_completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self.url_completer.activated[str].connect(self.on_suggestion_activated)
+        self.url_bar.setCompleter(self.url_completer)
+        self.url_bar.textEdited.connect(self.update_url_suggestions)
+        
         # Create menu bar
         self.menu_bar = self.menuBar()
         
@@ -251,8 +286,19 @@ class BrowserApp(QMainWindow):
         ask_gemini_action.triggered.connect(lambda: self.use_ai_assistant("ask gemini"))
         ai_menu.addAction(ask_gemini_action)
         
+        ai_menu.addSeparator()
+        prefetch_action = QAction("Prefetch Summaries", self)
+        prefetch_action.setCheckable(True)
+        prefetch_action.setChecked(self.summary_prefetcher.enabled)
+        prefetch_action.toggled.connect(self.summary_prefetcher.set_enabled)
+        ai_menu.addAction(prefetch_action)
+        
         tools_menu.addMenu(ai_menu)
         
+        console_action = QAction("JavaScript Console", self)
+        console_action.triggered.connect(self.show_console)
+        tools_menu.addAction(console_action)
+        
         # Create status bar with coin display
         self.statusBar = QStatusBar()
         self.setStatusBar(self.statusBar)
@@ -304,6 +350,12 @@ class BrowserApp(QMainWindow):
         self.browser.loadFinished.connect(self.on_page_load_finished)
         self.browser.page().javaScriptConsoleMessage = self.handle_console_message
         
+        # JW Player errors are pushed from the page instead of polled for
+        self.player_error_bridge = PlayerErrorBridge(self)
+        self.player_error_bridge.player_error.connect(self.on_player_error)
+        self.player_error_bridge.install(self.browser.page())
+        self.console_pipeline.player_error.connect(self.on_player_error)
+        
         self.layout.addWidget(self.browser)
         
         # Inject Gemini content extraction script when a new page is loaded
@@ -312,12 +364,6 @@ class BrowserApp(QMainWindow):
         # Load default page - use Google directly
         self.browser.setUrl(QUrl("https://www.google.com"))
         
-        # Create progress timer for coin animation
-        self.progress_timer = QTimer()
-        self.progress_timer.timeout.connect(self.update_coin_progress)
-        self.progress_timer.start(500)  # Update every 500ms
-        self.progress_value = 0
-        
         # Track recently opened URLs in Chrome to prevent duplicates
         self.recently_opened_in_chrome = {}
         
@@ -326,10 +372,6 @@ class BrowserApp(QMainWindow):
         self.video_check_timer.setSingleShot(True)
         self.video_check_timer.timeout.connect(self.check_for_video_players)
         
-        # Create a single reusable timer for error detection
-        self.error_check_timer = QTimer(self)
-        self.error_check_timer.timeout.connect(self.check_for_jw_player_error)
-        
         # Force initial coin display update
         self.update_coin_display(self.coin_manager.get_coins())
         
@@ -361,7 +403,8 @@ class BrowserApp(QMainWindow):
             self.setWindowTitle(f"External Browser - {formatted_url}")
             
             # Add to history
-            self.db_manager.add_history_entry(formatted_url, "External Browser - Video Site")
+            self.history_writer.add(formatted_url, "External Browser - Video Site")
+            self.url_autocomplete.record_visit(formatted_url)
             
             # Show a message about external browser mode
             self.statusBar.showMessage("Video website opened in Chrome for better compatibility", 5000)
@@ -370,19 +413,34 @@ class BrowserApp(QMainWindow):
             self.browser.setUrl(QUrl(formatted_url))
             self.statusBar.showMessage(f"Navigating to: {formatted_url}", 3000)
     
+    def update_url_suggestions(self, text):
+        """Refresh the URL-bar suggestions for the typed text."""
+        suggestions = self.url_autocomplete.suggest(text)
+        self.url_suggestions.setStringList([url for url, title in suggestions])
+    
+    def on_suggestion_activated(self, url):
+        """Navigate to a suggestion picked from the URL-bar popup."""
+        self.url_bar.setText(url)
+        self.navigate_to_url()
+    
     def update_url(self, url):
         """Update the URL bar when the URL changes."""
         self.url_bar.setText(url.toString())
         self.current_url = url.toString()
+        self.summary_prefetcher.page_changed()
+        self.console_pipeline.set_page(self.is_video_website(self.current_url))
         
-        # Add to history
-        self.db_manager.add_history_entry(url.toString(), self.browser.title())
+        # Queue for the background history writer
+        self.history_writer.add(url.toString(), self.browser.title())
+        self.url_autocomplete.record_visit(url.toString(), self.browser.title())
     
     def update_title(self, title):
         self.setWindowTitle(f"{title} - Simple Web Browser")
     
     def show_history(self):
         """Show the browsing history dialog."""
+        # Make sure recently queued visits are on disk before listing them
+        self.history_writer.flush()
         history_dialog = HistoryDialog(self)
         history_dialog.exec_()
     
@@ -391,6 +449,11 @@ class BrowserApp(QMainWindow):
         coupon_dialog = CouponDialog(self)
         coupon_dialog.exec_()
     
+    def show_console(self):
+        """Show the buffered JavaScript console messages."""
+        dialog = ConsoleDialog(self, self.console_pipeline)
+        dialog.exec_()
+    
     def show_coupon_history(self):
         """Show the coupon history dialog."""
         try:
@@ -432,15 +495,6 @@ class BrowserApp(QMainWindow):
         except Exception as e:
             print(f"Error updating coin display: {str(e)}")
     
-    def update_coin_progress(self):
-        """Update the coin progress animation."""
-        self.progress_value = (self.progress_value + 1) % 100
-        
-        # If we have a coin dialog open, update its progress bar
-        for widget in self.findChildren(CoinDialog):
-            if hasattr(widget, 'timer_progress'):
-                widget.timer_progress.setValue(self.progress_value)
-    
     def add_coupon_to_list(self, coupon):
         """Add a coupon to the coupon list (called from CoinDialog)."""
         # Find any open coupon dialogs and add the coupon to them
@@ -577,21 +631,15 @@ class BrowserApp(QMainWindow):
             if success:
                 # Inject Gemini content extraction script when a new page is loaded
                 self.gemini_helper.inject_script(self.browser.page())
+                self.summary_prefetcher.page_loaded(self.browser.page())
                 
                 # Inject video player detection script
                 self.inject_video_detection_script()
                 
-                # Add a specific error listener for JW Player errors
-                self.inject_error_listener()
-                
-                # Stop any existing timers and restart them
+                # Stop any existing timer and restart it
                 if hasattr(self, 'video_check_timer'):
                     self.video_check_timer.stop()
                     self.video_check_timer.start(2000)  # Check after 2 seconds
-                
-                if hasattr(self, 'error_check_timer'):
-                    self.error_check_timer.stop()
-                    self.error_check_timer.start(1500)  # Check every 1.5 seconds
         except Exception as e:
             print(f"Error injecting scripts: {str(e)}")
     
@@ -693,13 +741,6 @@ class BrowserApp(QMainWindow):
                         }
                     }
                     
-                    // Check for JW Player errors in the DOM
-                    if (document.body.innerHTML.includes('Error 102630') || 
-                        document.body.innerHTML.includes('JW Player Error')) {
-                        console.log("JW Player error text detected in page!");
-                        return "JW Player Error";
-                    }
-                    
                     return null;
                 }
                 
@@ -730,162 +771,27 @@ class BrowserApp(QMainWindow):
         except Exception as e:
             print(f"Error handling video detection result: {str(e)}")
     
-    def inject_error_listener(self):
-        """Inject a specific error listener for JW Player errors."""
+    def on_player_error(self, detail):
+        """Open the page in Chrome when it reports a JW Player error."""
         try:
-            # JavaScript to detect JW Player errors
-            js_code = """
-            (function() {
-                console.log("Setting up JW Player error listener...");
-                
-                // Global error handler to catch JW Player errors
-                window.addEventListener('error', function(event) {
-                    console.log("Error event captured:", event.message);
-                    
-                    // Check if this is a JW Player error
-                    if (event.message && (
-                        event.message.includes('jwplayer') || 
-                        event.message.includes('JW Player') ||
-                        event.message.includes('Error 102630')
-                    )) {
-                        console.log("JW Player error detected:", event.message);
-                        
-                        // Return true to indicate we found a JW Player error
-                        window.jwPlayerErrorDetected = true;
-                        
-                        // Create a custom element to signal the error
-                        var errorSignal = document.createElement('div');
-                        errorSignal.id = 'jw-player-error-detected';
-                        errorSignal.style.display = 'none';
-                        document.body.appendChild(errorSignal);
-                        
-                        return true;
-                    }
-                    
-                    return false;
-                }, true);
-                
-                // Also check for error elements in the DOM
-                setInterval(function() {
-                    // Look for error messages in the DOM
-                    var errorTexts = ['Error 102630', 'JW Player Error', 'jwplayer.js:'];
-                    var foundError = false;
-                    
-                    for (var i = 0; i < errorTexts.length; i++) {
-                        if (document.body.innerHTML.includes(errorTexts[i])) {
-                            console.log("Found JW Player error text in DOM:", errorTexts[i]);
-                            foundError = true;
-                            break;
-                        }
-                    }
-                    
-                    if (foundError || window.jwPlayerErrorDetected) {
-                        console.log("JW Player error confirmed, signaling to Python...");
-                        
-                        // Signal to Python that we need to redirect
-                        var jwErrorSignal = document.getElementById('jw-player-error-detected');
-                        if (!jwErrorSignal) {
-                            jwErrorSignal = document.createElement('div');
-                            jwErrorSignal.id = 'jw-player-error-detected';
-                            jwErrorSignal.style.display = 'none';
-                            document.body.appendChild(jwErrorSignal);
-                        }
-                        
-                        // Set a custom attribute that we can check from Python
-                        jwErrorSignal.setAttribute('data-error-detected', 'true');
-                        
-                        return true;
-                    }
-                    
-                    return false;
-                }, 1000);
-                
-                return "Error listener installed";
-            })();
-            """
+            print(f"JW Player error detected: {detail}")
             
-            # Inject the script
-            self.browser.page().runJavaScript(js_code)
-            
-            # Set up a timer to check for the error signal
-            if hasattr(self, 'error_check_timer'):
-                self.error_check_timer.stop()
-                self.error_check_timer.start(1500)  # Check every 1.5 seconds
+            # Get the current URL
+            current_url = self.browser.url().toString()
             
-        except Exception as e:
-            print(f"Error injecting error listener: {str(e)}")
-    
-    def check_for_jw_player_error(self):
-        """Check if a JW Player error has been detected."""
-        try:
-            # JavaScript to check if the error signal element exists
-            js_code = """
-            (function() {
-                var errorSignal = document.getElementById('jw-player-error-detected');
-                if (errorSignal && errorSignal.getAttribute('data-error-detected') === 'true') {
-                    return true;
-                }
-                return false;
-            })();
-            """
+            # Show a message
+            self.statusBar.showMessage("JW Player error detected. Opening in Chrome for better compatibility...", 5000)
             
-            # Run the JavaScript and handle the result
-            self.browser.page().runJavaScript(js_code, self.handle_jw_player_error_check)
+            # Open the URL in Chrome
+            self.open_in_chrome(current_url)
             
         except Exception as e:
-            print(f"Error checking for JW Player error: {str(e)}")
-    
-    def handle_jw_player_error_check(self, result):
-        """Handle the result of checking for a JW Player error."""
-        try:
-            if result:
-                print("JW Player error confirmed via DOM check")
-                
-                # Get the current URL
-                current_url = self.browser.url().toString()
-                
-                # Stop the error check timer
-                if hasattr(self, 'error_check_timer'):
-                    self.error_check_timer.stop()
-                
-                # Show a message
-                self.statusBar.showMessage("JW Player error detected. Opening in Chrome for better compatibility...", 5000)
-                
-                # Open the URL in Chrome
-                self.open_in_chrome(current_url)
-                
-        except Exception as e:
-            print(f"Error handling JW Player error check: {str(e)}")
+            print(f"Error handling JW Player error: {str(e)}")
     
     def handle_console_message(self, level, message, line, source):
-        """Handle JavaScript console messages to detect JW Player errors."""
+        """Pass JavaScript console messages to the console pipeline."""
         try:
-            # Print console messages for debugging
-            print(f"Console [{level}]: {message} (Line {line}, Source: {source})")
-            
-            # Get the current URL
-            current_url = self.browser.url().toString()
-            
-            # Only proceed if it's a known video site
-            if self.is_video_website(current_url):
-                # Check for JW Player errors but ignore YouTube
-                if ('jwplayer' in message.lower() or 
-                    'jw player' in message.lower() or 
-                    'error 102630' in message.lower() or
-                    'player error' in message.lower()):
-                    
-                    # Don't redirect YouTube
-                    if 'youtube.com' in current_url.lower():
-                        return
-                        
-                    print(f"JW Player error detected in console: {message}")
-                    
-                    # Show a message
-                    self.statusBar.showMessage("Video website detected. Opening in Chrome...", 5000)
-                    
-                    # Open the URL in Chrome
-                    self.open_in_chrome(current_url)
-                
+            self.console_pipeline.ingest(level, message, line, source)
         except Exception as e:
             print(f"Error handling console message: {str(e)}")
     
@@ -908,40 +814,27 @@ class BrowserApp(QMainWindow):
         # Stop any running timers
         if hasattr(self, 'video_check_timer'):
             self.video_check_timer.stop()
-        if hasattr(self, 'error_check_timer'):
-            self.error_check_timer.stop()
-        
+
+        # Drop pending Gemini requests and stop their worker threads
+        if hasattr(self, 'summary_prefetcher'):
+            self.summary_prefetcher.page_changed()
+        if hasattr(self, 'gemini_helper'):
+            self.gemini_helper.shutdown()
+        
+        # Write any queued history before closing the database
+        if hasattr(self, 'history_writer'):
+            self.history_writer.stop()
+        
+        # Close the pooled database connections
+        if hasattr(self, 'db_manager'):
+            self.db_manager.close()
+
         event.accept()
     
     def is_video_website(self, url):
         """Check if the URL is a video website that needs external browser."""
-        video_sites = [
-            'netflix.com',
-            'primevideo.com',
-            'hotstar.com',
-            'hulu.com',
-            'vimeo.com',
-            'dailymotion.com',
-            'twitch.tv',
-            'voot.com',
-            'sonyliv.com',
-            'zee5.com',
-            'mxplayer.in',
-            # Anime streaming sites
-            'hianime.to',
-            'aniwatch.to',
-            '9anime.to',
-            '9anime.pl',
-            '9anime.id',
-            'zoro.to',
-            'gogoanime.gr',
-            'animesuge.to',
-            'animepahe.com',
-            'animixplay.to',
-            'huggingface.co',
-        ]
-        # Exclude youtube.com from the list of sites that open in external browser
-        return any(site in url.lower() for site in video_sites)
+        # Matches the host and its subdomains only, never other parts of the URL
+        return self.video_sites.match(url) is not None
 
         # Add bookmark button to toolbar
         self.bookmark_button = QAction(QIcon('icons/bookmark.png'), 'Bookmarks', self)
@@ -967,6 +860,7 @@ class BrowserApp(QMainWindow):
         
         if current_url and current_title:
             self.db_manager.add_bookmark(current_url, current_title)
+            self.url_autocomplete.record_bookmark(current_url, current_title)
             self.statusBar.showMessage(f"Bookmark added: {current_title}", 3000)
 
         # Initialize tab widget
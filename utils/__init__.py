@@ -1,3 +1,15 @@
 from utils.helpers import is_valid_url, format_url, extract_domain, truncate_text
-from utils.coin_manager import CoinManager
-from utils.gemini_helper import GeminiHelper
+
+# Imported on first use, so importing a light submodule such as
+# utils.url_autocomplete doesn't pull in PyQt5/QtWebEngine
+_LAZY_EXPORTS = {
+    'CoinManager': 'utils.coin_manager',
+    'GeminiHelper': 'utils.gemini_helper',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        import importlib
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+    raise AttributeError(f"module 'utils' has no attribute {name!r}")
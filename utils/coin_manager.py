@@ -1,11 +1,45 @@
 import random
-import sqlite3
 import os
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from PyQt5.QtCore import QTimer, QObject, pyqtSignal
 
+from database.connection_pool import get_pool
+
+# One coin is earned for every this many seconds the browser is running
+COIN_INTERVAL_SECONDS = 50
+
+# Coins earned since the last write are saved at most this often, and on exit
+CHECKPOINT_SECONDS = 300
+
+# How often coin_progress is emitted while someone is watching it
+PROGRESS_INTERVAL_MS = 500
+
+# Ledger entries and coupons are written in one batch this long after the first is queued
+FLUSH_DELAY_MS = 200
+
+# A balance snapshot is written after this many ledger entries
+SNAPSHOT_EVERY = 100
+
+# Ledger entries older than this are folded into a snapshot on startup
+COMPACT_AFTER_DAYS = 30
+
 class CoinManager(QObject):
-    """Manages the coin system with a timer that adds coins periodically."""
+    """Manages the coin system: one coin per COIN_INTERVAL_SECONDS of use.
+    
+    Coins are not added by a ticking timer. The balance is worked out from the
+    time elapsed since last_coin_time whenever it is read, and a single-shot
+    timer wakes up only when the next coin is due, to announce it. Earned coins
+    are recorded in checkpoints, every CHECKPOINT_SECONDS and when the timer is
+    stopped.
+    
+    The database never overwrites the balance. Every credit and debit is
+    appended to the coin_ledger table, and every SNAPSHOT_EVERY entries the
+    balance is written to coin_snapshots, so loading it reads one snapshot and
+    at most SNAPSHOT_EVERY entries after it. Entries and coupons are queued and
+    inserted together in one transaction after FLUSH_DELAY_MS, or at once by
+    flush().
+    """
     
     # Signal emitted when coin count changes
     coin_count_changed = pyqtSignal(int)
@@ -13,6 +47,9 @@ class CoinManager(QObject):
     # Signal emitted when a new coupon is generated
     coupon_generated = pyqtSignal(dict)
     
+    # Progress towards the next coin, 0-100; only emitted while watched
+    coin_progress = pyqtSignal(int)
+    
     # Dictionary of coupon rewards with their costs
     COUPON_REWARDS = {
         "SWIGGY50": {"cost": 10, "description": "Flat 20% off on your first order on Swiggy"},
@@ -27,139 +64,342 @@ class CoinManager(QObject):
         "BIRTHDAYUBER": {"cost": 200, "description": "Special birthday discount on Uber rides"}
     }
     
-    def __init__(self):
+    def __init__(self, db_path=None):
         super().__init__()
-        self.coins = 0
+        self._coins = 0
         self.last_coin_time = None
-        self.db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'coins.db')
+        self.db_path = db_path or os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'coins.db')
+        
+        # Coins are only earned between start_timer() and stop_timer()
+        self.active = False
+        self._unrecorded = 0  # earned coins not yet in the ledger
+        self._last_checkpoint = time.monotonic()
+        
+        # Queued writes, inserted together by flush()
+        self._pending_entries = []
+        self._pending_coupons = []
+        self._entries_since_snapshot = 0
+        self._ledger_balance = 0  # balance after the last flushed entry
         
         # Ensure data directory exists
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.pool = get_pool(self.db_path)
         
         # Initialize database
         self._init_database()
         
+        # Fold old ledger entries before reading the balance
+        self.compact()
+        
         # Load coins from database
         self._load_coins()
         
-        # Create timer for adding coins (50 seconds interval)
-        self.timer = QTimer()
-        self.timer.setInterval(50000)  # 50 seconds
-        self.timer.timeout.connect(self.add_coin)
+        # Wakes up once when the next coin is due
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self._on_coin_due)
+        
+        # Runs only while at least one dialog watches coin_progress
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(PROGRESS_INTERVAL_MS)
+        self.progress_timer.timeout.connect(self._emit_progress)
+        self._progress_watchers = 0
+        
+        # Writes queued ledger entries and coupons in one transaction
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(FLUSH_DELAY_MS)
+        self.flush_timer.timeout.connect(self.flush)
     
     def _init_database(self):
         """Initialize the SQLite database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create tables if they don't exist
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS coins (
-                id INTEGER PRIMARY KEY,
-                amount INTEGER NOT NULL,
-                last_update TEXT NOT NULL
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS coupons (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                type TEXT NOT NULL,
-                cost INTEGER NOT NULL,
-                created_at TEXT NOT NULL
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with self.pool.connection() as conn, conn:
+            # Create tables if they don't exist
+            # Single balance row of older versions, only read to migrate it
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS coins (
+                    id INTEGER PRIMARY KEY,
+                    amount INTEGER NOT NULL,
+                    last_update TEXT NOT NULL
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS coupons (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    type TEXT NOT NULL,
+                    cost INTEGER NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+            ''')
+            
+            # Append-only; rows are only ever removed by compact()
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS coin_ledger (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    delta INTEGER NOT NULL,
+                    reason TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+            ''')
+            
+            # Balance after the ledger entry ledger_id (0 for none)
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS coin_snapshots (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ledger_id INTEGER NOT NULL,
+                    balance INTEGER NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+            ''')
+            
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_coin_ledger_created ON coin_ledger (created_at)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_coin_snapshots_ledger ON coin_snapshots (ledger_id)')
     
     def _load_coins(self):
         """Load coins from database."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.pool.connection() as conn, conn:
+                snapshot = self._latest_snapshot(conn)
+                if snapshot is None:
+                    snapshot = self._migrate_balance_row(conn)
+                ledger_id, balance, snapshot_time = snapshot
+                
+                delta, count, entry_time = conn.execute(
+                    'SELECT COALESCE(SUM(delta), 0), COUNT(*), MAX(created_at) FROM coin_ledger WHERE id > ?',
+                    (ledger_id,)
+                ).fetchone()
             
-            cursor.execute('SELECT amount, last_update FROM coins WHERE id = 1')
-            result = cursor.fetchone()
-            
-            if result:
-                self.coins = result[0]
-                self.last_coin_time = datetime.fromisoformat(result[1])
-            else:
-                # Initialize with 0 coins if no record exists
-                self.coins = 0
-                self.last_coin_time = datetime.now()
-                cursor.execute(
-                    'INSERT INTO coins (id, amount, last_update) VALUES (?, ?, ?)',
-                    (1, 0, self.last_coin_time.isoformat())
-                )
-                conn.commit()
+            self._ledger_balance = balance + delta
+            self._coins = self._ledger_balance
+            self._entries_since_snapshot = count
+            last_update = entry_time or snapshot_time
+            self.last_coin_time = datetime.fromisoformat(last_update) if last_update else datetime.now()
             
             # Always emit the current coin count
-            self.coin_count_changed.emit(self.coins)
-            
-            conn.close()
+            self.coin_count_changed.emit(self._coins)
         except Exception as e:
             print(f"Error loading coins: {str(e)}")
-            self.coins = 0
+            self._coins = 0
+            self.last_coin_time = datetime.now()
             self.coin_count_changed.emit(0)
     
+    def _latest_snapshot(self, conn):
+        """Return (ledger_id, balance, created_at) of the newest snapshot, or None."""
+        return conn.execute(
+            'SELECT ledger_id, balance, created_at FROM coin_snapshots ORDER BY ledger_id DESC, id DESC LIMIT 1'
+        ).fetchone()
+    
+    def _migrate_balance_row(self, conn):
+        """Turn the balance row of older versions into the first snapshot."""
+        row = conn.execute('SELECT amount, last_update FROM coins WHERE id = 1').fetchone()
+        amount, last_update = row if row else (0, None)
+        created_at = last_update or datetime.now().isoformat()
+        conn.execute(
+            'INSERT INTO coin_snapshots (ledger_id, balance, created_at) VALUES (0, ?, ?)',
+            (amount, created_at)
+        )
+        return 0, amount, last_update
+    
+    def _record(self, delta, reason):
+        """Queue a ledger entry; it is written by the next flush()."""
+        self._pending_entries.append((delta, reason, datetime.now().isoformat()))
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+    
+    def flush(self):
+        """Write queued ledger entries and coupons in a single transaction."""
+        self.flush_timer.stop()
+        if not self._pending_entries and not self._pending_coupons:
+            return True
+        entries = self._pending_entries
+        coupons = self._pending_coupons
+        balance = self._ledger_balance + sum(delta for delta, _, _ in entries)
+        take_snapshot = self._entries_since_snapshot + len(entries) >= SNAPSHOT_EVERY
+        try:
+            with self.pool.connection() as conn, conn:
+                conn.executemany(
+                    'INSERT INTO coin_ledger (delta, reason, created_at) VALUES (?, ?, ?)',
+                    entries
+                )
+                conn.executemany(
+                    'INSERT INTO coupons (type, cost, created_at) VALUES (?, ?, ?)',
+                    coupons
+                )
+                if take_snapshot:
+                    conn.execute(
+                        'INSERT INTO coin_snapshots (ledger_id, balance, created_at) '
+                        'SELECT COALESCE(MAX(id), 0), ?, ? FROM coin_ledger',
+                        (balance, datetime.now().isoformat())
+                    )
+        except Exception as e:
+            # Keep the queue so the next flush retries it
+            print(f"Error saving coins: {str(e)}")
+            if not self.flush_timer.isActive():
+                self.flush_timer.start()
+            return False
+        
+        self._pending_entries = []
+        self._pending_coupons = []
+        self._ledger_balance = balance
+        self._entries_since_snapshot = 0 if take_snapshot else self._entries_since_snapshot + len(entries)
+        return True
+    
     def _save_coins(self):
-        """Save coins to database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """Record the coins earned since the last checkpoint and write everything queued."""
+        if self._unrecorded:
+            self._record(self._unrecorded, "earned")
+            self._unrecorded = 0
+        self._last_checkpoint = time.monotonic()
+        return self.flush()
+    
+    def compact(self, older_than_days=COMPACT_AFTER_DAYS):
+        """Fold ledger entries older than older_than_days into a snapshot.
         
-        cursor.execute(
-            'UPDATE coins SET amount = ?, last_update = ? WHERE id = 1',
-            (self.coins, datetime.now().isoformat())
-        )
+        The entries and the snapshots they cover are deleted, so the ledger
+        keeps a detailed history of recent activity only. Returns the number
+        of entries folded.
+        """
+        cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+        try:
+            with self.pool.connection() as conn, conn:
+                last_old = conn.execute(
+                    'SELECT id FROM coin_ledger WHERE created_at < ? ORDER BY created_at DESC, id DESC LIMIT 1',
+                    (cutoff,)
+                ).fetchone()
+                if last_old is None:
+                    return 0
+                last_old_id = last_old[0]
+                
+                base = conn.execute(
+                    'SELECT ledger_id, balance FROM coin_snapshots WHERE ledger_id <= ? '
+                    'ORDER BY ledger_id DESC, id DESC LIMIT 1',
+                    (last_old_id,)
+                ).fetchone()
+                if base is None:
+                    base_id, base_balance, _ = self._migrate_balance_row(conn)
+                else:
+                    base_id, base_balance = base
+                
+                delta, created_at = conn.execute(
+                    'SELECT COALESCE(SUM(delta), 0), MAX(created_at) FROM coin_ledger WHERE id > ? AND id <= ?',
+                    (base_id, last_old_id)
+                ).fetchone()
+                conn.execute(
+                    'INSERT INTO coin_snapshots (ledger_id, balance, created_at) VALUES (?, ?, ?)',
+                    (last_old_id, base_balance + delta, created_at)
+                )
+                conn.execute('DELETE FROM coin_snapshots WHERE ledger_id < ?', (last_old_id,))
+                folded = conn.execute('DELETE FROM coin_ledger WHERE id <= ?', (last_old_id,)).rowcount
+            return folded
+        except Exception as e:
+            print(f"Error compacting coin ledger: {str(e)}")
+            return 0
+    
+    def get_ledger(self, limit=100):
+        """Get the most recent ledger entries as (delta, reason, created_at), newest first."""
+        self.flush()
+        with self.pool.connection() as conn:
+            entries = conn.execute(
+                'SELECT delta, reason, created_at FROM coin_ledger ORDER BY id DESC LIMIT ?', (limit,)
+            ).fetchall()
         
-        conn.commit()
-        conn.close()
+        return [(delta, reason, datetime.fromisoformat(created_at)) for delta, reason, created_at in entries]
     
-    def add_coins(self, amount):
-        """Add coins and save to database."""
-        self.coins += amount
-        self.last_coin_time = datetime.now()
-        self._save_coins()
+    @property
+    def coins(self):
+        """Current coin balance, including coins earned since it was last read."""
+        self._accrue()
+        return self._coins
+    
+    def _accrue(self):
+        """Credit the coins earned since last_coin_time. Returns how many."""
+        if not self.active:
+            return 0
+        elapsed = (datetime.now() - self.last_coin_time).total_seconds()
+        earned = int(elapsed // COIN_INTERVAL_SECONDS)
+        if earned > 0:
+            self._coins += earned
+            self._unrecorded += earned
+            # Keep the remainder so partial progress isn't lost
+            self.last_coin_time = datetime.fromtimestamp(
+                self.last_coin_time.timestamp() + earned * COIN_INTERVAL_SECONDS
+            )
+        return earned
+    
+    def seconds_to_next_coin(self):
+        """Seconds until the next coin is earned, or None while not earning."""
+        if not self.active:
+            return None
+        self._accrue()
+        elapsed = (datetime.now() - self.last_coin_time).total_seconds()
+        return max(0.0, COIN_INTERVAL_SECONDS - elapsed)
+    
+    def _on_coin_due(self):
+        """Announce coins that have become due and schedule the next wake-up."""
+        if self._accrue():
+            self.coin_count_changed.emit(self._coins)
+        if self._unrecorded and time.monotonic() - self._last_checkpoint >= CHECKPOINT_SECONDS:
+            self._save_coins()
+        self._schedule_next_coin()
+    
+    def _schedule_next_coin(self):
+        remaining = self.seconds_to_next_coin()
+        if remaining is not None:
+            # A little late rather than early, so the coin is due on wake-up
+            self.timer.start(int(remaining * 1000) + 50)
+    
+    def watch_progress(self, watching):
+        """Start or stop coin_progress updates for one watcher, e.g. a visible dialog."""
+        self._progress_watchers = max(0, self._progress_watchers + (1 if watching else -1))
+        if self._progress_watchers and not self.progress_timer.isActive():
+            self._emit_progress()
+            self.progress_timer.start()
+        elif not self._progress_watchers:
+            self.progress_timer.stop()
+    
+    def _emit_progress(self):
+        remaining = self.seconds_to_next_coin()
+        if remaining is None:
+            self.coin_progress.emit(0)
+            return
+        self.coin_progress.emit(int(100 * (COIN_INTERVAL_SECONDS - remaining) / COIN_INTERVAL_SECONDS))
+    
+    def add_coins(self, amount, reason="added"):
+        """Add coins and record them in the ledger."""
+        self._accrue()
+        self._coins += amount
+        self._record(amount, reason)
         # Emit signal when coins are added
-        self.coin_count_changed.emit(self.coins)
+        self.coin_count_changed.emit(self._coins)
     
     def get_coins(self):
         """Get current coin balance."""
         return self.coins
     
-    def use_coins(self, amount):
-        """Use coins if available and save to database."""
+    def use_coins(self, amount, reason="spent"):
+        """Use coins if available and record the debit in the ledger."""
         if self.coins >= amount:
-            self.coins -= amount
-            self._save_coins()
+            self._coins -= amount
+            self._record(-amount, reason)
             # Emit signal when coins are used
-            self.coin_count_changed.emit(self.coins)
+            self.coin_count_changed.emit(self._coins)
             return True
         return False
     
     def get_coupon_history(self):
         """Get history of created coupons."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT type, cost, created_at FROM coupons ORDER BY created_at DESC')
-        coupons = cursor.fetchall()
-        
-        conn.close()
+        self.flush()
+        with self.pool.connection() as conn:
+            coupons = conn.execute('SELECT type, cost, created_at FROM coupons ORDER BY created_at DESC').fetchall()
         
         return [(type, cost, datetime.fromisoformat(created_at)) for type, cost, created_at in coupons]
     
     def clear_coupon_history(self):
         """Clear all coupon history from the database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM coupons')
-        
-        conn.commit()
-        conn.close()
+        self._pending_coupons = []
+        with self.pool.connection() as conn, conn:
+            conn.execute('DELETE FROM coupons')
         
         return True
     
@@ -172,33 +412,38 @@ class CoinManager(QObject):
         return time_diff >= 10  # Award a coin every 10 seconds
     
     def start_timer(self):
-        """Start the timer to add coins periodically."""
-        if not self.timer.isActive():
-            self.timer.start()
-            # Add initial coin if needed
-            if self.last_coin_time is None or self.should_award_coin(datetime.now()):
-                self.add_coin()
+        """Start earning coins."""
+        if self.active:
+            return
+        # Add initial coin if needed
+        if self.last_coin_time is None or self.should_award_coin(datetime.now()):
+            self.add_coin()
+        
+        # Time spent with the browser closed doesn't count
+        self.last_coin_time = datetime.now()
+        self.active = True
+        self._schedule_next_coin()
     
     def stop_timer(self):
-        """Stop the timer."""
-        if self.timer.isActive():
+        """Stop earning coins and save everything queued."""
+        if self.active:
+            self._accrue()
+            self.active = False
             self.timer.stop()
-            self._save_coins()  # Save coins when stopping
+            self.progress_timer.stop()
+        self._save_coins()  # Save coins when stopping
     
     def add_coin(self, count=1):
-        """Add coins to the total count and save to database."""
-        self.coins += count
-        self.last_coin_time = datetime.now()
-        self._save_coins()
-        self.coin_count_changed.emit(self.coins)
-        print(f"Coin added. Total coins: {self.coins}")
+        """Add coins to the total count and record them in the ledger."""
+        self.add_coins(count, "bonus")
+        print(f"Coin added. Total coins: {self._coins}")
     
     def get_coupon_rewards(self):
         """Get the available coupon rewards."""
         return self.COUPON_REWARDS
     
     def convert_to_coupon(self, coupon_type):
-        """Convert coins to a coupon and save to database."""
+        """Convert coins to a coupon; it is saved with the next ledger batch."""
         try:
             if coupon_type not in self.COUPON_REWARDS:
                 return False, "Invalid coupon type"
@@ -207,17 +452,10 @@ class CoinManager(QObject):
             cost = coupon_info["cost"]
             current_time = datetime.now()
             
-            # Save coupon to database
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute(
-                'INSERT INTO coupons (type, cost, created_at) VALUES (?, ?, ?)',
-                (coupon_type, cost, current_time.isoformat())
-            )
-            
-            conn.commit()
-            conn.close()
+            # Queue the coupon so it is committed together with the debit for it
+            self._pending_coupons.append((coupon_type, cost, current_time.isoformat()))
+            if not self.flush_timer.isActive():
+                self.flush_timer.start()
             
             # Generate unique coupon code
             unique_code = f"{coupon_type}{current_time.strftime('%m%d%H%M%S')}"
@@ -234,4 +472,4 @@ class CoinManager(QObject):
             return True, f"Successfully created coupon: {unique_code}"
         except Exception as e:
             print(f"Error in convert_to_coupon: {str(e)}")
-            return False, str(e)
\ No newline at end of file
+            return False, str(e)
@@ -0,0 +1,102 @@
+import re
+import time
+from collections import OrderedDict, deque, namedtuple
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from utils.domain_matcher import host_of
+from utils.rate_limiter import TokenBucket
+
+# QWebEnginePage.JavaScriptConsoleMessageLevel values
+INFO = 0
+WARNING = 1
+ERROR = 2
+LEVEL_NAMES = {INFO: "Info", WARNING: "Warning", ERROR: "Error"}
+
+# Console messages that mean the page's video player failed
+PLAYER_ERROR_PATTERN = re.compile(r'jwplayer|jw player|error 102630|player error', re.IGNORECASE)
+
+ConsoleEntry = namedtuple("ConsoleEntry", "timestamp level origin message line source")
+
+
+class ConsolePipeline(QObject):
+    """Bounded intake for JavaScript console messages.
+
+    Every message is first checked against PLAYER_ERROR_PATTERN, but only
+    while the current page is one set_page() marked as watched. Messages
+    below min_level are then counted and dropped. Each origin (the host of
+    the script that logged) gets its own token bucket of rate_per_minute
+    messages with bursts of up to burst. What gets through is kept in a ring
+    buffer of the last capacity entries for the console dialog. Nothing is
+    printed, so a chatty page costs a few dictionary lookups per message.
+    """
+
+    # Emitted once per page for the first message matching PLAYER_ERROR_PATTERN
+    player_error = pyqtSignal(str)  # message
+
+    def __init__(self, capacity=1000, min_level=WARNING, rate_per_minute=600, burst=50,
+                 max_origins=256, parent=None):
+        super().__init__(parent)
+        self.min_level = min_level
+        self.rate_per_minute = rate_per_minute
+        self.burst = burst
+        self.max_origins = max_origins
+
+        self.entries = deque(maxlen=capacity)
+        self.accepted = 0
+        self.filtered = 0
+        self.dropped = 0
+
+        self._buckets = OrderedDict()  # origin -> TokenBucket, least recently used first
+        self._watched = False
+        self._reported = False
+
+    def set_page(self, watched):
+        """Start a new page; watched pages are scanned for player errors."""
+        self._watched = watched
+        self._reported = False
+
+    def ingest(self, level, message, line, source):
+        """Take one console message from the page."""
+        if self._watched and not self._reported and PLAYER_ERROR_PATTERN.search(message):
+            self._reported = True
+            self.player_error.emit(message)
+
+        if level < self.min_level:
+            self.filtered += 1
+            return
+
+        origin = host_of(source) or source
+        if not self._bucket(origin).acquire(1, time.monotonic()):
+            self.dropped += 1
+            return
+
+        self.accepted += 1
+        self.entries.append(ConsoleEntry(time.time(), level, origin, message, line, source))
+
+    def clear(self):
+        """Empty the buffer and reset the counters."""
+        self.entries.clear()
+        self.accepted = 0
+        self.filtered = 0
+        self.dropped = 0
+
+    def stats(self):
+        """Return the counters since the last clear()."""
+        return {
+            'accepted': self.accepted,
+            'filtered': self.filtered,
+            'dropped': self.dropped,
+            'buffered': len(self.entries),
+        }
+
+    def _bucket(self, origin):
+        bucket = self._buckets.get(origin)
+        if bucket is None:
+            bucket = TokenBucket(self.rate_per_minute, capacity=self.burst)
+            self._buckets[origin] = bucket
+            if len(self._buckets) > self.max_origins:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(origin)
+        return bucket
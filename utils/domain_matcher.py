@@ -0,0 +1,84 @@
+from urllib.parse import urlsplit
+
+# Trie key marking the end of a rule; labels are never empty
+_RULE = ""
+
+
+def host_of(url):
+    """Return the lowercased host of a URL, or "" if it has none.
+
+    URLs without a scheme, like "www.example.com/page", are accepted too.
+    """
+    try:
+        parts = urlsplit(url if "://" in url else "//" + url)
+        host = parts.hostname or ""
+    except ValueError:
+        return ""
+    return host.rstrip(".")
+
+
+class DomainMatcher:
+    """Classifies hosts by domain rules stored in a trie of reversed labels.
+
+    A rule such as "netflix.com" matches that host and all of its subdomains
+    ("www.netflix.com"), but not hosts that merely contain it
+    ("notnetflix.com", "netflix.com.evil"). Each rule carries a value, and a
+    lookup returns the value of the most specific matching rule. Lookups walk
+    one trie level per host label, so their cost does not depend on the
+    number of rules.
+    """
+
+    def __init__(self, rules=(), value=True):
+        self._root = {}
+        self._count = 0
+        for rule in rules:
+            self.add(rule, value)
+
+    @classmethod
+    def from_file(cls, path, value=True):
+        """Load rules from a file with one domain per line and # comments."""
+        matcher = cls()
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    rule = line.split("#", 1)[0].strip()
+                    if rule:
+                        matcher.add(rule, value)
+        except OSError as e:
+            print(f"Error loading domain rules: {str(e)}")
+        return matcher
+
+    def add(self, rule, value=True):
+        """Add a domain rule; "*.example.com" and ".example.com" mean example.com."""
+        domain = rule.strip().lstrip("*").lstrip(".")
+        if "/" in domain or ":" in domain or "@" in domain:
+            # Written as a URL
+            domain = host_of(domain)
+        domain = domain.lower().rstrip(".")
+        if not domain:
+            return
+        node = self._root
+        for label in reversed(domain.split(".")):
+            node = node.setdefault(label, {})
+        if _RULE not in node:
+            self._count += 1
+        node[_RULE] = value
+
+    def match_host(self, host):
+        """Return the value of the most specific rule matching host, or None."""
+        found = None
+        node = self._root
+        for label in reversed(host.lower().rstrip(".").split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            found = node.get(_RULE, found)
+        return found
+
+    def match(self, url):
+        """Return the value of the most specific rule matching the URL's host, or None."""
+        host = host_of(url)
+        return self.match_host(host) if host else None
+
+    def __len__(self):
+        return self._count
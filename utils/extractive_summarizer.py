@@ -0,0 +1,128 @@
+import re
+
+import numpy as np
+
+from utils.page_retriever import tokenize
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def split_sentences(text):
+    """Split page text into sentences.
+
+    Lines are split separately, so headings and list items never merge into
+    the sentence that follows them.
+    """
+    sentences = []
+    for line in text.splitlines():
+        for sentence in _SENTENCE_END.split(line.strip()):
+            sentence = sentence.strip()
+            if sentence:
+                sentences.append(sentence)
+    return sentences
+
+
+class ExtractiveSummarizer:
+    """Local summarizer that picks the most central sentences of a page.
+
+    Sentences become TF-IDF vectors, and TextRank (PageRank over their cosine
+    similarity graph) scores how much each one has in common with the rest of
+    the page. The best max_sentences are returned in page order, skipping any
+    that nearly repeat a sentence already picked. Needs no network access, so
+    it works without an API key and fast enough to preview a summary.
+
+    Only terms shared by at least two sentences can link them, so the rest are
+    dropped before building the matrix; at most max_terms terms and
+    max_candidates sentences are kept to bound memory on very long pages.
+    """
+
+    def __init__(self, max_sentences=7, min_words=6, max_words=60, max_candidates=2000,
+                 max_terms=4000, damping=0.85, redundancy=0.8):
+        self.max_sentences = max_sentences
+        self.min_words = min_words
+        self.max_words = max_words
+        self.max_candidates = max_candidates
+        self.max_terms = max_terms
+        self.damping = damping
+        self.redundancy = redundancy
+
+    def summarize(self, content, metadata=None):
+        """Return a summary of content as bullet points, or "" if it has no usable sentences."""
+        sentences = self.select_sentences(content)
+        if not sentences:
+            return ""
+        title = (metadata or {}).get('title') or 'Web Page'
+        points = "\n".join(f"• {sentence}" for sentence in sentences)
+        return f"Key points from \"{title}\":\n\n{points}"
+
+    def select_sentences(self, content):
+        """Return the summary sentences of content, in page order."""
+        sentences = [
+            sentence for sentence in split_sentences(content)
+            if self.min_words <= len(sentence.split()) <= self.max_words
+        ]
+        if len(sentences) > self.max_candidates:
+            # Sample evenly so the whole page stays represented
+            keep = np.linspace(0, len(sentences) - 1, self.max_candidates).astype(int)
+            sentences = [sentences[index] for index in keep]
+        if len(sentences) <= self.max_sentences:
+            return sentences
+
+        vectors = self._tfidf([tokenize(sentence) for sentence in sentences])
+        similarity = vectors @ vectors.T
+        np.fill_diagonal(similarity, 0.0)
+        scores = self._textrank(similarity)
+
+        chosen = []
+        for index in np.argsort(-scores, kind='stable'):
+            if chosen and similarity[index, chosen].max() > self.redundancy:
+                continue
+            chosen.append(index)
+            if len(chosen) == self.max_sentences:
+                break
+        return [sentences[index] for index in sorted(chosen)]
+
+    def _tfidf(self, token_lists):
+        """Row-normalized TF-IDF matrix (sentences x terms) as float32."""
+        document_frequency = {}
+        for tokens in token_lists:
+            for term in set(tokens):
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+
+        shared = [term for term, frequency in document_frequency.items() if frequency > 1]
+        shared.sort(key=lambda term: -document_frequency[term])
+        vocabulary = {term: column for column, term in enumerate(shared[:self.max_terms])}
+
+        rows = []
+        columns = []
+        for row, tokens in enumerate(token_lists):
+            for term in tokens:
+                column = vocabulary.get(term)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+
+        counts = np.zeros((len(token_lists), max(len(vocabulary), 1)), dtype=np.float32)
+        np.add.at(counts, (np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)), 1.0)
+
+        frequencies = np.array([document_frequency[term] for term in vocabulary], dtype=np.float32)
+        idf = np.log(len(token_lists) / frequencies) if len(frequencies) else np.ones(1, dtype=np.float32)
+        vectors = np.log1p(counts) * idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _textrank(self, similarity, tolerance=1e-6, max_iterations=100):
+        """PageRank scores of the weighted sentence graph."""
+        count = similarity.shape[0]
+        totals = similarity.sum(axis=1, keepdims=True)
+        totals[totals == 0] = 1.0
+        transitions = (similarity / totals).T
+
+        scores = np.full(count, 1.0 / count, dtype=np.float32)
+        for _ in range(max_iterations):
+            updated = (1.0 - self.damping) / count + self.damping * (transitions @ scores)
+            if np.abs(updated - scores).sum() < tolerance:
+                return updated
+            scores = updated
+        return scores
@@ -0,0 +1,96 @@
+import threading
+import time
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+from utils.rate_limiter import backoff_delay
+from utils.text_chunker import estimate_tokens
+
+# Gemini model used for every request; part of the response cache key
+MODEL_NAME = 'gemini-2.0-flash'
+
+# Quota (429) and server-side (5xx) errors are worth retrying
+RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServerError,
+)
+
+
+class GeminiClient:
+    """A GenerativeModel that is configured once and shared by all requests.
+
+    genai.configure() throws away the library's cached API client, so calling
+    it per request meant a new transport, and a new TLS connection, for every
+    call. This object configures the library only when the API key changes and
+    keeps one model whose client, and its open connections, outlive requests.
+    transport and client_options are passed straight to genai.configure().
+
+    Calls wait for rate_limiter, if one is given, and retry quota and server
+    errors with exponential backoff. Waiting and retrying together never take
+    longer than max_wait_seconds unless the caller passes its own deadline.
+    """
+
+    def __init__(self, api_key=None, model_name=MODEL_NAME, transport=None, client_options=None,
+                 rate_limiter=None, max_retries=4, max_wait_seconds=120):
+        self.model_name = model_name
+        self.transport = transport
+        self.client_options = client_options
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.max_wait_seconds = max_wait_seconds
+
+        self.api_key = None
+        self._model = None
+        self._lock = threading.Lock()
+
+        if api_key:
+            self.configure(api_key)
+
+    def configure(self, api_key):
+        """Point the client at an API key. Does nothing if the key is unchanged."""
+        with self._lock:
+            if api_key == self.api_key and self._model is not None:
+                return
+            self.api_key = api_key
+            if not api_key:
+                self._model = None
+                return
+
+            genai.configure(api_key=api_key, transport=self.transport, client_options=self.client_options)
+            self._model = genai.GenerativeModel(self.model_name)
+
+    @property
+    def is_configured(self):
+        return self._model is not None
+
+    def generate_content(self, prompt, deadline=None, **kwargs):
+        """Call GenerativeModel.generate_content on the shared model.
+
+        deadline is a time.monotonic() value. Raises RateLimitTimeout if the
+        rate limiter cannot admit the request in time, or the last API error
+        once retries are exhausted.
+        """
+        # Requests already in flight keep the model they started with when
+        # configure() swaps it out
+        model = self._model
+        if model is None:
+            raise RuntimeError("Gemini client is not configured with an API key")
+        if deadline is None:
+            deadline = time.monotonic() + self.max_wait_seconds
+        tokens = estimate_tokens(prompt) if isinstance(prompt, str) else 1
+
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire(tokens, deadline)
+            try:
+                return model.generate_content(prompt, **kwargs)
+            except RETRYABLE_ERRORS as e:
+                delay = backoff_delay(attempt)
+                if attempt >= self.max_retries or time.monotonic() + delay > deadline:
+                    raise
+                print(f"Gemini request failed ({str(e)}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
@@ -0,0 +1,73 @@
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class GeminiExecutor:
+    """Runs Gemini API calls on a small thread pool, keyed by request id.
+
+    Requests get an integer id up front so the caller can tell results apart
+    and cancel the ones it no longer wants. A request that has not started yet
+    is removed from the queue; one that is already talking to the API cannot be
+    interrupted, so it runs to completion and its result is dropped instead.
+    """
+
+    def __init__(self, max_workers=2):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gemini")
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._futures = {}
+        self._cancelled = set()
+
+    def new_request_id(self):
+        """Reserve an id for a request that will be submitted later."""
+        with self._lock:
+            return next(self._ids)
+
+    def submit(self, request_id, fn, *args):
+        """Run fn(*args) on the pool under an id from new_request_id()."""
+        with self._lock:
+            if request_id in self._cancelled:
+                return None
+            future = self._pool.submit(fn, *args)
+            self._futures[request_id] = future
+        future.add_done_callback(lambda _: self._forget_future(request_id))
+        return future
+
+    def pending_count(self):
+        """Return the number of submitted requests that have not finished."""
+        with self._lock:
+            return len(self._futures)
+
+    def cancel(self, request_id):
+        """Cancel a request so that its result is never delivered."""
+        if request_id is None:
+            return
+        with self._lock:
+            self._cancelled.add(request_id)
+            future = self._futures.pop(request_id, None)
+        if future is not None and future.cancel():
+            # Never started, so nothing will report back for it
+            self.finish(request_id)
+
+    def is_cancelled(self, request_id):
+        """Return True if cancel() was called for this request."""
+        with self._lock:
+            return request_id in self._cancelled
+
+    def finish(self, request_id):
+        """Forget a request once its result has been delivered or dropped."""
+        with self._lock:
+            self._cancelled.discard(request_id)
+            self._futures.pop(request_id, None)
+
+    def shutdown(self):
+        """Drop queued requests and stop accepting new ones."""
+        with self._lock:
+            self._cancelled.update(self._futures)
+            self._futures.clear()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _forget_future(self, request_id):
+        with self._lock:
+            self._futures.pop(request_id, None)
@@ -1,15 +1,350 @@
 import json
 import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtCore import QObject, pyqtSignal, QUrl, QTimer
 from PyQt5.QtWebEngineWidgets import QWebEngineScript
-import google.generativeai as genai
 from dotenv import load_dotenv
 
+from utils.gemini_client import GeminiClient, MODEL_NAME
+from utils.extractive_summarizer import ExtractiveSummarizer
+from utils.gemini_executor import GeminiExecutor
+from utils.page_retriever import PageRetriever
+from utils.rate_limiter import RateLimiter, RateLimitTimeout
+from utils.response_cache import ResponseCache, make_cache_key
+from utils.text_chunker import split_text
+from utils.translation_memory import TranslationMemory, needs_translation, split_segments
+
+# Longest content sent in a single prompt; longer pages are truncated, or
+# summarized chunk by chunk
+MAX_CONTENT_CHARS = 10000
+
+# Token budget of each chunk in a map-reduce summary (~MAX_CONTENT_CHARS)
+SUMMARY_CHUNK_TOKENS = 2500
+
+# Page text sent with a question; longer pages send only the passages most
+# relevant to the question
+QUESTION_CONTEXT_CHARS = 6000
+
+# Requests still waiting for a worker after this long are failed instead of run
+QUEUE_TIMEOUT_SECONDS = 120
+
+# Batch translations whose combined output would be longer than this are
+# fanned out as one request per language instead of one structured request
+BATCH_TRANSLATE_CHARS = 24000
+
+# Language code mapping
+LANGUAGE_CODES = {
+    "English": "en",
+    "Spanish": "es",
+    "French": "fr",
+    "German": "de",
+    "Chinese": "zh",
+    "Japanese": "ja",
+    "Korean": "ko",
+    "Russian": "ru",
+    "Arabic": "ar",
+    "Hindi": "hi",
+    "Portuguese": "pt",
+    "Italian": "it",
+    "Dutch": "nl",
+    "Polish": "pl",
+    "Turkish": "tr",
+    "Vietnamese": "vi",
+    "Thai": "th",
+    "Indonesian": "id"
+}
+
+# Most text the content script returns; pages with more are cut off with "..."
+MAX_CONTENT_BYTES = 100000
+
+# Injected into every page. Extraction is a single TreeWalker pass over the
+# DOM that never reads innerText, so it neither forces a layout nor reads the
+# text of nested elements more than once. Text is grouped into segments, one
+# per run of text inside the same block element; segments are scored the way
+# Readability scores paragraphs, and the best scoring container (plus its
+# strong siblings) is returned, without repeated segments and within
+# MAX_CONTENT_BYTES.
+CONTENT_SCRIPT_JS = """
+// Wrapped in a function so that its names never clash with the page's own
+(function() {
+    const SKIP_TAGS = new Set([
+        'script', 'style', 'noscript', 'template', 'svg', 'canvas', 'iframe', 'object',
+        'embed', 'nav', 'footer', 'aside', 'form', 'button', 'select', 'textarea', 'input'
+    ]);
+    const BLOCK_TAGS = new Set([
+        'body', 'p', 'div', 'section', 'article', 'main', 'header', 'li', 'ul', 'ol', 'dl',
+        'dt', 'dd', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'pre', 'blockquote', 'table', 'tr',
+        'td', 'th', 'figure', 'figcaption', 'address', 'details', 'summary'
+    ]);
+    const POSITIVE_NAMES = /article|body|content|entry|main|page|post|text|blog|story/i;
+    const NEGATIVE_NAMES = /comment|footer|footnote|masthead|banner|meta|promo|related|share|sidebar|sponsor|social|tags|widget|menu|nav|ad-|popup|cookie/i;
+    const MAX_BYTES = __MAX_CONTENT_BYTES__;
+
+    // Split the visible text of the body into segments, in document order
+    function collectSegments() {
+        const rootInfo = {block: document.body, link: false};
+        const info = new Map([[document.body, rootInfo]]);
+        const segments = [];
+        let current = null;
+
+        const walker = document.createTreeWalker(
+            document.body,
+            NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT,
+            {
+                acceptNode(node) {
+                    if (node.nodeType === Node.TEXT_NODE) {
+                        return NodeFilter.FILTER_ACCEPT;
+                    }
+                    if (SKIP_TAGS.has(node.localName) || node.hidden ||
+                            node.getAttribute('aria-hidden') === 'true') {
+                        return NodeFilter.FILTER_REJECT;
+                    }
+                    return NodeFilter.FILTER_ACCEPT;
+                }
+            }
+        );
+
+        for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+            const parent = info.get(node.parentNode) || rootInfo;
+
+            if (node.nodeType === Node.ELEMENT_NODE) {
+                const isBlock = BLOCK_TAGS.has(node.localName);
+                info.set(node, {
+                    block: isBlock ? node : parent.block,
+                    link: parent.link || node.localName === 'a'
+                });
+                if (isBlock || node.localName === 'br') {
+                    current = null;
+                }
+                continue;
+            }
+
+            const text = node.nodeValue.replace(/\\s+/g, ' ');
+            if (text === ' ' || text === '') {
+                if (current) {
+                    current.parts.push(' ');
+                }
+                continue;
+            }
+            if (!current || current.block !== parent.block) {
+                current = {block: parent.block, parts: [], length: 0, linkLength: 0};
+                segments.push(current);
+            }
+            current.parts.push(text);
+            current.length += text.length;
+            if (parent.link) {
+                current.linkLength += text.length;
+            }
+        }
+
+        for (const segment of segments) {
+            segment.text = segment.parts.join('').trim();
+        }
+        return segments;
+    }
+
+    function nameWeight(element) {
+        let weight = 0;
+        if (element.localName === 'article' || element.localName === 'main') {
+            weight += 25;
+        }
+        const names = (element.getAttribute('class') || '') + ' ' + (element.id || '');
+        if (POSITIVE_NAMES.test(names)) {
+            weight += 25;
+        }
+        if (NEGATIVE_NAMES.test(names)) {
+            weight -= 25;
+        }
+        return weight;
+    }
+
+    // Readability-style scoring: substantial segments with commas and few links
+    // add to the score of their block's parent, and half as much to its grandparent
+    function findContentRoots(segments) {
+        const scores = new Map();
+        function addScore(element, points) {
+            if (!element || element.nodeType !== Node.ELEMENT_NODE) {
+                return;
+            }
+            const score = scores.has(element) ? scores.get(element) : nameWeight(element);
+            scores.set(element, score + points);
+        }
+
+        for (const segment of segments) {
+            if (segment.text.length < 25) {
+                continue;
+            }
+            const commas = segment.text.split(',').length - 1;
+            const points = (1 + commas + Math.min(Math.floor(segment.text.length / 100), 3)) *
+                (1 - segment.linkLength / segment.length);
+            const parent = segment.block === document.body ? document.body : segment.block.parentNode;
+            addScore(parent, points);
+            if (parent !== document.body) {
+                addScore(parent.parentNode, points / 2);
+            }
+        }
+
+        let best = document.body;
+        let bestScore = 0;
+        for (const [element, score] of scores) {
+            if (score > bestScore) {
+                best = element;
+                bestScore = score;
+            }
+        }
+
+        // Content is often split over sibling containers; keep the strong ones
+        const roots = new Set([best]);
+        if (best !== document.body && best.parentNode) {
+            const threshold = Math.max(10, bestScore * 0.2);
+            for (const sibling of best.parentNode.children) {
+                if ((scores.get(sibling) || 0) >= threshold) {
+                    roots.add(sibling);
+                }
+            }
+        }
+        return roots;
+    }
+
+    // Join segments inside the roots, skipping repeats, until MAX_BYTES
+    function joinSegments(segments, roots) {
+        const inside = new Map();
+        function isInside(element) {
+            if (!element || element === document) {
+                return false;
+            }
+            if (roots.has(element)) {
+                return true;
+            }
+            if (!inside.has(element)) {
+                inside.set(element, isInside(element.parentNode));
+            }
+            return inside.get(element);
+        }
+
+        const encoder = new TextEncoder();
+        const seen = new Set();
+        const parts = [];
+        let remaining = MAX_BYTES;
+        for (const segment of segments) {
+            if (!segment.text || seen.has(segment.text) || !isInside(segment.block)) {
+                continue;
+            }
+            seen.add(segment.text);
+
+            const bytes = encoder.encode(segment.text).length;
+            if (bytes > remaining) {
+                parts.push(segment.text.substring(0, Math.floor(remaining * segment.text.length / bytes)) + '...');
+                break;
+            }
+            parts.push(segment.text);
+            remaining -= bytes + 2;
+        }
+        return parts.join('\\n\\n');
+    }
+
+    // Function to get the page content
+    function getPageContent() {
+        // Get selected text if any
+        const selection = window.getSelection().toString().trim();
+
+        // If there's a selection, use it
+        if (selection) {
+            return selection;
+        }
+        if (!document.body) {
+            return '';
+        }
+
+        const segments = collectSegments();
+        const content = joinSegments(segments, findContentRoots(segments));
+
+        // Pages without a clear main container, e.g. short or list-like pages
+        if (content.length < 500) {
+            return joinSegments(segments, new Set([document.body]));
+        }
+        return content;
+    }
+
+    // Function to get page metadata
+    function getPageMetadata() {
+        return {
+            title: document.title,
+            url: window.location.href,
+            language: document.documentElement.lang || navigator.language || 'en'
+        };
+    }
+
+    // Function to be called from Python
+    function extractPageContent() {
+        const content = getPageContent();
+        const metadata = getPageMetadata();
+
+        return JSON.stringify({
+            content: content,
+            metadata: metadata
+        });
+    }
+
+    // Make the function available to the page
+    window.extractPageContent = extractPageContent;
+})();
+""".replace('__MAX_CONTENT_BYTES__', str(MAX_CONTENT_BYTES))
+
+# Calls the function injected by the content script; returns its JSON string
+EXTRACT_CONTENT_JS = """
+(function() {
+    try {
+        const result = extractPageContent();
+        return result;
+    } catch (e) {
+        return JSON.stringify({
+            error: true,
+            message: "JavaScript error: " + e.message
+        });
+    }
+})();
+"""
+
+TRANSLATION_INSTRUCTIONS = """Important translation instructions:
+1. Maintain the original formatting and structure
+2. Keep proper nouns unchanged unless they have standard translations
+3. Preserve any technical terms in their correct form
+4. Ensure the translation is natural and fluent in {target_language}
+5. If there are idiomatic expressions, translate them to equivalent expressions in {target_language}"""
+
+class _Flight:
+    """An API call in progress, shared by every request for the same cache key."""
+    
+    def __init__(self, flight_id, cache_key, request_id):
+        self.flight_id = flight_id
+        self.cache_key = cache_key
+        self.waiters = [request_id]
+        self.streamed = []
+
+
 class GeminiHelper(QObject):
     """Helper class for integrating Google Gemini 1.5 Flash API."""
     
     # Signal emitted when AI has processed content
-    result_ready = pyqtSignal(str, str)  # action, result
+    result_ready = pyqtSignal(int, str, str)  # request_id, action, result
+    
+    # Signal emitted with each piece of a response as it streams in
+    partial_result = pyqtSignal(int, str)  # request_id, text
+    
+    # Signal emitted with a quick local summary while Gemini is still summarizing
+    preview_ready = pyqtSignal(int, str)  # request_id, text
+    
+    # Signal emitted with the page content a request extracted, for "Process Again"
+    content_extracted = pyqtSignal(int, str, dict)  # request_id, content, metadata
+    
+    # Carries process_question answers from worker threads back to the GUI thread
+    _question_answered = pyqtSignal(int, str)  # request_id, answer
+    
+    QUEUE_TIMEOUT_MESSAGE = "Request timed out waiting for other Gemini requests to finish. Please try again."
     
     def __init__(self):
         super().__init__()
@@ -27,95 +362,49 @@ class GeminiHelper(QObject):
         self.content_script = self._create_content_script()
         self.current_action = None
         
-        # Configure Gemini API if key is available
-        if self.api_key:
-            genai.configure(api_key=self.api_key)
-    
-    def _create_content_script(self):
-        """Create a JavaScript script to extract content from web pages."""
-        script = QWebEngineScript()
+        # Stream responses through partial_result as they are generated
+        self.streaming = True
         
-        # JavaScript code to extract content
-        js_code = """
-        // Function to get the page content
-        function getPageContent() {
-            // Get selected text if any
-            const selection = window.getSelection().toString().trim();
-            
-            // If there's a selection, use it
-            if (selection) {
-                return selection;
-            }
-            
-            // Otherwise, get the main content
-            // Try to find the main content area
-            const possibleContentElements = [
-                document.querySelector('article'),
-                document.querySelector('main'),
-                document.querySelector('.content'),
-                document.querySelector('#content'),
-                document.querySelector('.article'),
-                document.querySelector('#article')
-            ].filter(el => el !== null);
-            
-            if (possibleContentElements.length > 0) {
-                // Use the first found content element
-                return possibleContentElements[0].innerText;
-            }
-            
-            // Fallback to body text, but try to exclude navigation, footer, etc.
-            const bodyText = document.body.innerText;
-            
-            // If the text is too long, try to be smarter about what we extract
-            if (bodyText.length > 15000) {
-                // Get all paragraphs
-                const paragraphs = Array.from(document.querySelectorAll('p')).map(p => p.innerText).join('\\n\\n');
-                if (paragraphs.length > 1000) {
-                    return paragraphs;
-                }
-                
-                // Get all divs with substantial text
-                const textDivs = Array.from(document.querySelectorAll('div'))
-                    .filter(div => div.innerText.length > 100)
-                    .map(div => div.innerText)
-                    .join('\\n\\n');
-                
-                if (textDivs.length > 1000) {
-                    return textDivs;
-                }
-                
-                // Fallback to first 15000 chars of body
-                return bodyText.substring(0, 15000) + "...";
-            }
-            
-            return bodyText;
-        }
+        # API calls run on worker threads so the browser stays responsive
+        self.executor = GeminiExecutor()
         
-        // Function to get page metadata
-        function getPageMetadata() {
-            return {
-                title: document.title,
-                url: window.location.href,
-                language: document.documentElement.lang || navigator.language || 'en'
-            };
-        }
+        # Chunk summaries get their own pool: request workers block on them,
+        # so sharing one pool could deadlock
+        self.chunk_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="gemini-chunk")
         
-        // Function to be called from Python
-        function extractPageContent() {
-            const content = getPageContent();
-            const metadata = getPageMetadata();
-            
-            return JSON.stringify({
-                content: content,
-                metadata: metadata
-            });
-        }
+        # Repeat requests for the same content are answered without an API call
+        self.response_cache = ResponseCache()
         
-        // Make the function available to the page
-        window.extractPageContent = extractPageContent;
-        """
+        # Identical requests made while one is still running share its API call
+        self._flights = {}      # cache key -> _Flight
+        self._flight_of = {}    # request id -> _Flight it waits on
+        self._flights_lock = threading.Lock()
+        self._question_callbacks = {}
+        self._question_answered.connect(self._deliver_answer)
+        
+        # Passage indexes of recently asked-about pages, reused by follow-up questions
+        self.page_retriever = PageRetriever()
+        
+        # Lines translated before, so repeated page content isn't sent again
+        self.translation_memory = TranslationMemory()
         
-        script.setSourceCode(js_code)
+        # Summarize backend: 'gemini', 'local' (offline extractive summary) or
+        # 'auto', which uses Gemini and falls back to the local summary when
+        # there is no API key or Gemini fails, is rate-limited or too slow
+        self.summary_backend = os.getenv("SUMMARY_BACKEND", "auto").lower()
+        self.extractive_summarizer = ExtractiveSummarizer()
+        
+        # Show a local summary through preview_ready while Gemini works
+        self.summary_preview = True
+        
+        # Configure Gemini API once; the client is reused by every request
+        self.client = GeminiClient(self.api_key, rate_limiter=RateLimiter.from_env())
+    
+    def _create_content_script(self):
+        """Create a JavaScript script to extract content from web pages."""
+        script = QWebEngineScript()
+        
+        script.setSourceCode(CONTENT_SCRIPT_JS)
         script.setInjectionPoint(QWebEngineScript.DocumentReady)
         script.setWorldId(QWebEngineScript.MainWorld)
         script.setRunsOnSubFrames(True)
@@ -129,93 +418,278 @@ class GeminiHelper(QObject):
     def set_api_key(self, api_key):
         """Set the Gemini API key."""
         self.api_key = api_key
-        if self.api_key:
-            genai.configure(api_key=self.api_key)
+        self.client.configure(self.api_key)
     
-    def _validate_api_key(self):
-        """Validate that the API key is set and configured."""
+    def _api_key_error(self):
+        """Return an error message if the API key is missing or invalid, else None."""
         if not self.api_key:
-            self.result_ready.emit('error', "API key not found in .env file. Please check your .env file configuration.")
-            return False
+            return "API key not found in .env file. Please check your .env file configuration."
             
         # Check if the API key is valid (not empty or placeholder)
         if self.api_key.strip() == "" or "your-api-key" in self.api_key.lower():
-            self.result_ready.emit('error', "API key appears to be invalid. Please set a valid API key in your .env file.")
-            return False
-            
-        # Reload the API key configuration just to be sure
-        genai.configure(api_key=self.api_key)
-        return True
+            return "API key appears to be invalid. Please set a valid API key in your .env file."
+        return None
+    
+    def _emit_result(self, request_id, action, result):
+        """Emit result_ready unless the request was cancelled. Safe to call from any thread."""
+        if not self.executor.is_cancelled(request_id):
+            self.result_ready.emit(request_id, action, result)
+        self.executor.finish(request_id)
+    
+    def _emit_preview(self, request_id, text):
+        """Emit preview_ready unless the request was cancelled. Safe to call from any thread."""
+        if not self.executor.is_cancelled(request_id):
+            self.preview_ready.emit(request_id, text)
+    
+    def _emit_partial(self, request_id, text):
+        """Emit partial_result unless the request was cancelled. Safe to call from any thread."""
+        if not self.executor.is_cancelled(request_id):
+            self.partial_result.emit(request_id, text)
+    
+    def _stream_callback(self, request_id):
+        """Return the on_chunk callback for a request, or None when not streaming."""
+        if not self.streaming:
+            return None
+        return lambda text: self._emit_partial(request_id, text)
+    
+    def cancel(self, request_id):
+        """Cancel a request started by process_with_gemini or process_question."""
+        self.executor.cancel(request_id)
+        self._question_callbacks.pop(request_id, None)
+        
+        # Stop a shared API call only once nobody is waiting for it any more
+        with self._flights_lock:
+            flight = self._flight_of.pop(request_id, None)
+            if flight is None:
+                return
+            flight.waiters.remove(request_id)
+            abandoned = not flight.waiters
+            if abandoned:
+                del self._flights[flight.cache_key]
+        
+        # Nothing will report on this request any more
+        self.executor.finish(request_id)
+        if abandoned:
+            self.executor.cancel(flight.flight_id)
+    
+    def shutdown(self):
+        """Cancel outstanding requests, stop the worker threads and save cache hits."""
+        self._question_callbacks.clear()
+        self.executor.shutdown()
+        self.chunk_pool.shutdown(wait=False, cancel_futures=True)
+        self.response_cache.flush_touches()
     
     def process_with_gemini(self, web_page, action, target_language="English"):
-        """Process the current page content with Gemini 1.5 Flash."""
-        # Validate API key before processing
-        if not self._validate_api_key():
-            return
+        """Process the current page content with Gemini 1.5 Flash.
+        
+        For 'translate', target_language may also be a list of languages, which
+        are translated as one batch. Returns the request id that result_ready
+        will carry for this request.
+        """
+        request_id = self.executor.new_request_id()
+        
+        # Validate API key before processing. Errors are reported asynchronously,
+        # like results, so the caller always knows the request id first.
+        error = self._api_key_error()
+        if error and not (action == 'summarize' and self.summary_backend != 'gemini'):
+            QTimer.singleShot(0, lambda: self._emit_result(request_id, 'error', error))
+            return request_id
             
         # Store the current action
         self.current_action = action
         
         # JavaScript to call our injected function
-        js_code = """
-        (function() {
-            try {
-                const result = extractPageContent();
-                return result;
-            } catch (e) {
-                return JSON.stringify({
-                    error: true,
-                    message: "JavaScript error: " + e.message
-                });
-            }
-        })();
-        """
+        js_code = EXTRACT_CONTENT_JS
         
         # Execute the JavaScript and get the result
-        web_page.runJavaScript(js_code, lambda result: self._handle_content(result, action, target_language))
+        web_page.runJavaScript(
+            js_code,
+            lambda result: self._handle_content(result, request_id, action, target_language)
+        )
+        return request_id
     
-    def _handle_content(self, result, action, target_language):
-        """Handle the extracted content and send to Gemini."""
+    def extract_content(self, web_page, callback):
+        """Extract the page content without processing it.
+        
+        callback(content, metadata) is called on the GUI thread, with
+        (None, None) if the content could not be extracted.
+        """
+        def on_result(result):
+            try:
+                data = json.loads(result)
+                if data.get('error', False):
+                    raise ValueError(data.get('message', 'Unknown error'))
+            except Exception as e:
+                print(f"Error extracting page content: {str(e)}")
+                callback(None, None)
+                return
+            callback(data.get('content', ''), data.get('metadata', {}))
+        
+        web_page.runJavaScript(EXTRACT_CONTENT_JS, on_result)
+    
+    def _handle_content(self, result, request_id, action, target_language):
+        """Handle the extracted content and send it to a Gemini worker thread."""
+        if self.executor.is_cancelled(request_id):
+            self.executor.finish(request_id)
+            return
+            
         try:
             # Parse the JSON result
             data = json.loads(result)
             
             if data.get('error', False):
-                self.result_ready.emit('error', data.get('message', 'Unknown error'))
+                self._emit_result(request_id, 'error', data.get('message', 'Unknown error'))
                 return
             
             content = data.get('content', '')
             metadata = data.get('metadata', {})
             
-            # Limit content length to avoid token limits
-            if len(content) > 10000:
-                content = content[:10000] + "..."
-            
-            # Check if API key is set
-            if not self.api_key:
-                self.result_ready.emit('error', "Gemini API key is not set. Please set your API key in the settings.")
-                return
+            self.content_extracted.emit(request_id, content, metadata)
+            self.process_extracted_content(content, metadata, action, target_language, request_id)
+                
+        except Exception as e:
+            error_details = traceback.format_exc()
+            print(f"Error handling content: {str(e)}\nDetails: {error_details}")
+            self._emit_result(request_id, 'error', f"Error processing content: {str(e)}")
+    
+    def process_extracted_content(self, content, metadata, action, target_language="English", request_id=None):
+        """Run an action on already extracted content in the background.
+        
+        Returns the request id that result_ready will carry for this request.
+        """
+        if request_id is None:
+            request_id = self.executor.new_request_id()
+        
+        # target_language may be a list of languages for a batch translation
+        if action == 'translate' and not isinstance(target_language, str):
+            target_language = list(dict.fromkeys(target_language))
+            if len(target_language) == 1:
+                target_language = target_language[0]
+        
+        cache_key = self._cache_key(content, action, target_language)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            QTimer.singleShot(0, lambda: self._emit_result(request_id, action, cached))
+            return request_id
+        
+        with self._flights_lock:
+            flight = self._flights.get(cache_key)
+            if flight is not None:
+                # Same content, action and language already in flight: share it
+                flight.waiters.append(request_id)
+                self._flight_of[request_id] = flight
+                streamed = "".join(flight.streamed)
+                if streamed:
+                    QTimer.singleShot(0, lambda: self._emit_partial(request_id, streamed))
+                return request_id
             
-            # Process with Gemini based on action
+            flight = _Flight(self.executor.new_request_id(), cache_key, request_id)
+            self._flights[cache_key] = flight
+            self._flight_of[request_id] = flight
+        
+        deadline = time.monotonic() + QUEUE_TIMEOUT_SECONDS
+        self.executor.submit(
+            flight.flight_id, self._run_action, flight, deadline, content, metadata, action, target_language
+        )
+        return request_id
+    
+    def _cache_key(self, content, action, target_language):
+        """Response cache key for an action on some content."""
+        # Only translations depend on the target language
+        language = self._language_key(target_language) if action == 'translate' else None
+        return make_cache_key(content, action, language, MODEL_NAME)
+    
+    def has_cached_result(self, content, action, target_language="English"):
+        """Return True if the result of an action on content is already cached."""
+        return self.response_cache.contains(self._cache_key(content, action, target_language))
+    
+    def is_busy(self):
+        """Return True while any Gemini request is queued or running."""
+        return self.executor.pending_count() > 0
+    
+    def _run_action(self, flight, deadline, content, metadata, action, target_language):
+        """Worker-thread entry point: process content with Gemini based on action."""
+        # Local summaries are cheap to redo and must not shadow a later Gemini summary
+        cacheable = True
+        
+        if action == 'summarize' and self._summarize_locally():
+            result_action, result = self._summarize_extractive(content, metadata)
+            cacheable = False
+        elif time.monotonic() > deadline:
+            result_action, result = 'error', self.QUEUE_TIMEOUT_MESSAGE
+        else:
+            on_chunk = None
+            if self.streaming:
+                on_chunk = lambda text: self._stream_flight(flight, text)
             if action == 'summarize':
-                self._summarize_with_gemini(content, metadata)
+                if self.summary_preview:
+                    self.chunk_pool.submit(self._preview_flight, flight, content, metadata)
+                result_action, result = self._summarize_with_gemini(content, metadata, on_chunk)
+            elif action == 'translate' and not isinstance(target_language, str):
+                # Each language is cached on its own; the joined text may hold failures
+                result_action, result = self._translate_batch(content, metadata, target_language)
+                cacheable = False
             elif action == 'translate':
-                self._translate_with_gemini(content, metadata, target_language)
+                result_action, result = self._translate_with_gemini(
+                    self._truncate(content), metadata, target_language, on_chunk
+                )
             elif action == 'explain':
-                self._explain_with_gemini(content, metadata)
+                result_action, result = self._explain_with_gemini(self._truncate(content), metadata, on_chunk)
             else:
-                self.result_ready.emit('error', f"Unknown action: {action}")
-                
-        except Exception as e:
-            error_details = traceback.format_exc()
-            print(f"Error handling content: {str(e)}\nDetails: {error_details}")
-            self.result_ready.emit('error', f"Error processing content: {str(e)}")
+                result_action, result = 'error', f"Unknown action: {action}"
+        
+        failed = result_action == 'error'
+        if action == 'summarize' and failed and self.summary_backend == 'auto':
+            result_action, result = self._summarize_extractive(content, metadata, result)
+            cacheable = False
+            failed = result_action == 'error'
+        
+        # Never cache failures
+        if cacheable and not failed:
+            self.response_cache.put(flight.cache_key, result)
+        self._finish_flight(flight, result_action, result)
+    
+    def _stream_flight(self, flight, text):
+        """Send a streamed piece of text to every request waiting on a flight."""
+        with self._flights_lock:
+            flight.streamed.append(text)
+            waiters = list(flight.waiters)
+        for request_id in waiters:
+            self._emit_partial(request_id, text)
+    
+    def _finish_flight(self, flight, action, result):
+        """Deliver a flight's result to every request waiting on it."""
+        with self._flights_lock:
+            if self._flights.get(flight.cache_key) is flight:
+                del self._flights[flight.cache_key]
+            waiters = list(flight.waiters)
+            for request_id in waiters:
+                self._flight_of.pop(request_id, None)
+        for request_id in waiters:
+            self._emit_result(request_id, action, result)
+        self.executor.finish(flight.flight_id)
     
-    def _summarize_with_gemini(self, content, metadata):
-        """Summarize content using Gemini 1.5 Flash."""
+    @staticmethod
+    def _truncate(content):
+        """Limit content length to avoid token limits."""
+        if len(content) > MAX_CONTENT_CHARS:
+            return content[:MAX_CONTENT_CHARS] + "..."
+        return content
+    
+    def _summarize_with_gemini(self, content, metadata, on_chunk=None):
+        """Summarize content using Gemini 1.5 Flash.
+        
+        Content longer than one chunk is summarized map-reduce style: chunks are
+        summarized in parallel, then the partial summaries are merged. Only the
+        final merge is streamed to on_chunk.
+        """
         try:
             title = metadata.get('title', 'Web Page')
             
+            chunks = split_text(content, SUMMARY_CHUNK_TOKENS)
+            if len(chunks) > 1:
+                return self._summarize_chunks(chunks, title, on_chunk)
+            
             # Prepare the prompt
             prompt = f"""Summarize the following web page content from "{title}":
 
@@ -225,73 +699,283 @@ Provide a concise summary that captures the main points and key information.
 """
             
             # Call Gemini API
-            response = self._call_gemini_api(prompt)
+            status, response = self._call_gemini_api(prompt, on_chunk)
             
-            if response:
-                self.result_ready.emit('summarize', response)
-            else:
-                self.result_ready.emit('error', "Failed to get a response from Gemini.")
+            if status == 'error':
+                return 'error', response
+            return 'summarize', response
                 
         except Exception as e:
-            self.result_ready.emit('error', f"Error summarizing with Gemini: {str(e)}")
+            return 'error', f"Error summarizing with Gemini: {str(e)}"
+    
+    def _summarize_locally(self):
+        """Return True if summaries should skip Gemini altogether."""
+        if self.summary_backend == 'local':
+            return True
+        return self.summary_backend == 'auto' and self._api_key_error() is not None
+    
+    def _summarize_extractive(self, content, metadata, gemini_error=None):
+        """Summarize content offline from its most central sentences.
+        
+        gemini_error is the failure that made this the fallback, if any.
+        """
+        try:
+            summary = self.extractive_summarizer.summarize(content, metadata)
+        except Exception as e:
+            return 'error', gemini_error or f"Error summarizing page: {str(e)}"
+        if not summary:
+            return 'error', gemini_error or "The page has no text to summarize."
+        if gemini_error:
+            summary += f"\n\n(Offline summary: Gemini was unavailable. {gemini_error})"
+        return 'summarize', summary
     
-    def _translate_with_gemini(self, content, metadata, target_language):
-        """Translate content using Gemini 1.5 Flash."""
+    def _preview_flight(self, flight, content, metadata):
+        """Send a local summary to every request waiting on a Gemini summary."""
         try:
-            source_language = metadata.get('language', 'auto')
+            preview = self.extractive_summarizer.summarize(content, metadata)
+        except Exception as e:
+            print(f"Error building summary preview: {str(e)}")
+            return
+        if not preview:
+            return
+        with self._flights_lock:
+            waiters = list(flight.waiters)
+        for request_id in waiters:
+            self._emit_preview(request_id, preview)
+    
+    def _summarize_chunks(self, chunks, title, on_chunk=None):
+        """Summarize each chunk concurrently, then merge the partial summaries."""
+        prompts = [
+            f"""The following is part {index} of {len(chunks)} of the web page "{title}":
+
+{chunk}
+
+Summarize this part concisely, keeping its main points and key information.
+"""
+            for index, chunk in enumerate(chunks, 1)
+        ]
+        partials = []
+        for status, partial in self.chunk_pool.map(self._call_gemini_api, prompts):
+            if status == 'error':
+                return 'error', partial
+            partials.append(partial)
+        
+        combined = "\n\n".join(
+            f"Part {index}:\n{partial}" for index, partial in enumerate(partials, 1)
+        )
+        
+        # Very long pages can produce more partial summaries than fit in one
+        # prompt; reduce them in another parallel round first
+        reduced_chunks = split_text(combined, SUMMARY_CHUNK_TOKENS)
+        if len(reduced_chunks) > 1:
+            return self._summarize_chunks(reduced_chunks, title, on_chunk)
+        
+        prompt = f"""Below are summaries of consecutive parts of the web page "{title}":
+
+{combined}
+
+Combine them into a single concise summary of the whole page that captures the main points and key information.
+"""
+        status, response = self._call_gemini_api(prompt, on_chunk)
+        if status == 'error':
+            return 'error', response
+        return 'summarize', response
+    
+    def _translate_with_gemini(self, content, metadata, target_language, on_chunk=None):
+        """Translate content using Gemini 1.5 Flash.
+        
+        Lines found in the translation memory are filled in from it and only new
+        lines are sent to Gemini. If the line-by-line response can't be matched
+        up with the lines, the whole text is translated in one prompt instead.
+        """
+        try:
+            outcome = self._translate_segments(content, target_language)
+            if outcome is None:
+                return self._translate_whole(content, target_language, on_chunk)
+            status, translation = outcome
+            if status == 'error':
+                return 'error', translation
             
-            # Language code mapping
-            language_codes = {
-                "English": "en",
-                "Spanish": "es",
-                "French": "fr",
-                "German": "de",
-                "Chinese": "zh",
-                "Japanese": "ja",
-                "Korean": "ko",
-                "Russian": "ru",
-                "Arabic": "ar",
-                "Hindi": "hi",
-                "Portuguese": "pt",
-                "Italian": "it",
-                "Dutch": "nl",
-                "Polish": "pl",
-                "Turkish": "tr",
-                "Vietnamese": "vi",
-                "Thai": "th",
-                "Indonesian": "id"
-            }
+            # Add a header to indicate the translation
+            final_response = f"Translation to {target_language}:\n\n{translation}"
+            if on_chunk:
+                on_chunk(final_response)
+            return 'translate', final_response
+                
+        except Exception as e:
+            return 'error', f"Error translating with Gemini: {str(e)}"
+    
+    def _translate_segments(self, content, target_language):
+        """Translate content line by line through the translation memory.
+        
+        Returns a (status, text) pair as _call_gemini_api does, or None if the
+        response did not match the lines that were sent.
+        """
+        pieces = split_segments(content)
+        segments = [piece for piece in pieces if not piece.startswith("\n") and needs_translation(piece)]
+        known = self.translation_memory.lookup(segments, target_language)
+        novel = list(dict.fromkeys(segment for segment in segments if segment not in known))
+        
+        if novel:
+            target_code = LANGUAGE_CODES.get(target_language, "en")
+            prompt = f"""Translate each string in the following JSON array to {target_language} ({target_code}):
+
+{json.dumps([segment.strip() for segment in novel], ensure_ascii=False)}
+
+{TRANSLATION_INSTRUCTIONS.format(target_language=target_language)}
+
+Respond with only a JSON array of the same length that contains the translations in the same order.
+Do not wrap it in a code block and do not include explanations or notes."""
             
-            target_code = language_codes.get(target_language, "en")
+            status, response = self._call_gemini_api(prompt)
+            if status == 'error':
+                return status, response
+            try:
+                translated = self._parse_json(response)
+            except ValueError:
+                return None
+            if (not isinstance(translated, list) or len(translated) != len(novel)
+                    or not all(isinstance(item, str) for item in translated)):
+                return None
+            
+            new = dict(zip(novel, translated))
+            self.translation_memory.store(new, target_language)
+            known.update(new)
+        
+        # Reassemble, keeping each line's indentation
+        output = []
+        for piece in pieces:
+            if piece in known:
+                indent = piece[:len(piece) - len(piece.lstrip())]
+                output.append(indent + known[piece].strip())
+            else:
+                output.append(piece)
+        return 'ok', "".join(output)
+    
+    def _translate_whole(self, content, target_language, on_chunk=None):
+        """Translate content as a single prompt, streaming it to on_chunk."""
+        try:
+            target_code = LANGUAGE_CODES.get(target_language, "en")
             
             # Prepare the prompt with specific translation instructions
             prompt = f"""Translate the following content to {target_language} ({target_code}):
 
 {content}
 
-Important translation instructions:
-1. Maintain the original formatting and structure
-2. Keep proper nouns unchanged unless they have standard translations
-3. Preserve any technical terms in their correct form
-4. Ensure the translation is natural and fluent in {target_language}
-5. If there are idiomatic expressions, translate them to equivalent expressions in {target_language}
+{TRANSLATION_INSTRUCTIONS.format(target_language=target_language)}
 
 Please provide only the translation without any explanations or notes."""
             
+            if on_chunk:
+                # Stream under the same header the final result carries
+                on_chunk(f"Translation to {target_language}:\n\n")
+            
             # Call Gemini API
-            response = self._call_gemini_api(prompt)
+            status, response = self._call_gemini_api(prompt, on_chunk)
             
-            if response:
-                # Add a header to indicate the translation
-                final_response = f"Translation to {target_language}:\n\n{response}"
-                self.result_ready.emit('translate', final_response)
-            else:
-                self.result_ready.emit('error', f"Failed to translate to {target_language}")
+            if status == 'error':
+                return 'error', response
+            
+            # Add a header to indicate the translation
+            final_response = f"Translation to {target_language}:\n\n{response}"
+            return 'translate', final_response
                 
         except Exception as e:
-            self.result_ready.emit('error', f"Error translating with Gemini: {str(e)}")
+            return 'error', f"Error translating with Gemini: {str(e)}"
+    
+    @staticmethod
+    def _language_key(target_language):
+        """Cache key component for one target language or a list of them."""
+        if isinstance(target_language, str):
+            return target_language
+        return ", ".join(target_language)
     
-    def _explain_with_gemini(self, content, metadata):
+    def _translate_batch(self, content, metadata, target_languages):
+        """Translate content into several languages, caching each one separately.
+        
+        Only the languages that succeeded are cached, and the joined result is
+        not cached at all, so a failed language is retried next time. Languages
+        that are already cached cost nothing. The rest are asked for in
+        one structured request when the combined output is small enough, and
+        otherwise (or for any language that request missed) in parallel, one
+        request per language.
+        """
+        text = self._truncate(content)
+        results = {}
+        keys = {
+            language: make_cache_key(content, 'translate', language, MODEL_NAME)
+            for language in target_languages
+        }
+        
+        missing = []
+        for language in target_languages:
+            cached = self.response_cache.get(keys[language])
+            if cached is not None:
+                results[language] = cached
+            else:
+                missing.append(language)
+        
+        if len(missing) > 1 and len(text) * len(missing) <= BATCH_TRANSLATE_CHARS:
+            results.update(self._translate_structured(text, missing))
+        
+        still_missing = [language for language in missing if language not in results]
+        translated = self.chunk_pool.map(
+            lambda language: self._translate_with_gemini(text, metadata, language), still_missing
+        )
+        failed = set()
+        for language, (action, result) in zip(still_missing, translated):
+            if action == 'error':
+                results[language] = f"Translation to {language} failed: {result}"
+                failed.add(language)
+            else:
+                results[language] = result
+        
+        for language in missing:
+            if language not in failed:
+                self.response_cache.put(keys[language], results[language])
+        
+        if len(failed) == len(target_languages):
+            return 'error', "\n\n".join(results[language] for language in target_languages)
+        return 'translate', "\n\n".join(results[language] for language in target_languages)
+    
+    def _translate_structured(self, text, target_languages):
+        """Translate text into several languages with one request for a JSON reply.
+        
+        Returns {language: headed translation} for every language the response
+        contained; missing or malformed entries are left out.
+        """
+        codes = {language: LANGUAGE_CODES.get(language, language) for language in target_languages}
+        language_list = ", ".join(f"{language} ({code})" for language, code in codes.items())
+        example = ", ".join(f'"{code}": "..."' for code in codes.values())
+        prompt = f"""Translate the following content into each of these languages: {language_list}.
+
+{text}
+
+{TRANSLATION_INSTRUCTIONS.format(target_language="each target language")}
+
+Respond with only a JSON object that maps each language code to the complete translation, like {{{example}}}.
+Do not wrap it in a code block and do not include explanations or notes."""
+        
+        status, response = self._call_gemini_api(prompt)
+        if status == 'error':
+            return {}
+        
+        try:
+            translations = self._parse_json(response)
+        except ValueError:
+            print("Batch translation returned invalid JSON; translating languages one by one")
+            return {}
+        if not isinstance(translations, dict):
+            return {}
+        
+        results = {}
+        for language, code in codes.items():
+            translation = translations.get(code)
+            if isinstance(translation, str) and translation.strip():
+                results[language] = f"Translation to {language}:\n\n{translation}"
+        return results
+    
+    def _explain_with_gemini(self, content, metadata, on_chunk=None):
         """Explain content using Gemini 1.5 Flash."""
         try:
             title = metadata.get('title', 'Web Page')
@@ -305,57 +989,93 @@ Provide a clear explanation that would help someone understand this content, inc
 """
             
             # Call Gemini API
-            response = self._call_gemini_api(prompt)
+            status, response = self._call_gemini_api(prompt, on_chunk)
             
-            if response:
-                self.result_ready.emit('explain', response)
-            else:
-                self.result_ready.emit('error', "Failed to get a response from Gemini.")
+            if status == 'error':
+                return 'error', response
+            return 'explain', response
                 
         except Exception as e:
-            self.result_ready.emit('error', f"Error explaining with Gemini: {str(e)}")
+            return 'error', f"Error explaining with Gemini: {str(e)}"
     
-    def _call_gemini_api(self, prompt):
-        """Call the Gemini 1.5 Flash API with the given prompt."""
+    @staticmethod
+    def _parse_json(response):
+        """Parse a JSON reply, tolerating a surrounding ```json code fence.
+        
+        The pinned google-generativeai has no JSON response mode, so the format
+        is only requested in the prompt. Raises ValueError if it isn't JSON.
+        """
+        text = response.strip()
+        if text.startswith("```"):
+            text = text.split("\n", 1)[1] if "\n" in text else ""
+            text = text.rsplit("```", 1)[0]
+        return json.loads(text)
+    
+    def _call_gemini_api(self, prompt, on_chunk=None):
+        """Call the Gemini 1.5 Flash API with the given prompt.
+        
+        Returns ('ok', text), or ('error', message) if no text was generated.
+        If on_chunk is given the response is streamed, and on_chunk is called
+        with each piece of text as it arrives. The full text is returned either way.
+        """
         try:
             # Validate API key before proceeding
             if not self.api_key:
                 print("Error: API key is not set")
-                return "Error: API key not found. Please check your .env file and ensure GEMINI_API_KEY is set correctly."
+                return 'error', "Error: API key not found. Please check your .env file and ensure GEMINI_API_KEY is set correctly."
                 
             # Check if the API key is valid (not empty or placeholder)
             if self.api_key.strip() == "" or "your-api-key" in self.api_key.lower():
                 print("Error: API key appears to be invalid")
-                return "Error: API key appears to be invalid. Please set a valid API key in your .env file."
+                return 'error', "Error: API key appears to be invalid. Please set a valid API key in your .env file."
                 
-            # Reload the API key configuration just to be sure
-            genai.configure(api_key=self.api_key)
-            
-            # Create a Gemini model instance
-            model = genai.GenerativeModel('gemini-2.0-flash')
-            
             # Generate content with timeout handling
             try:
-                response = model.generate_content(prompt)
-                
-                # Extract the text from the response
-                if response and hasattr(response, 'text'):
-                    return response.text
+                if on_chunk:
+                    text = self._stream_gemini_api(prompt, on_chunk)
                 else:
-                    return "No response generated. Please try again."
+                    response = self.client.generate_content(prompt)
+                    
+                    # Extract the text from the response
+                    text = response.text if response and hasattr(response, 'text') else ""
+                
+                if not text:
+                    return 'error', "Error: No response generated. Please try again."
+                return 'ok', text
+            except RateLimitTimeout:
+                return 'error', "Error: Too many Gemini requests right now; this one timed out waiting for the rate limit. Please try again shortly."
             except Exception as api_error:
                 error_message = str(api_error).lower()
                 if "timeout" in error_message or "timed out" in error_message:
-                    return "Error: Request to Gemini API timed out. Please try again with shorter content or check your internet connection."
+                    return 'error', "Error: Request to Gemini API timed out. Please try again with shorter content or check your internet connection."
+                elif "429" in error_message or "quota" in error_message:
+                    return 'error', "Error: Gemini API quota exceeded. Please wait a minute and try again."
                 elif "key" in error_message and ("invalid" in error_message or "unauthorized" in error_message):
-                    return "Error: Invalid API key. Please check your API key in the .env file and try again."
+                    return 'error', "Error: Invalid API key. Please check your API key in the .env file and try again."
                 else:
                     raise  # Re-raise for the outer exception handler
                 
         except Exception as e:
             error_details = traceback.format_exc()
             print(f"Error calling Gemini API: {str(e)}\nDetails: {error_details}")
-            return f"Error: {str(e)}. Please check your API key in the .env file and try again."
+            return 'error', f"Error: {str(e)}. Please check your API key in the .env file and try again."
+    
+    def _stream_gemini_api(self, prompt, on_chunk):
+        """Stream a response, passing each piece of text to on_chunk.
+        
+        Returns the full text, which is empty if no piece carried any.
+        """
+        parts = []
+        for chunk in self.client.generate_content(prompt, stream=True):
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunks that only carry finish or safety metadata have no text
+                continue
+            if text:
+                parts.append(text)
+                on_chunk(text)
+        return "".join(parts)
     
     def process_question(self, web_page, question, callback):
         """Process a user question by reading the current page or searching the web.
@@ -363,64 +1083,81 @@ Provide a clear explanation that would help someone understand this content, inc
         Args:
             web_page: The current web page.
             question: The user's question.
-            callback: Callback function to receive the result.
+            callback: Callback function to receive the result. It is always
+                called on the GUI thread, and not at all if the request is cancelled.
+                While streaming, partial_result carries the answer as it is generated.
+        
+        Returns:
+            The request id, which can be passed to cancel().
         """
+        request_id = self.executor.new_request_id()
+        self._question_callbacks[request_id] = callback
+        
         # Validate API key before processing
-        if not self._validate_api_key():
-            callback("Error: API key not found or invalid. Please check your .env file and ensure GEMINI_API_KEY is set correctly.")
-            return
-            
-        # Additional validation of API key format
-        if self.api_key.strip() == "" or "your-api-key" in self.api_key.lower():
-            callback("Error: API key appears to be invalid. Please set a valid API key in your .env file.")
-            return
+        error = self._api_key_error()
+        if error:
+            QTimer.singleShot(0, lambda: self._deliver_answer(request_id, f"Error: {error}"))
+            return request_id
             
         # JavaScript to call our injected function to get page content
-        js_code = """
-        (function() {
-            try {
-                const result = extractPageContent();
-                return result;
-            } catch (e) {
-                return JSON.stringify({
-                    error: true,
-                    message: "JavaScript error: " + e.message
-                });
-            }
-        })();
-        """
+        js_code = EXTRACT_CONTENT_JS
         
         # Execute the JavaScript and get the result
-        web_page.runJavaScript(js_code, lambda result: self._handle_question(result, question, callback))
+        web_page.runJavaScript(js_code, lambda result: self._handle_question(result, request_id, question))
+        return request_id
     
-    def _handle_question(self, result, question, callback):
-        """Handle the extracted content and process the user's question.
+    def _handle_question(self, result, request_id, question):
+        """Handle the extracted content and send the user's question to a worker thread.
         
         Args:
             result: The extracted page content.
+            request_id: The id returned by process_question.
             question: The user's question.
-            callback: Callback function to receive the result.
         """
+        if request_id not in self._question_callbacks:
+            # Cancelled while the page content was being extracted
+            self.executor.finish(request_id)
+            return
+            
         try:
             # Parse the JSON result
             data = json.loads(result)
             
             if data.get('error', False):
-                callback(f"Error: {data.get('message', 'Unknown error')}")
+                self._deliver_answer(request_id, f"Error: {data.get('message', 'Unknown error')}")
                 return
             
             content = data.get('content', '')
             metadata = data.get('metadata', {})
             
-            # Limit content length to avoid token limits
-            if len(content) > 10000:
-                content = content[:10000] + "..."
+            deadline = time.monotonic() + QUEUE_TIMEOUT_SECONDS
+            self.executor.submit(request_id, self._answer_question, request_id, deadline, question, content, metadata)
+                
+        except Exception as e:
+            error_details = traceback.format_exc()
+            print(f"Error handling question: {str(e)}\nDetails: {error_details}")
+            self._deliver_answer(request_id, f"Error: {str(e)}")
+    
+    def _answer_question(self, request_id, deadline, question, content, metadata):
+        """Worker-thread entry point: ask Gemini and hand the answer to the GUI thread."""
+        if time.monotonic() > deadline:
+            self._question_answered.emit(request_id, f"Error: {self.QUEUE_TIMEOUT_MESSAGE}")
+            return
+            
+        try:
+            if len(content) > QUESTION_CONTEXT_CHARS:
+                # Send only the passages that match the question
+                index = self.page_retriever.index_for(content)
+                content = index.context_for(question, QUESTION_CONTEXT_CHARS)
+                description = "Here are the parts of the webpage most relevant to my question"
+            else:
+                description = "Here's the content of the webpage"
             
             # Prepare the prompt
             prompt = f"""I have a question about a webpage I'm viewing. The webpage title is "{metadata.get('title', 'Web Page')}" 
 and the URL is {metadata.get('url', 'unknown')}.
 
-Here's the content of the webpage:
+{description}:
 {content}
 
 My question is: {question}
@@ -431,14 +1168,18 @@ Make it clear whether your answer comes from the webpage or from your general kn
 """
             
             # Call Gemini API
-            response = self._call_gemini_api(prompt)
-            
-            if response:
-                callback(response)
-            else:
-                callback("Error: Failed to get a response from Gemini.")
-                
+            # Failure messages already read "Error: ...", which is how the
+            # question callback tells them apart
+            _, response = self._call_gemini_api(prompt, self._stream_callback(request_id))
         except Exception as e:
             error_details = traceback.format_exc()
-            print(f"Error handling question: {str(e)}\nDetails: {error_details}")
-            callback(f"Error: {str(e)}")
\ No newline at end of file
+            print(f"Error answering question: {str(e)}\nDetails: {error_details}")
+            response = f"Error: {str(e)}"
+        self._question_answered.emit(request_id, response)
+    
+    def _deliver_answer(self, request_id, answer):
+        """Pass an answer to its process_question callback on the GUI thread."""
+        callback = self._question_callbacks.pop(request_id, None)
+        self.executor.finish(request_id)
+        if callback:
+            callback(answer)
@@ -0,0 +1,125 @@
+import hashlib
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+
+from utils.response_cache import normalize_content
+from utils.text_chunker import split_text
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+# Words too common to say anything about relevance
+STOPWORDS = frozenset("""
+a an and are as at be but by can did do does for from had has have how i if in into is it
+its me my of on or so that the their them then there these they this to was we were what
+when where which who why will with you your
+""".split())
+
+
+def tokenize(text):
+    """Lowercase words of a text, without stopwords."""
+    return [word for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+
+
+class PassageIndex:
+    """BM25 index over the passages of one page.
+
+    The page is split into passages of about passage_tokens tokens at
+    paragraph and sentence boundaries; search() ranks them against a query.
+    """
+
+    def __init__(self, content, passage_tokens=150, k1=1.5, b=0.75):
+        self.passages = split_text(content, passage_tokens)
+        self.k1 = k1
+        self.b = b
+
+        self._term_counts = [Counter(tokenize(passage)) for passage in self.passages]
+        self._lengths = [sum(counts.values()) for counts in self._term_counts]
+        self._average_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+
+        document_frequency = Counter()
+        for counts in self._term_counts:
+            document_frequency.update(counts.keys())
+        total = len(self.passages)
+        self._idf = {
+            term: math.log(1.0 + (total - frequency + 0.5) / (frequency + 0.5))
+            for term, frequency in document_frequency.items()
+        }
+
+    def search(self, query, k=5):
+        """Return up to k (passage number, score) pairs, best first; zero scores are dropped."""
+        terms = [term for term in set(tokenize(query)) if term in self._idf]
+        if not terms:
+            return []
+
+        scores = []
+        for number, counts in enumerate(self._term_counts):
+            length_norm = self.k1 * (1.0 - self.b + self.b * self._lengths[number] / (self._average_length or 1.0))
+            score = 0.0
+            for term in terms:
+                frequency = counts.get(term)
+                if frequency:
+                    score += self._idf[term] * frequency * (self.k1 + 1.0) / (frequency + length_norm)
+            if score > 0:
+                scores.append((number, score))
+
+        scores.sort(key=lambda item: item[1], reverse=True)
+        return scores[:k]
+
+    def context_for(self, query, max_chars=6000):
+        """Return the most relevant passages for a query, in page order, within max_chars.
+
+        Gaps between passages that are not adjacent on the page are marked
+        with "[...]". Falls back to the start of the page if nothing matches.
+        """
+        ranked = [number for number, _ in self.search(query, k=len(self.passages))]
+        if not ranked:
+            ranked = list(range(len(self.passages)))
+
+        chosen = []
+        used = 0
+        for number in ranked:
+            length = len(self.passages[number])
+            if chosen and used + length > max_chars:
+                continue
+            chosen.append(number)
+            used += length
+            if used >= max_chars:
+                break
+        chosen.sort()
+
+        parts = []
+        for position, number in enumerate(chosen):
+            if position and number != chosen[position - 1] + 1:
+                parts.append("[...]")
+            parts.append(self.passages[number])
+        return "\n\n".join(parts)
+
+
+class PageRetriever:
+    """Caches a PassageIndex per page so follow-up questions skip re-indexing."""
+
+    def __init__(self, max_pages=8, passage_tokens=150):
+        self.max_pages = max_pages
+        self.passage_tokens = passage_tokens
+        self._indexes = OrderedDict()  # content hash -> PassageIndex
+        self._lock = threading.Lock()
+
+    def index_for(self, content):
+        """Return the index for a page's content, building it on first use."""
+        key = hashlib.sha256(normalize_content(content).encode("utf-8")).hexdigest()
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                return index
+
+        # Build outside the lock; two threads racing on one page just both build it
+        index = PassageIndex(content, self.passage_tokens)
+        with self._lock:
+            self._indexes[key] = index
+            self._indexes.move_to_end(key)
+            while len(self._indexes) > self.max_pages:
+                self._indexes.popitem(last=False)
+        return index
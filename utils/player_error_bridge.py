@@ -0,0 +1,173 @@
+from PyQt5.QtCore import QObject, QFile, QIODevice, pyqtSignal, pyqtSlot
+from PyQt5.QtWebChannel import QWebChannel
+from PyQt5.QtWebEngineWidgets import QWebEngineScript
+
+# Detects JW Player errors without polling. Errors are caught by a window
+# 'error' listener (script errors carrying a player error text, and a failed
+# load of the jwplayer.js script itself) and a MutationObserver that only
+# looks at the nodes and class changes it is told about, never at the whole
+# document. The first error found on a page is pushed to Python once through
+# the web channel, then detection stops.
+DETECTOR_JS = """
+(function() {
+    if (window.__playerErrorDetector || typeof qt === 'undefined' || typeof QWebChannel === 'undefined') {
+        return;
+    }
+    window.__playerErrorDetector = true;
+
+    const ERROR_TEXTS = ['Error 102630', 'JW Player Error', 'jwplayer.js:'];
+    const ERROR_CLASSES = /(^|\\s)(jw-error|jw-state-error)(\\s|$)/;
+    // The player script, self-hosted or from the cloud library, not the
+    // skins, thumbnails or media served from the same CDN
+    const PLAYER_SCRIPT = /(\\/jwplayer(\\.[\\w-]+)*|\\/\\/cdn\\.jwplayer\\.com\\/libraries\\/[\\w-]+)\\.js([?#]|$)/i;
+    let bridge = null;
+    let pending = null;
+    let reported = false;
+    let observer = null;
+
+    new QWebChannel(qt.webChannelTransport, function(channel) {
+        bridge = channel.objects.%(name)s;
+        if (pending !== null) {
+            bridge.reportError(pending);
+        }
+    });
+
+    function report(detail) {
+        if (reported) {
+            return;
+        }
+        reported = true;
+        if (observer) {
+            observer.disconnect();
+        }
+        window.removeEventListener('error', onError, true);
+        if (bridge) {
+            bridge.reportError(detail);
+        } else {
+            pending = detail;
+        }
+    }
+
+    function findErrorText(text) {
+        for (let i = 0; i < ERROR_TEXTS.length; i++) {
+            if (text.includes(ERROR_TEXTS[i])) {
+                return ERROR_TEXTS[i];
+            }
+        }
+        return null;
+    }
+
+    function onError(event) {
+        const target = event.target;
+        if (target instanceof HTMLScriptElement) {
+            if (PLAYER_SCRIPT.test(target.src)) {
+                report('Failed to load ' + target.src);
+            }
+            return;
+        }
+        const found = findErrorText(event.message || '');
+        if (found) {
+            report(event.message);
+        }
+    }
+    window.addEventListener('error', onError, true);
+
+    function isErrorElement(element) {
+        return ERROR_CLASSES.test(element.getAttribute('class') || '');
+    }
+
+    // Check a node that was just added, including its subtree if a script
+    // inserted one in a single operation
+    function checkAdded(node) {
+        if (node.nodeType === Node.TEXT_NODE) {
+            return findErrorText(node.data);
+        }
+        if (node.nodeType !== Node.ELEMENT_NODE) {
+            return null;
+        }
+        if (isErrorElement(node)) {
+            return 'JW Player error element';
+        }
+        const walker = document.createTreeWalker(node, NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT);
+        for (let child = walker.nextNode(); child; child = walker.nextNode()) {
+            const found = child.nodeType === Node.TEXT_NODE ? findErrorText(child.data) :
+                (isErrorElement(child) ? 'JW Player error element' : null);
+            if (found) {
+                return found;
+            }
+        }
+        return null;
+    }
+
+    observer = new MutationObserver(function(mutations) {
+        for (const mutation of mutations) {
+            let found = null;
+            if (mutation.type === 'childList') {
+                for (let i = 0; i < mutation.addedNodes.length && !found; i++) {
+                    found = checkAdded(mutation.addedNodes[i]);
+                }
+            } else if (mutation.type === 'characterData') {
+                found = findErrorText(mutation.target.data);
+            } else if (isErrorElement(mutation.target)) {
+                found = 'JW Player error state';
+            }
+            if (found) {
+                report(found);
+                return;
+            }
+        }
+    });
+    observer.observe(document, {
+        childList: true,
+        subtree: true,
+        characterData: true,
+        attributes: true,
+        attributeFilter: ['class']
+    });
+})();
+"""
+
+
+class PlayerErrorBridge(QObject):
+    """Receives video player errors pushed from web pages over a QWebChannel.
+
+    install() registers the bridge on a page and adds a script that runs in
+    every document the page loads, so nothing has to be re-injected or polled
+    after navigation. player_error is emitted on the GUI thread.
+    """
+
+    player_error = pyqtSignal(str)  # description of the error
+
+    NAME = "playerErrorBridge"
+
+    def install(self, web_page):
+        """Expose the bridge to web_page and start detecting errors in it."""
+        self.channel = QWebChannel(web_page)
+        self.channel.registerObject(self.NAME, self)
+        web_page.setWebChannel(self.channel)
+
+        script = QWebEngineScript()
+        script.setName(self.NAME)
+        script.setSourceCode(self._channel_library() + DETECTOR_JS % {'name': self.NAME})
+        # Early enough to see errors raised while the page is still loading
+        script.setInjectionPoint(QWebEngineScript.DocumentCreation)
+        script.setWorldId(QWebEngineScript.MainWorld)
+        script.setRunsOnSubFrames(False)
+        web_page.scripts().insert(script)
+
+    @pyqtSlot(str)
+    def reportError(self, detail):
+        """Called from the page's JavaScript when a player error is detected."""
+        self.player_error.emit(detail)
+
+    @staticmethod
+    def _channel_library():
+        """Source of qwebchannel.js, which ships as a Qt resource."""
+        library = QFile(":/qtwebchannel/qwebchannel.js")
+        if not library.open(QIODevice.ReadOnly):
+            print("Error loading qwebchannel.js")
+            return ""
+        try:
+            return bytes(library.readAll()).decode("utf-8")
+        finally:
+            library.close()
@@ -0,0 +1,98 @@
+import os
+import random
+import threading
+import time
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a request cannot be admitted before its deadline."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at rate_per_minute.
+
+    capacity bounds the burst size and defaults to one minute's worth of
+    tokens. Requests for more than capacity are clamped to capacity, so a
+    single oversized request drains the bucket instead of waiting forever.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._condition = threading.Condition()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def available(self):
+        """Return the number of tokens that could be taken right now."""
+        with self._condition:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    def acquire(self, amount=1, deadline=None):
+        """Take amount tokens, waiting for them if needed.
+
+        deadline is a time.monotonic() value; returns False if the tokens
+        would not be available by then, True once they have been taken.
+        """
+        amount = min(float(amount), self.capacity)
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return True
+
+                wait = (amount - self._tokens) / self.rate
+                if deadline is not None and now + wait > deadline:
+                    return False
+                # Woken early by refund(); otherwise sleep until enough has refilled
+                self._condition.wait(wait)
+
+    def refund(self, amount):
+        """Return tokens that were taken but not used."""
+        with self._condition:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + amount)
+            self._condition.notify_all()
+
+
+class RateLimiter:
+    """Client-side limits on Gemini requests per minute and tokens per minute.
+
+    Defaults match the free tier of gemini-2.0-flash and can be overridden
+    with the GEMINI_RPM and GEMINI_TPM environment variables.
+    """
+
+    def __init__(self, requests_per_minute=15, tokens_per_minute=1000000):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    @classmethod
+    def from_env(cls):
+        """Create a limiter configured from GEMINI_RPM / GEMINI_TPM."""
+        return cls(
+            requests_per_minute=int(os.getenv("GEMINI_RPM", "15")),
+            tokens_per_minute=int(os.getenv("GEMINI_TPM", "1000000")),
+        )
+
+    def acquire(self, tokens, deadline=None):
+        """Wait until one request of about `tokens` tokens may be sent.
+
+        Raises RateLimitTimeout if that would take past the deadline.
+        """
+        if not self.requests.acquire(1, deadline):
+            raise RateLimitTimeout("Timed out waiting for the Gemini request rate limit")
+        if not self.tokens.acquire(tokens, deadline):
+            self.requests.refund(1)
+            raise RateLimitTimeout("Timed out waiting for the Gemini token rate limit")
+
+
+def backoff_delay(attempt, base=1.0, maximum=30.0):
+    """Exponential backoff with full jitter for the given retry attempt (0-based)."""
+    return random.uniform(0, min(maximum, base * (2 ** attempt)))
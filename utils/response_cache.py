@@ -0,0 +1,206 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from database.connection_pool import get_pool
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'gemini_cache.db')
+
+
+def normalize_content(content):
+    """Collapse whitespace so trivial layout differences map to the same key."""
+    return " ".join(content.split())
+
+
+def make_cache_key(content, action, target_language, model_name):
+    """Hash the inputs that determine a Gemini response into a cache key."""
+    parts = (normalize_content(content), action, target_language or "", model_name)
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier cache for Gemini responses: an in-memory LRU over SQLite.
+
+    Entries expire ttl_seconds after they were stored. The memory tier keeps
+    the memory_size most recently used entries; the disk tier drops the least
+    recently used entries once stored responses exceed max_disk_bytes.
+    Safe to use from the GUI thread and the Gemini worker threads at once.
+
+    Lookups never write: hits from either tier are queued and their last_used
+    stamps are written with the next put() or flush_touches(), which run on
+    the worker threads and at shutdown.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, memory_size=64,
+                 max_disk_bytes=32 * 1024 * 1024, ttl_seconds=7 * 86400):
+        self.db_path = db_path
+        self.memory_size = memory_size
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+
+        self._memory = OrderedDict()  # key -> (response, created_at)
+        self._touched = {}  # key -> last_used not yet written to disk
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.pool = get_pool(db_path)
+        self.initialize_db()
+
+    def initialize_db(self):
+        """Create the responses table if it does not exist."""
+        try:
+            with self.pool.connection() as conn, conn:
+                conn.execute('''
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                ''')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)')
+        except Exception as e:
+            print(f"Error initializing response cache: {str(e)}")
+
+    def get(self, key):
+        """Return the cached response for a key, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[1] < self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                self._touched[key] = now
+                return entry[0]
+            self._memory.pop(key, None)
+
+        # Expired rows are left for the next put() to delete
+        row = None
+        try:
+            with self.pool.connection() as conn:
+                row = conn.execute(
+                    'SELECT response, created_at FROM responses WHERE key = ? AND created_at > ?',
+                    (key, now - self.ttl_seconds)
+                ).fetchone()
+        except Exception as e:
+            print(f"Error reading response cache: {str(e)}")
+            row = None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[key] = now
+            self._remember(key, row[0], row[1])
+        return row[0]
+
+    def contains(self, key):
+        """Return True if a live entry exists, without counting a hit or miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[1] < self.ttl_seconds:
+                return True
+        try:
+            with self.pool.connection() as conn:
+                row = conn.execute(
+                    'SELECT 1 FROM responses WHERE key = ? AND created_at > ?', (key, now - self.ttl_seconds)
+                ).fetchone()
+            return row is not None
+        except Exception as e:
+            print(f"Error reading response cache: {str(e)}")
+            return False
+
+    def put(self, key, response):
+        """Store a response in both tiers."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, response, now)
+
+        try:
+            with self.pool.connection() as conn, conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO responses (key, response, size, created_at, last_used) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (key, response, len(response.encode('utf-8')), now, now)
+                )
+                self._write_touches(conn)
+                self._evict(conn, now)
+        except Exception as e:
+            print(f"Error writing response cache: {str(e)}")
+
+    def flush_touches(self):
+        """Write the queued last_used stamps of recent hits."""
+        try:
+            with self.pool.connection() as conn, conn:
+                self._write_touches(conn)
+        except Exception as e:
+            print(f"Error writing response cache: {str(e)}")
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+        try:
+            with self.pool.connection() as conn, conn:
+                conn.execute('DELETE FROM responses')
+        except Exception as e:
+            print(f"Error clearing response cache: {str(e)}")
+
+    def stats(self):
+        """Return hit/miss counters for this session."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.hits - self.memory_hits,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def _remember(self, key, response, created_at):
+        """Insert into the memory tier, dropping the least recently used entry."""
+        self._memory[key] = (response, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _write_touches(self, conn):
+        """Apply the queued last_used stamps inside the caller's transaction."""
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        if touched:
+            conn.executemany(
+                'UPDATE responses SET last_used = MAX(last_used, ?) WHERE key = ?',
+                [(last_used, key) for key, last_used in touched.items()]
+            )
+
+    def _evict(self, conn, now):
+        """Drop expired entries, then the least recently used ones over the size cap."""
+        conn.execute('DELETE FROM responses WHERE created_at <= ?', (now - self.ttl_seconds,))
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+
+        excess = total - self.max_disk_bytes
+        stale = []
+        for key, size in conn.execute('SELECT key, size FROM responses ORDER BY last_used'):
+            stale.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany('DELETE FROM responses WHERE key = ?', stale)
+        with self._lock:
+            for (key,) in stale:
+                self._memory.pop(key, None)
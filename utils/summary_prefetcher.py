@@ -0,0 +1,159 @@
+import os
+import time
+
+from PyQt5.QtCore import QObject, QTimer
+
+from utils.text_chunker import estimate_tokens
+
+# Requests per minute kept free for what the user asks for explicitly
+RESERVED_REQUESTS = 3
+
+
+class SummaryPrefetcher(QObject):
+    """Summarizes pages in the background so the Summarize action is instant.
+
+    Once a page has finished loading and nothing else has happened for
+    idle_ms, its content is extracted and summarized through the helper like
+    any other request, so the result lands in the response cache. A user who
+    opens Summarize while the prefetch is still running joins the same Gemini
+    call instead of starting a second one.
+
+    Prefetching is low priority: it waits while other Gemini requests are
+    queued or running, leaves RESERVED_REQUESTS of the per-minute request
+    rate to the user, and stops for the day once daily_token_budget tokens
+    have been spent on it. Opt-in through GEMINI_PREFETCH=1 or the menu.
+    """
+
+    def __init__(self, gemini_helper, idle_ms=5000, daily_token_budget=None, enabled=None, parent=None):
+        super().__init__(parent)
+        self.gemini_helper = gemini_helper
+        self.idle_ms = idle_ms
+        if daily_token_budget is None:
+            daily_token_budget = int(os.getenv("GEMINI_PREFETCH_DAILY_TOKENS", "200000"))
+        self.daily_token_budget = daily_token_budget
+        if enabled is None:
+            enabled = os.getenv("GEMINI_PREFETCH", "0").lower() in ("1", "true", "yes")
+        self.enabled = enabled
+
+        self._page = None
+        self._url = None
+        self._request_id = None
+
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.timeout.connect(self._on_idle)
+
+        self.gemini_helper.result_ready.connect(self._on_result_ready)
+        self.initialize_db()
+
+    def initialize_db(self):
+        """Create the table that tracks tokens spent on prefetching per day."""
+        try:
+            with self.gemini_helper.response_cache.pool.connection() as conn, conn:
+                conn.execute('''
+                CREATE TABLE IF NOT EXISTS prefetch_usage (
+                    day TEXT PRIMARY KEY,
+                    tokens INTEGER NOT NULL
+                )
+                ''')
+        except Exception as e:
+            print(f"Error initializing prefetch usage: {str(e)}")
+
+    def set_enabled(self, enabled):
+        """Turn prefetching on or off."""
+        self.enabled = enabled
+        if not enabled:
+            self.page_changed()
+
+    def page_loaded(self, page):
+        """Schedule a prefetch for a page that has just finished loading."""
+        self.page_changed()
+        if not self.enabled:
+            return
+        url = page.url().toString()
+        if not url.startswith(("http://", "https://")):
+            return
+        self._page = page
+        self._url = url
+        self.idle_timer.start(self.idle_ms)
+
+    def page_changed(self):
+        """Drop the scheduled or running prefetch for the previous page."""
+        self.idle_timer.stop()
+        self._page = None
+        self._url = None
+        if self._request_id is not None:
+            self.gemini_helper.cancel(self._request_id)
+            self._request_id = None
+
+    def tokens_used_today(self):
+        """Return the number of tokens spent on prefetching today."""
+        try:
+            with self.gemini_helper.response_cache.pool.connection() as conn:
+                row = conn.execute(
+                    'SELECT tokens FROM prefetch_usage WHERE day = ?', (self._today(),)
+                ).fetchone()
+            return row[0] if row else 0
+        except Exception as e:
+            print(f"Error reading prefetch usage: {str(e)}")
+            return 0
+
+    def _record_usage(self, tokens):
+        try:
+            with self.gemini_helper.response_cache.pool.connection() as conn, conn:
+                conn.execute(
+                    'INSERT INTO prefetch_usage (day, tokens) VALUES (?, ?) '
+                    'ON CONFLICT(day) DO UPDATE SET tokens = tokens + excluded.tokens',
+                    (self._today(), tokens)
+                )
+                # Only today's row matters
+                conn.execute('DELETE FROM prefetch_usage WHERE day < ?', (self._today(),))
+        except Exception as e:
+            print(f"Error recording prefetch usage: {str(e)}")
+
+    @staticmethod
+    def _today():
+        return time.strftime("%Y-%m-%d")
+
+    def _has_headroom(self):
+        """Return True if a prefetch would not hold up a request from the user."""
+        if self.gemini_helper.is_busy():
+            return False
+        limiter = self.gemini_helper.client.rate_limiter
+        if limiter is None:
+            return True
+        return limiter.requests.available() >= RESERVED_REQUESTS + 1
+
+    def _on_idle(self):
+        if self._page is None or self.gemini_helper._api_key_error():
+            return
+        if not self._has_headroom():
+            # Try again after another idle period
+            self.idle_timer.start(self.idle_ms)
+            return
+
+        url = self._url
+        self.gemini_helper.extract_content(
+            self._page, lambda content, metadata: self._on_content(url, content, metadata)
+        )
+
+    def _on_content(self, url, content, metadata):
+        # The user navigated away while the content was being extracted
+        if url != self._url or not content or self._request_id is not None:
+            return
+        if self.gemini_helper.has_cached_result(content, 'summarize'):
+            return
+
+        # Approximate: the prompt around the content and the summary itself
+        # add a little, map-reduce over long pages adds one summary per chunk
+        tokens = estimate_tokens(content) + 500
+        if self.tokens_used_today() + tokens > self.daily_token_budget:
+            print("Prefetch skipped: daily token budget reached")
+            return
+
+        self._record_usage(tokens)
+        self._request_id = self.gemini_helper.process_extracted_content(content, metadata, 'summarize')
+
+    def _on_result_ready(self, request_id, action, result):
+        if request_id == self._request_id:
+            self._request_id = None
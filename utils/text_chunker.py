@@ -0,0 +1,53 @@
+import re
+
+# Rough average for English prose; good enough to size prompts
+CHARS_PER_TOKEN = 4
+
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def estimate_tokens(text):
+    """Estimate the number of model tokens in a piece of text."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def split_text(text, max_tokens=2500):
+    """Split text into chunks of at most max_tokens estimated tokens.
+
+    Chunks break at paragraph boundaries where possible, then at sentence
+    boundaries, and only cut through a sentence that is longer than a whole
+    chunk on its own. Consecutive pieces are packed greedily, so chunks stay
+    close to the budget and keep their original order.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+
+    # (separator that joined the piece to the previous one, piece)
+    pieces = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(("\n\n", paragraph))
+            continue
+        separator = "\n\n"
+        for sentence in _SENTENCE_END.split(paragraph):
+            while len(sentence) > max_chars:
+                pieces.append((separator, sentence[:max_chars]))
+                sentence = sentence[max_chars:]
+                separator = ""
+            if sentence:
+                pieces.append((separator, sentence))
+            separator = " "
+
+    chunks = []
+    current = ""
+    for separator, piece in pieces:
+        if current and len(current) + len(separator) + len(piece) > max_chars:
+            chunks.append(current)
+            current = ""
+        current = current + separator + piece if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,117 @@
+import hashlib
+import os
+import re
+import time
+
+from database.connection_pool import get_pool
+from utils.response_cache import normalize_content
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'translation_memory.db')
+
+# Lines are the natural segments of extracted page text: headings, menu
+# entries, paragraphs
+_LINE = re.compile(r'[^\n]+|\n+')
+
+
+def split_segments(text):
+    """Split text into lines and the newlines between them.
+
+    Joining the returned pieces gives back the original text exactly.
+    """
+    return _LINE.findall(text)
+
+
+def needs_translation(segment):
+    """Return True if a segment contains any letters worth translating."""
+    return any(character.isalpha() for character in segment)
+
+
+def segment_hash(segment):
+    """Hash of a segment's normalized text."""
+    return hashlib.sha256(normalize_content(segment).encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    """Persistent store of translated segments keyed by (segment hash, language).
+
+    Pages of one site repeat headers, navigation and boilerplate paragraphs,
+    so most segments of a revisited page are already known and only the new
+    ones have to be sent to Gemini. The store keeps at most max_segments rows,
+    dropping the least recently used ones.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, max_segments=200000):
+        self.db_path = db_path
+        self.max_segments = max_segments
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.pool = get_pool(db_path)
+        self.initialize_db()
+
+    def initialize_db(self):
+        """Create the segments table if it does not exist."""
+        try:
+            with self.pool.connection() as conn, conn:
+                conn.execute('''
+                CREATE TABLE IF NOT EXISTS segments (
+                    hash TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    used_at REAL NOT NULL,
+                    PRIMARY KEY (hash, language)
+                ) WITHOUT ROWID
+                ''')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_segments_used_at ON segments(used_at)')
+        except Exception as e:
+            print(f"Error initializing translation memory: {str(e)}")
+
+    def lookup(self, segments, language):
+        """Return {segment: translation} for the segments already in the store."""
+        hashes = {segment_hash(segment): segment for segment in set(segments)}
+        found = {}
+        if not hashes:
+            return found
+
+        try:
+            with self.pool.connection() as conn, conn:
+                keys = list(hashes)
+                # Stay well under SQLite's bound-parameter limit
+                for start in range(0, len(keys), 500):
+                    batch = keys[start:start + 500]
+                    placeholders = ", ".join("?" * len(batch))
+                    rows = conn.execute(
+                        f'SELECT hash, translation FROM segments WHERE language = ? AND hash IN ({placeholders})',
+                        [language] + batch
+                    ).fetchall()
+                    for key, translation in rows:
+                        found[hashes[key]] = translation
+
+                now = time.time()
+                conn.executemany(
+                    'UPDATE segments SET used_at = ? WHERE hash = ? AND language = ?',
+                    [(now, segment_hash(segment), language) for segment in found]
+                )
+        except Exception as e:
+            print(f"Error reading translation memory: {str(e)}")
+        return found
+
+    def store(self, translations, language):
+        """Save {segment: translation} pairs for a language."""
+        if not translations:
+            return
+        now = time.time()
+        try:
+            with self.pool.connection() as conn, conn:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO segments (hash, language, translation, used_at) VALUES (?, ?, ?, ?)',
+                    [(segment_hash(segment), language, translation, now)
+                     for segment, translation in translations.items()]
+                )
+                count = conn.execute('SELECT COUNT(*) FROM segments').fetchone()[0]
+                if count > self.max_segments:
+                    conn.execute(
+                        'DELETE FROM segments WHERE (hash, language) IN '
+                        '(SELECT hash, language FROM segments ORDER BY used_at LIMIT ?)',
+                        (count - self.max_segments,)
+                    )
+        except Exception as e:
+            print(f"Error writing translation memory: {str(e)}")
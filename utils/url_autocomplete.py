@@ -0,0 +1,225 @@
+import bisect
+import heapq
+import time
+from urllib.parse import urlparse
+
+from database.frecency import add_visit, visit_score
+
+# Bookmarked URLs rank as if they had this many extra log2-units of frecency
+BOOKMARK_BONUS = 2.0
+
+
+def normalize_url(url):
+    """Normalize a URL or typed text for prefix matching.
+
+    Drops the scheme, a leading "www." and a trailing slash, and lowercases,
+    so "https://www.GitHub.com/" and "github.com" share the key "github.com".
+    """
+    text = url.strip().lower()
+    scheme_end = text.find("://")
+    if scheme_end != -1:
+        text = text[scheme_end + 3:]
+    if text.startswith("www."):
+        text = text[4:]
+    return text.rstrip("/")
+
+
+class UrlAutocomplete:
+    """In-memory prefix index over history and bookmarks for URL-bar suggestions.
+
+    Keys are normalized URLs plus bare hosts, kept in a sorted list searched
+    with bisect. Every prefix that matches more than scan_limit keys, at any
+    length, has its best suggestions cached and updated incrementally; this
+    is exact because frecency scores only ever grow. Other prefixes are
+    answered by ranking their at most scan_limit matches, so no keystroke
+    costs more than that. The index holds at most max_entries keys, dropping
+    the lowest-frecency ones when it overflows.
+    """
+
+    def __init__(self, max_entries=20000, max_results=8, scan_limit=64):
+        self.max_entries = max_entries
+        self.max_results = max_results
+        self.scan_limit = scan_limit
+
+        self._keys = []       # sorted normalized keys
+        self._entries = {}    # key -> [url, title, frecency]
+        self._top = {}        # broad prefix -> keys with the highest frecency
+
+    def load(self, db_manager):
+        """Build the index from the most frecent places and all bookmarks."""
+        entries = {}
+
+        def merge(key, url, title, frecency):
+            entry = entries.get(key)
+            if entry is None:
+                entries[key] = [url, title, frecency]
+            else:
+                entry[2] = add_visit(entry[2], frecency)
+                if not entry[1]:
+                    entry[1] = title
+
+        try:
+            for url, title, frecency in db_manager.get_frecent_places(self.max_entries):
+                if frecency is None or not self._indexable(url):
+                    continue
+                merge(normalize_url(url), url, title, frecency)
+                host_url = self._host_url(url)
+                if host_url:
+                    merge(normalize_url(host_url), host_url, None, frecency)
+
+            now_score = visit_score(time.time())
+            for _, title, url in db_manager.get_bookmarks():
+                if not self._indexable(url):
+                    continue
+                key = normalize_url(url)
+                entry = entries.get(key)
+                if entry is None:
+                    entries[key] = [url, title, now_score + BOOKMARK_BONUS]
+                else:
+                    entry[2] += BOOKMARK_BONUS
+        except Exception as e:
+            print(f"Error loading autocomplete index: {str(e)}")
+
+        self._rebuild(entries)
+
+    def record_visit(self, url, title=None, visit_time=None):
+        """Fold a new visit into the index, as add_history_entry does on disk."""
+        if not self._indexable(url):
+            return
+        score = visit_score(time.time() if visit_time is None else visit_time)
+
+        self._add(normalize_url(url), url, title, score)
+        host_url = self._host_url(url)
+        if host_url:
+            self._add(normalize_url(host_url), host_url, None, score)
+
+        # Trim in bulk so eviction cost is amortized over many visits
+        if len(self._keys) > self.max_entries * 1.25:
+            self._rebuild(self._entries)
+
+    def record_bookmark(self, url, title=None):
+        """Fold a new bookmark into the index, ranked as load() ranks bookmarks."""
+        if not self._indexable(url):
+            return
+        key = normalize_url(url)
+        entry = self._entries.get(key)
+        if entry is None:
+            self._add(key, url, title, visit_score(time.time()) + BOOKMARK_BONUS)
+        else:
+            entry[2] += BOOKMARK_BONUS
+            if title and not entry[1]:
+                entry[1] = title
+            self._promote(key)
+
+    def suggest(self, text, limit=None):
+        """Return up to `limit` (url, title) suggestions for typed text."""
+        limit = limit or self.max_results
+        prefix = normalize_url(text)
+        if not prefix:
+            return []
+
+        top = self._top.get(prefix)
+        if top is not None and limit <= self.max_results:
+            keys = top[:limit]
+        else:
+            lo = bisect.bisect_left(self._keys, prefix)
+            hi = bisect.bisect_left(self._keys, prefix + "\uffff")
+            keys = heapq.nlargest(limit, self._keys[lo:hi], key=lambda k: self._entries[k][2])
+
+        return [(self._entries[key][0], self._entries[key][1]) for key in keys]
+
+    def __len__(self):
+        return len(self._keys)
+
+    @staticmethod
+    def _indexable(url):
+        """Only web pages are suggested, not file:, about:, data: and the like."""
+        return bool(url) and url.startswith(("http://", "https://"))
+
+    @staticmethod
+    def _host_url(url):
+        """Return scheme://host for a URL, or None if it has no path beyond the host."""
+        parsed = urlparse(url)
+        if not parsed.netloc or (parsed.path in ("", "/") and not parsed.query):
+            return None
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def _add(self, key, url, title, score):
+        """Insert a key or raise its frecency, keeping the prefix caches exact."""
+        if not key:
+            return
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = [url, title, score]
+            bisect.insort(self._keys, key)
+            self._cache_broad_prefixes(key)
+        else:
+            entry[2] = add_visit(entry[2], score)
+            if title:
+                entry[1] = title
+        self._promote(key)
+
+    def _promote(self, key):
+        """Move a key whose frecency just grew up in the cached lists of its prefixes."""
+        # Scores only grow, so a key can only move up in each cached list
+        frecency = self._entries[key][2]
+        for length in range(1, len(key) + 1):
+            top = self._top.get(key[:length])
+            if top is None:
+                continue
+            if key in top:
+                top.remove(key)
+            elif len(top) >= self.max_results and self._entries[top[-1]][2] >= frecency:
+                continue
+            position = 0
+            while position < len(top) and self._entries[top[position]][2] >= frecency:
+                position += 1
+            top.insert(position, key)
+            del top[self.max_results:]
+
+    def _cache_broad_prefixes(self, key):
+        """Start caching the prefixes of a new key that now match more than scan_limit keys."""
+        for length in range(1, len(key) + 1):
+            prefix = key[:length]
+            if prefix in self._top:
+                continue
+            lo = bisect.bisect_left(self._keys, prefix)
+            hi = bisect.bisect_left(self._keys, prefix + "\uffff")
+            if hi - lo <= self.scan_limit:
+                # Longer prefixes match even fewer keys
+                break
+            self._top[prefix] = heapq.nlargest(
+                self.max_results, self._keys[lo:hi], key=lambda k: self._entries[k][2]
+            )
+
+    def _rebuild(self, entries):
+        """Rebuild all structures from scratch, keeping the max_entries best keys."""
+        if len(entries) > self.max_entries:
+            best = heapq.nlargest(self.max_entries, entries.items(), key=lambda item: item[1][2])
+            entries = dict(best)
+
+        self._entries = entries
+        self._keys = keys = sorted(entries)
+
+        # A prefix matches more than scan_limit keys exactly when it is shared
+        # by some key and the key scan_limit places after it in sorted order
+        self._top = {}
+        for i in range(len(keys) - self.scan_limit):
+            first, last = keys[i], keys[i + self.scan_limit]
+            shared = 0
+            while shared < len(first) and shared < len(last) and first[shared] == last[shared]:
+                shared += 1
+            for length in range(shared, 0, -1):
+                prefix = first[:length]
+                if prefix in self._top:
+                    break
+                self._top[prefix] = []
+
+        ranked = sorted(entries, key=lambda k: entries[k][2], reverse=True)
+        for key in ranked:
+            for length in range(1, len(key) + 1):
+                top = self._top.get(key[:length])
+                if top is None:
+                    break
+                if len(top) < self.max_results:
+                    top.append(key)